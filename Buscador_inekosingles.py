@@ -7,6 +7,8 @@ import urllib.parse
 import time
 from colorama import Fore, Style, init
 
+from tiendas.sesiones import obtener_sesion
+
 # Inicializar colorama
 init(autoreset=True)
 
@@ -14,7 +16,7 @@ init(autoreset=True)
 BASE_URL = "https://inekosingles.com/search?q="
 OUTPUT_FOLDER = "revisar_Precio"
 INPUT_FILE = "Lista_inekosingles.txt"
-RETRY_DELAY = 20  # segundos de espera si hay error 429
+RETRY_DELAY = 20  # segundos de espera ante errores de red (los 429 los maneja tiendas.limites)
 MAX_RETRIES = 3   # reintentos máximos
 
 # Crear carpeta si no existe
@@ -31,8 +33,8 @@ with open(INPUT_FILE, "r", encoding="utf-8") as f:
 total_cartas = len(cartas)
 print(f"{Fore.CYAN}📘 Se cargaron {total_cartas} cartas desde {INPUT_FILE}{Style.RESET_ALL}\n")
 
-# Crear sesión de requests
-session = requests.Session()
+# Sesión compartida: pool keep-alive + límite de tasa con Retry-After
+session = obtener_sesion(BASE_URL)
 
 resultados = []
 
@@ -41,16 +43,11 @@ for i, carta in enumerate(cartas, start=1):
     query = urllib.parse.quote(carta)
     url_busqueda = f"{BASE_URL}{query}"
 
-    # === Reintento automático si hay error 429 ===
+    # === Reintento automático ante errores de red (429 ya reintentado por la sesión) ===
     intentos = 0
     while intentos < MAX_RETRIES:
         try:
             response = session.get(url_busqueda, timeout=15)
-            if response.status_code == 429:
-                intentos += 1
-                print(f"{Fore.RED}⚠️  ERROR 429: demasiadas solicitudes para '{carta}'. Esperando {RETRY_DELAY}s...{Style.RESET_ALL}")
-                time.sleep(RETRY_DELAY)
-                continue
             response.raise_for_status()
             break  # éxito
         except requests.exceptions.RequestException as e:
@@ -3,13 +3,18 @@
 """
 Scraper BloodMoonGames - Versión final consolidada
 - Guardados parciales acumulativos a Ficheros/List_BloodMoon.csv
-- Respeta orden de páginas, usa prefetch para acelerar
-- Respalda archivo antiguo al iniciar (timestamp)
-- Si todo finaliza con éxito: crea archivo final timestamped y borra backups antiguos
+- Respeta orden de páginas, usa prefetch para acelerar (tiendas.crawler)
+- Si se corta, la próxima corrida retoma desde el checkpoint
+- --incremental: sólo lo modificado desde el último CSV (Store API, tiendas.incremental)
+- Respalda el parcial de un crawl anterior al iniciar (List_BloodMoon_parcial_<ts>.csv)
+- Sólo si el crawl termina completo (desde la página 1 y sin páginas omitidas)
+  crea List_BloodMoon_final_<ts>.csv y borra los finales y respaldos anteriores.
+  El catálogo offline y --incremental leen sólo esos finales, así un crawl
+  cortado nunca reemplaza al último catálogo bueno.
 """
 
-import requests
 from bs4 import BeautifulSoup
+import argparse
 import csv
 import os
 import re
@@ -20,15 +25,19 @@ import shutil
 import unicodedata
 import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tiendas import crawler, incremental, woocommerce
 
 # ----------------------------
 # CONFIGURACIÓN
 # ----------------------------
 BASE_URL = "https://bloodmoongames.cl/singles-magic-the-gathering/?product-page={}"
+BASE_API = "https://bloodmoongames.cl"          # Store API para el crawl incremental
+CATEGORIA_API = "singles-magic-the-gathering"    # slug de la categoría de singles
 FOLDER = "Ficheros"
 FINAL_NAME = "List_BloodMoon.csv"                # nombre fijo para guardados parciales
-BACKUP_PREFIX = "List_BloodMoon"                # prefijo para backups timestamped
+BACKUP_PREFIX = "List_BloodMoon_parcial"         # respaldos del parcial de un crawl anterior
+FINAL_PREFIX = "List_BloodMoon_final"            # crawls completos (snapshots del catálogo)
 PAGES_PER_SAVE = 10                              # guardado parcial cada N páginas
 WINDOW_SIZE = 5                                  # ventana de prefetch (n páginas adelantadas)
 REQUEST_TIMEOUT = 15                             # timeout de requests
@@ -37,6 +46,8 @@ RETRY_CYCLE = 10                                 # intentos por ciclo
 MAX_CYCLES = 2                                   # ciclos (max attempts = RETRY_CYCLE * MAX_CYCLES)
 SPINNER_INTERVAL = 0.08
 USER_AGENT = "Mozilla/5.0 (compatible; BloodMoonScraper/1.0)"
+# páginas ya descargadas si el crawl se corta (se retoma en la próxima corrida)
+CHECKPOINT = os.path.join(FOLDER, ".crawl_BloodMoon.jsonl")
 
 # ----------------------------
 # ANSI colors & art
@@ -125,7 +136,7 @@ def extraer_precio(texto_precio):
     return min(valores)
 
 # ----------------------------
-# Manejo backup: mover final existente a backup con timestamp
+# Manejo backup: mover el parcial existente a backup con timestamp
 # ----------------------------
 def mover_actual_a_backup(folder=FOLDER, final_name=FINAL_NAME, prefix=BACKUP_PREFIX):
     path_final = os.path.join(folder, final_name)
@@ -154,59 +165,54 @@ def eliminar_backups_anteriores(folder=FOLDER, prefix=BACKUP_PREFIX, keep_this_t
             print(f"{RED}⚠ No se pudo eliminar backup {a}: {e}{RESET}")
 
 # ----------------------------
-# Obtener y parsear página con reintentos
+# Página -> URL y parseo (descarga y reintentos: tiendas.crawler)
 # ----------------------------
-def obtener_productos_pagina(session, pagina):
-    url = BASE_URL.format(pagina)
-    headers = {"User-Agent": USER_AGENT}
-    for cycle in range(1, MAX_CYCLES + 1):
-        for intento in range(1, RETRY_CYCLE + 1):
-            spinner = Spinner(text=f"Analizando página {pagina}")
-            try:
-                spinner.start()
-                resp = session.get(url, timeout=REQUEST_TIMEOUT, headers=headers)
-                spinner.stop()
-                resp.raise_for_status()
-                # parseo
-                soup = BeautifulSoup(resp.text, "lxml")
-                items = soup.find_all("li", class_="product")
-                resultados = []
-                for item in items:
-                    a_tag = item.find("a", class_="woocommerce-LoopProduct-link")
-                    if not a_tag:
-                        continue
-                    url_producto = a_tag.get("href")
-                    h2 = a_tag.find("h2", class_="woocommerce-loop-product__title")
-                    if not h2:
-                        continue
-                    titulo_raw = h2.get_text(strip=True)
-                    nombre_limpio, es_foil = limpiar_nombre(titulo_raw)
-                    span_price = a_tag.find("span", class_="price")
-                    precio_int = extraer_precio(span_price.get_text()) if span_price else None
-                    resultados.append({
-                        "nombre_original": titulo_raw,
-                        "nombre": nombre_limpio,
-                        "foil": "Sí" if es_foil else "No",
-                        "precio": precio_int if precio_int is not None else "",
-                        "url": url_producto
-                    })
-                return resultados
-            except requests.RequestException as e:
-                spinner.stop()
-                print(f"{YELLOW}⚠ Error req página {pagina} (ciclo {cycle}/{MAX_CYCLES}, intento {intento}/{RETRY_CYCLE}): {e}{RESET}")
-                # espera antes de reintentar
-                time.sleep(RETRY_WAIT)
-                continue
-            except Exception as e:
-                spinner.stop()
-                print(f"{RED}❌ Error parsing página {pagina}: {e}{RESET}")
-                return None
-        # fin retry cycle
-        print(f"{MAGENTA}⏳ Ciclo {cycle} completo sin éxito para página {pagina}. Esperando 60s antes del siguiente ciclo...{RESET}")
-        time.sleep(60)
-    # agotados ciclos
-    print(f"{RED}✖ Agotados reintentos para página {pagina}. Se omitirá.{RESET}")
-    return None
+def url_pagina(pagina):
+    return BASE_URL.format(pagina)
+
+def parsear_pagina(resp):
+    soup = BeautifulSoup(resp.text, "lxml")
+    items = soup.find_all("li", class_="product")
+    resultados = []
+    for item in items:
+        a_tag = item.find("a", class_="woocommerce-LoopProduct-link")
+        if not a_tag:
+            continue
+        url_producto = a_tag.get("href")
+        h2 = a_tag.find("h2", class_="woocommerce-loop-product__title")
+        if not h2:
+            continue
+        titulo_raw = h2.get_text(strip=True)
+        nombre_limpio, es_foil = limpiar_nombre(titulo_raw)
+        span_price = a_tag.find("span", class_="price")
+        precio_int = extraer_precio(span_price.get_text()) if span_price else None
+        resultados.append({
+            "nombre_original": titulo_raw,
+            "nombre": nombre_limpio,
+            "foil": "Sí" if es_foil else "No",
+            "precio": precio_int if precio_int is not None else "",
+            "url": url_producto
+        })
+    return resultados
+
+def url_pagina_api(pagina):
+    return woocommerce.url_catalogo(BASE_API, pagina, CATEGORIA_API)
+
+def parsear_pagina_api(resp):
+    """Página de la Store API (crawl incremental) con las mismas columnas del crawl HTML."""
+    resultados = []
+    for producto in resp.json():
+        titulo_raw = woocommerce.titulo_producto(producto)
+        nombre_limpio, es_foil = limpiar_nombre(titulo_raw)
+        precio_int = woocommerce.precio_woo(producto)
+        resultados.append({
+            "nombre_original": titulo_raw,
+            "nombre": nombre_limpio,
+            "foil": "Sí" if es_foil else "No",
+            "precio": precio_int if precio_int is not None else "",
+            "url": producto.get("permalink", ""),
+        })
+    return resultados
 
 # ----------------------------
 # Guardado parcial (sobrescribe FINAL_NAME)
@@ -234,7 +240,7 @@ def guardar_parcial_acumulativo(productos, folder=FOLDER, final_name=FINAL_NAME)
 # ----------------------------
 # Guardado final: crear timestamped final y limpiar backups previos
 # ----------------------------
-def guardar_final_y_limpiar(productos, folder=FOLDER, prefix=BACKUP_PREFIX):
+def guardar_final_y_limpiar(productos, folder=FOLDER, prefix=FINAL_PREFIX):
     os.makedirs(folder, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     final_ts_name = f"{prefix}_{ts}.csv"
@@ -247,8 +253,9 @@ def guardar_final_y_limpiar(productos, folder=FOLDER, prefix=BACKUP_PREFIX):
             writer.writeheader()
             writer.writerows(productos)
         print(f"{GREEN}📁 Guardado final con timestamp: {final_ts_path}{RESET}")
-        # eliminar backups anteriores (dejamos solo el nuevo final como backup history cleared)
+        # eliminar finales y respaldos anteriores (dejamos solo el nuevo final)
         eliminar_backups_anteriores(folder=folder, prefix=prefix, keep_this_timestamp=ts)
+        eliminar_backups_anteriores(folder=folder, prefix=BACKUP_PREFIX)
         # opcional: eliminar el archivo FINAL_NAME si existe (porque ya tenemos final timestamped)
         path_final_constant = os.path.join(folder, FINAL_NAME)
         if os.path.exists(path_final_constant):
@@ -289,127 +296,100 @@ def input_timeout(prompt, timeout=5, default="1"):
 # ----------------------------
 # Scraper principal con ventana de prefetch (mantiene orden)
 # ----------------------------
+def avisar(mensaje):
+    print(f"{YELLOW}{mensaje}{RESET}")
+
 def scrapear_desde(pagina_inicio=1):
+    """(productos, completo): completo si se recorrió desde la página 1 hasta el final sin páginas omitidas."""
     os.makedirs(FOLDER, exist_ok=True)
     # Si existe FINAL_NAME movemos a backup para conservar versión vieja
     mover_actual_a_backup()
 
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
-
-    pagina = pagina_inicio
     buffer_products = []        # acumulado de productos para guardado parcial
-    buffer_pages = {}           # {page: [productos]} para mantener orden
-    submitted = set()           # páginas ya enviadas al executor
-    finished = False
-
-    # Heurística para detectar final
-    consecutive_empty = 0
-    max_consecutive_empty = 5
+    max_consecutive_empty = 5   # heurística para detectar final
 
     print(CASTLE_ART)
     print(f"{CYAN}Iniciando desde la página {pagina_inicio}. Ventana prefetch: {WINDOW_SIZE}. Guardado cada {PAGES_PER_SAVE} páginas.{RESET}")
 
-    with ThreadPoolExecutor(max_workers=WINDOW_SIZE) as executor:
-        futures = {}  # future -> page
-        # submit initial window
-        for p in range(pagina, pagina + WINDOW_SIZE):
-            futures[executor.submit(obtener_productos_pagina, session, p)] = p
-            submitted.add(p)
-
-        next_to_write = pagina
-        pages_processed = 0
-
-        while futures:
-            # wait for any future to complete
-            for fut in as_completed(list(futures.keys())):
-                page = futures.pop(fut)
-                try:
-                    result = fut.result()
-                except Exception as e:
-                    result = None
-                    print(f"{RED}❌ Excepción en future página {page}: {e}{RESET}")
-
-                # store result (None means omit; [] means empty page)
-                buffer_pages[page] = result if result is not None else []
-                pages_processed += 1
-
-                # submit next page to keep window moving
-                candidate = max(submitted) + 1 if submitted else pagina
-                futures[executor.submit(obtener_productos_pagina, session, candidate)] = candidate
-                submitted.add(candidate)
-
-                # try to flush ordered pages
-                while next_to_write in buffer_pages:
-                    page_result = buffer_pages.pop(next_to_write)
-                    # handle None/empty/list
-                    if page_result is None:
-                        # omitted due to fatal parse error -> treat as empty
-                        print(f"{YELLOW}🚧 Página {next_to_write} omitida.{RESET}")
-                        consecutive_empty += 1
-                    elif isinstance(page_result, list) and len(page_result) == 0:
-                        print(f"{YELLOW}🔎 Página {next_to_write} vacía.{RESET}")
-                        consecutive_empty += 1
-                    else:
-                        # page has products
-                        buffer_products.extend(page_result)
-                        print(f"{GREEN}✅ Página {next_to_write} procesada: {len(page_result)} productos (Acumulado: {len(buffer_products)}){RESET}")
-                        consecutive_empty = 0
-
-                    # guardado parcial cada PAGES_PER_SAVE páginas (medido por número de páginas procesadas desde inicio)
-                    processed_count = next_to_write - pagina_inicio + 1
-                    if processed_count % PAGES_PER_SAVE == 0:
-                        # guardar acumulativo en FINAL_NAME
-                        saved = guardar_parcial_acumulativo(buffer_products)
-                        if not saved:
-                            print(f"{YELLOW}⚠ Falló guardado parcial para página {next_to_write}.{RESET}")
-                        # continue (archivo FINAL_NAME es sobrescrito)
-                    # si detectamos demasiadas páginas vacías consecutivas -> asumimos final
-                    if consecutive_empty >= max_consecutive_empty:
-                        print(f"{YELLOW}⚠ {consecutive_empty} páginas vacías consecutivas -> asumiendo fin.{RESET}")
-                        finished = True
-                        break
-                    next_to_write += 1
-
-                if finished:
-                    break
-
-            if finished:
-                break
-
-            # Stop condition safety: avoid infinite scheduling; cap candidate to a big number (ej 20000)
-            if max(submitted) > 20000:
-                print(f"{YELLOW}⚠ Límite de páginas alcanzado ({max(submitted)}). Deteniendo.{RESET}")
-                break
-
-        # end while futures
-
-    # al terminar executor, guardar restantes
+    # WINDOW_SIZE páginas en vuelo, entregadas en orden; sesión compartida con límite de tasa por dominio
+    paginas = crawler.recorrer(url_pagina, parsear_pagina, inicio=pagina_inicio, concurrencia=WINDOW_SIZE,
+                               headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT,
+                               reintentos=RETRY_CYCLE * MAX_CYCLES, espera=RETRY_WAIT,
+                               paginas_vacias=max_consecutive_empty, checkpoint=CHECKPOINT, avisar=avisar)
+    for page, page_result in paginas:
+        if page_result is None:
+            print(f"{YELLOW}🚧 Página {page} omitida.{RESET}")
+        elif not page_result:
+            print(f"{YELLOW}🔎 Página {page} vacía.{RESET}")
+        else:
+            buffer_products.extend(page_result)
+            print(f"{GREEN}✅ Página {page} procesada: {len(page_result)} productos (Acumulado: {len(buffer_products)}){RESET}")
+
+        # guardado parcial cada PAGES_PER_SAVE páginas (medido por número de páginas procesadas desde inicio)
+        processed_count = page - pagina_inicio + 1
+        if processed_count % PAGES_PER_SAVE == 0:
+            # guardar acumulativo en FINAL_NAME
+            saved = guardar_parcial_acumulativo(buffer_products)
+            if not saved:
+                print(f"{YELLOW}⚠ Falló guardado parcial para página {page}.{RESET}")
+
+    # al terminar, guardar restantes
     if buffer_products:
         guardar_parcial_acumulativo(buffer_products)
-    return buffer_products
+    return buffer_products, pagina_inicio == 1 and paginas.completo
+
+# ----------------------------
+# Crawl incremental: sólo lo modificado desde el último CSV
+# ----------------------------
+def scrapear_cambios():
+    """(productos, completo): completo si se llegó al final (o a lo ya conocido) sin páginas omitidas."""
+    ruta, previos = incremental.cargar_snapshot("BloodMoonGames")
+    cambios = incremental.Cambios(previos)
+    print(f"{CYAN}🔁 Crawl incremental contra {ruta or 'ningún snapshot (se baja todo)'}{RESET}")
+
+    paginas = crawler.recorrer(url_pagina_api, parsear_pagina_api, concurrencia=WINDOW_SIZE,
+                               headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT,
+                               reintentos=RETRY_CYCLE, espera=RETRY_WAIT, detener=cambios,
+                               checkpoint=os.path.join(FOLDER, ".crawl_BloodMoon_incremental.jsonl"), avisar=avisar)
+    for page, page_result in paginas:
+        if page_result:
+            print(f"{GREEN}✅ Página {page} revisada: {len(page_result)} productos{RESET}")
+
+    if not cambios.vistas:
+        print(f"{YELLOW}⚠ La Store API no respondió productos; use el crawl completo (sin --incremental).{RESET}")
+        return [], False
+    print(f"{CYAN}🔁 {cambios.resumen()}{RESET}")
+    return cambios.fusionar(), paginas.completo
 
 # ----------------------------
 # MAIN
 # ----------------------------
-def main():
+def main(solo_cambios=False):
     try:
         print(CASTLE_ART)
         print(f"{BOLD}Bienvenido, cazador. Preparando el ritual...{RESET}\n")
-        inp = input_timeout("¿Desde qué página deseas comenzar? (número)", timeout=5, default="1")
-        try:
-            pagina_inicio = int(inp)
-            if pagina_inicio < 1:
-                raise ValueError()
-        except:
-            print(f"{YELLOW}⚠ Entrada inválida. Se usará página 1.{RESET}")
-            pagina_inicio = 1
+        if solo_cambios:
+            productos, completo = scrapear_cambios()
+        else:
+            inp = input_timeout("¿Desde qué página deseas comenzar? (número)", timeout=5, default="1")
+            try:
+                pagina_inicio = int(inp)
+                if pagina_inicio < 1:
+                    raise ValueError()
+            except:
+                print(f"{YELLOW}⚠ Entrada inválida. Se usará página 1.{RESET}")
+                pagina_inicio = 1
 
-        productos = scrapear_desde(pagina_inicio)
+            productos, completo = scrapear_desde(pagina_inicio)
 
         if not productos:
             print(f"{YELLOW}⚠ No se recolectaron productos. Abortando guardado final.{RESET}")
             return
+        if not completo:
+            # Un catálogo a medias como final daría falsos "No" y borraría el último final bueno
+            print(f"{YELLOW}⚠ El crawl no quedó completo (páginas omitidas o inicio distinto de la página 1): "
+                  f"no se guarda como catálogo final. Vuelva a correrlo; el checkpoint pide sólo lo que falta.{RESET}")
+            return
 
         # Guardado final y limpieza de backups (solo si todo ok)
         ok_final = guardar_final_y_limpiar(productos)
@@ -424,4 +404,8 @@ def main():
         print(f"{RED}❌ Error crítico: {e}{RESET}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Crawl del catálogo de singles de BloodMoonGames.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="bajar sólo lo modificado desde el último CSV en Ficheros/ y copiar el resto")
+    args = parser.parse_args()
+    main(solo_cambios=args.incremental)
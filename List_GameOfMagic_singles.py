@@ -1,12 +1,12 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
 import re
 import os
 from datetime import datetime
-import time
 import random
 
+from tiendas import crawler
+
 # ANSI colors
 RED = "\033[91m"
 GREEN = "\033[92m"
@@ -70,25 +70,10 @@ def limpiar_nombre(nombre):
     """Limpia el nombre de la carta"""
     return nombre.strip()
 
-def obtener_cartas_de_pagina(pagina):
-    url = BASE_URL.format(pagina)
-    intentos = 0
-
-    while intentos < REINTENTOS:
-        try:
-            print(f"{CYAN}🌿 Explorando página {pagina}...{RESET}")
-            resp = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            resp.raise_for_status()
-            break
-        except requests.exceptions.RequestException as e:
-            intentos += 1
-            print(f"{RED}⚠️ Error al acceder a la página {pagina}: {e}{RESET}")
-            print(f"{YELLOW}⏱ Esperando 20 segundos antes de reintentar...{RESET}")
-            time.sleep(20)
-    else:
-        print(f"{RED}❌ La página {pagina} falló {REINTENTOS} veces. Saltando...{RESET}")
-        return []
+def url_pagina(pagina):
+    return BASE_URL.format(pagina)
 
+def parsear_pagina(resp):
     soup = BeautifulSoup(resp.text, "html.parser")
     productos = soup.select("div.productCard__card")
     if not productos:
@@ -119,26 +104,33 @@ def obtener_cartas_de_pagina(pagina):
             "url": enlace
         })
 
-    # Mensaje divertido MTG
-    frase = random.choice(FRASES_PAGINA)
-    print(f"{MAGENTA}🎴 Página {pagina}: Capturadas {len(cartas)} cartas. {frase}{RESET}")
-    time.sleep(random.uniform(1, 2))
     return cartas
 
 def scrapear_todas_las_paginas():
     todas = []
-    pagina = 1
 
-    while True:
-        cartas = obtener_cartas_de_pagina(pagina)
+    paginas = crawler.recorrer(url_pagina, parsear_pagina, headers=HEADERS, timeout=TIMEOUT,
+                               reintentos=REINTENTOS, espera=20,
+                               checkpoint="Ficheros/.crawl_gameofmagicsingles.jsonl")
+    for pagina, cartas in paginas:
+        if cartas is None:
+            print(f"{RED}❌ La página {pagina} falló; la próxima corrida la vuelve a pedir.{RESET}")
+            continue
         if not cartas:
             print(f"{GREEN}✅ No hay más productos. Fin del scraping.{RESET}")
-            break
+            continue
 
         todas.extend(cartas)
+        # Mensaje divertido MTG
+        frase = random.choice(FRASES_PAGINA)
+        print(f"{MAGENTA}🎴 Página {pagina}: Capturadas {len(cartas)} cartas. {frase}{RESET}")
         print(f"{YELLOW}🗃️ Total acumulado hasta ahora: {len(todas)} cartas{RESET}\n")
-        pagina += 1
 
+    if not paginas.completo:
+        # Un catálogo a medias daría falsos "No" en la búsqueda offline (tiendas.catalogo)
+        print(f"{RED}❌ El crawl quedó incompleto ({len(paginas.fallidas)} páginas fallidas): "
+              f"no se escribe {OUTPUT_FILE}. Vuelva a correrlo; el checkpoint pide sólo lo que falta.{RESET}")
+        return
     if not todas:
         print(f"{RED}❌ No se encontraron cartas para guardar.{RESET}")
         return
@@ -1,3 +1,4 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import csv
@@ -6,7 +7,11 @@ from datetime import datetime
 import os
 import re
 
+from tiendas import crawler, incremental, woocommerce
+
 BASE_START = "https://www.huntercardtcg.com/categoria-producto/mtg/mtg-singles/page/{}/"
+BASE_API = "https://www.huntercardtcg.com"       # Store API para el crawl incremental
+CATEGORIA_API = "mtg-singles"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; scraping-script/1.0; +https://example.com)"
 }
@@ -77,13 +82,10 @@ def extraer_precio(texto_precio):
     # Tomar el precio más bajo en caso de rango
     return min(precios_int)
 
-def obtener_productos_por_pagina(numero_pagina):
-    url = BASE_START.format(numero_pagina)
-    resp = requests.get(url, headers=HEADERS, timeout=15)
-    if resp.status_code != 200:
-        # Si página no existe o problema, devolvemos lista vacía
-        return []
+def url_pagina(numero_pagina):
+    return BASE_START.format(numero_pagina)
 
+def parsear_pagina(resp):
     soup = BeautifulSoup(resp.text, "html.parser")
     contenedores = soup.find_all("div", class_="thunk-product")
     resultados = []
@@ -135,6 +137,27 @@ def obtener_productos_por_pagina(numero_pagina):
 
     return resultados
 
+def url_pagina_api(numero_pagina):
+    return woocommerce.url_catalogo(BASE_API, numero_pagina, CATEGORIA_API)
+
+def parsear_pagina_api(resp):
+    """Página de la Store API (crawl incremental) con las mismas columnas del crawl HTML."""
+    resultados = []
+    for producto in resp.json():
+        titulo_raw = woocommerce.titulo_producto(producto)
+        nombre_limpio, es_foil = limpiar_nombre(titulo_raw)
+        precio_int = woocommerce.precio_woo(producto)
+        imagenes = producto.get("images") or []
+        resultados.append({
+            "nombre_original": titulo_raw,
+            "nombre": nombre_limpio,
+            "foil": "Sí" if es_foil else "No",
+            "precio": formatear_moneda_clp(precio_int) if precio_int is not None else "",
+            "url": producto.get("permalink", ""),
+            "imagen": imagenes[0].get("src") if imagenes else None,
+        })
+    return resultados
+
 def descargar_imagenes(productos, carpeta):
     os.makedirs(carpeta, exist_ok=True)
     total = len(productos)
@@ -165,20 +188,41 @@ def descargar_imagenes(productos, carpeta):
         time.sleep(0.2)
     print(f"✅ Imágenes descargadas: {descargadas}/{total}")
 
-def main():
-    pagina = 1
+def main(solo_cambios=False):
     todos = []
     print("🔎 Iniciando scraping...")
 
-    while True:
-        print(f"➡️ Procesando página {pagina} ...")
-        productos = obtener_productos_por_pagina(pagina)
+    url, parsear, cambios = url_pagina, parsear_pagina, None
+    if solo_cambios:
+        # Store API ordenada por modificación: para al llegar a precios iguales al último snapshot
+        ruta, previos = incremental.cargar_snapshot("HunterCardTCG")
+        url, parsear, cambios = url_pagina_api, parsear_pagina_api, incremental.Cambios(previos)
+        print(f"🔁 Crawl incremental contra {ruta or 'ningún snapshot (se baja todo)'}")
+
+    # Varias páginas en paralelo, entregadas en orden (el límite por dominio evita sobrecargar)
+    checkpoint = "Ficheros/.crawl_HunterCard_incremental.jsonl" if solo_cambios else "Ficheros/.crawl_HunterCard.jsonl"
+    paginas = crawler.recorrer(url, parsear, headers=HEADERS, detener=cambios, checkpoint=checkpoint)
+    for pagina, productos in paginas:
+        if productos is None:
+            print(f"❌ La página {pagina} falló; la próxima corrida la vuelve a pedir.")
+            continue
         if not productos:
-            print("ℹ️ No se encontraron productos en esta página — deteniendo.")
-            break
+            print(f"ℹ️ No se encontraron productos en la página {pagina} — deteniendo.")
+            continue
         todos.extend(productos)
-        pagina += 1
-        time.sleep(1)  # pausa para no sobrecargar
+        print(f"➡️ Página {pagina}: {len(productos)} productos (acumulado {len(todos)})")
+
+    if not paginas.completo:
+        # Un catálogo a medias daría falsos "No" en la búsqueda offline (tiendas.catalogo)
+        print(f"❌ El crawl quedó incompleto ({len(paginas.fallidas)} páginas fallidas): no se escribe el CSV. "
+              "Vuelva a correrlo; el checkpoint pide sólo lo que falta.")
+        return
+    if cambios is not None:
+        if not cambios.vistas:
+            print("⚠️ La Store API no respondió productos; use el crawl completo (sin --incremental).")
+            return
+        print(f"🔁 {cambios.resumen()}")
+        todos = cambios.fusionar()
 
     # Crear carpeta y archivo CSV
     os.makedirs("Ficheros", exist_ok=True)
@@ -202,4 +246,8 @@ def main():
         print("🚫 Descarga de imágenes omitida por el usuario.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Crawl del catálogo de singles de HunterCardTCG.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="bajar sólo lo modificado desde el último CSV en Ficheros/ y copiar el resto")
+    args = parser.parse_args()
+    main(solo_cambios=args.incremental)
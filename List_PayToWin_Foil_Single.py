@@ -6,6 +6,8 @@ from datetime import datetime
 import os
 import re
 
+from tiendas import crawler
+
 BASE_URL = "https://www.paytowin.cl"
 URL_TEMPLATE = BASE_URL + "/collections/foil?page={}"
 
@@ -17,13 +19,10 @@ def formatear_moneda(valor):
     return f"${valor:,}".replace(",", ".")
 
 
-def obtener_productos(pagina):
-    url = URL_TEMPLATE.format(pagina)
-    response = requests.get(url)
-    if response.status_code != 200:
-        print(f"⚠️ No se pudo acceder a la página {pagina}. Código: {response.status_code}")
-        return []
+def url_pagina(pagina):
+    return URL_TEMPLATE.format(pagina)
 
+def parsear_pagina(response):
     soup = BeautifulSoup(response.text, "html.parser")
     productos = soup.find_all("div", class_="productCard__card")
     resultados = []
@@ -97,20 +96,25 @@ def descargar_imagenes(productos, carpeta):
     print(f"✅ Imágenes descargadas: {descargadas}/{total}")
 
 def main():
-    pagina = 1
     todos_los_productos = []
 
     print("🔍 Iniciando scraping de todas las páginas...")
 
-    while True:
-        print(f"➡️ Procesando página {pagina}...")
-        productos = obtener_productos(pagina)
+    paginas = crawler.recorrer(url_pagina, parsear_pagina, checkpoint="Ficheros/.crawl_PayToWin.jsonl")
+    for pagina, productos in paginas:
+        if productos is None:
+            print(f"❌ La página {pagina} falló; la próxima corrida la vuelve a pedir.")
+            continue
         if not productos:
             print("✅ No se encontraron más productos. Fin del scraping.")
-            break
+            continue
         todos_los_productos.extend(productos)
-        pagina += 1
-        time.sleep(1)  # pausa leve para no saturar servidor
+        print(f"➡️ Página {pagina}: {len(productos)} productos")
+
+    if not paginas.completo:
+        print(f"❌ El crawl quedó incompleto ({len(paginas.fallidas)} páginas fallidas): no se escribe el CSV. "
+              "Vuelva a correrlo; el checkpoint pide sólo lo que falta.")
+        return
 
     # Crear carpeta y archivo CSV
     os.makedirs("Ficheros", exist_ok=True)
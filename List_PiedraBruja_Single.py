@@ -1,12 +1,10 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
 import re
 import os
 from datetime import datetime
-import time
-import random
-import sys
+
+from tiendas import crawler
 
 # ANSI colors
 RED = "\033[91m"
@@ -85,27 +83,12 @@ def limpiar_precio(precio_texto):
     except ValueError:
         return 0
 
-def spinner_husmeando():
-    for c in "|/-\\":
-        sys.stdout.write(f"\r{YELLOW}🐀 Husmeando... {c}{RESET}")
-        sys.stdout.flush()
-        time.sleep(0.15)
+def url_pagina(pagina):
+    return BASE_URL.format(pagina)
 
-def obtener_datos_pagina(pagina):
-    url = BASE_URL.format(pagina)
-    spinner_husmeando()
-    print(f"\r{CYAN}🐀 Skaven husmeando la página {pagina}... {url}{RESET}")
-    
-    response = requests.get(url)
-    if response.status_code != 200:
-        print(f"{RED}❌ Error al acceder a la página.{RESET}")
-        return [], False
-    
+def parsear_pagina(response):
     soup = BeautifulSoup(response.text, "html.parser")
     productos = soup.find_all("div", class_="product-item")
-    if not productos:
-        print(f"{GREEN}✅ No hay más productos. Las ratas descansan.{RESET}")
-        return [], False
     
     data = []
     for prod in productos:
@@ -130,11 +113,7 @@ def obtener_datos_pagina(pagina):
             "url": url_producto
         })
     
-    # Frase divertida por página
-    frase = PAGINA_FRASES[(pagina-1) % len(PAGINA_FRASES)]
-    print(f"{MAGENTA}Página {pagina}: {frase}{RESET}")
-    time.sleep(random.uniform(0.5, 1.5))  # Pausa dramática
-    return data, True
+    return data
 
 def guardar_csv(data):
     with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
@@ -145,16 +124,26 @@ def guardar_csv(data):
 
 def main():
     print(f"{CYAN}🔎 Las ratas Skaven comienzan su saqueo de PiedraBruja.cl...{RESET}")
-    pagina = 1
     all_data = []
 
-    while True:
-        datos, continuar = obtener_datos_pagina(pagina)
-        if not continuar:
-            break
+    paginas = crawler.recorrer(url_pagina, parsear_pagina, checkpoint="Ficheros/.crawl_PiedraBruja.jsonl")
+    for pagina, datos in paginas:
+        if datos is None:
+            print(f"{RED}❌ La página {pagina} falló; la próxima corrida la vuelve a pedir.{RESET}")
+            continue
+        if not datos:
+            print(f"{GREEN}✅ No hay más productos. Las ratas descansan.{RESET}")
+            continue
         all_data.extend(datos)
-        pagina += 1
+        # Frase divertida por página
+        frase = PAGINA_FRASES[(pagina-1) % len(PAGINA_FRASES)]
+        print(f"{CYAN}🐀 Skaven husmeó la página {pagina}: {len(datos)} cartas.{RESET} {MAGENTA}{frase}{RESET}")
     
+    if not paginas.completo:
+        # Un catálogo a medias daría falsos "No" en la búsqueda offline (tiendas.catalogo)
+        print(f"{RED}❌ El crawl quedó incompleto ({len(paginas.fallidas)} páginas fallidas): "
+              f"no se escribe {OUTPUT_FILE}. Vuelva a correrlo; el checkpoint pide sólo lo que falta.{RESET}")
+        return
     if all_data:
         guardar_csv(all_data)
         print(f"""
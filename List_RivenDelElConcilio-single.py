@@ -1,12 +1,12 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
 import re
 import os
 from datetime import datetime
-import time
 import random
 
+from tiendas import crawler
+
 # =========================================
 # ANSI colors y estilos
 # =========================================
@@ -49,6 +49,14 @@ BIENVENIDA = f"""
 print(BIENVENIDA)
 print(f"{CYAN}🃏 Vamos a cosechar cartas de los años: {AÑOS}{RESET}\n")
 
+# Mensajes divertidos por página
+MENSAJES = [
+    "✨ Ratas mágicas han encontrado tesoros...",
+    "🃏 Cartas volando al CSV...",
+    "🌵 Más cartas cosechadas del desierto...",
+    "💨 ¡Polvo de cartas por todas partes!"
+]
+
 # =========================================
 # Funciones auxiliares
 # =========================================
@@ -66,24 +74,7 @@ def limpiar_nombre(nombre):
     """Limpia el nombre de la carta"""
     return nombre.strip()
 
-def obtener_cartas_de_pagina(year, pagina):
-    url = BASE_URL.format(year=year, page=pagina)
-    intentos = 0
-    while intentos < REINTENTOS:
-        try:
-            print(f"{CYAN}🌾 Explorando año {year}, página {pagina}...{RESET}")
-            resp = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            resp.raise_for_status()
-            break
-        except requests.exceptions.RequestException as e:
-            intentos += 1
-            print(f"{RED}⚠️ Error al acceder a la página {pagina} del año {year}: {e}{RESET}")
-            print(f"{YELLOW}⏱ Reintentando en 20 segundos...{RESET}")
-            time.sleep(20)
-    else:
-        print(f"{RED}❌ Página {pagina} del año {year} fallida {REINTENTOS} veces. Saltando...{RESET}")
-        return []
-
+def parsear_pagina(resp, year):
     soup = BeautifulSoup(resp.text, "html.parser")
     productos = soup.select("div.product-block")
     if not productos:
@@ -112,42 +103,45 @@ def obtener_cartas_de_pagina(year, pagina):
             "url": enlace
         })
 
-    # Mensaje divertido aleatorio
-    mensajes = [
-        "✨ Ratas mágicas han encontrado tesoros...",
-        "🃏 Cartas volando al CSV...",
-        "🌵 Más cartas cosechadas del desierto...",
-        "💨 ¡Polvo de cartas por todas partes!"
-    ]
-    print(f"{MAGENTA}{random.choice(mensajes)}{RESET}")
-    time.sleep(random.uniform(1, 2))
     return cartas
 
 # =========================================
 # Scraper principal
 # =========================================
 def scrapear_años_especificos(años):
+    """True si todos los años se recorrieron completos y se escribió el CSV."""
     todas = []
+    incompletos = []
     resumen_por_año = {}
     for year in años:
-        pagina = 1
         contador_por_año = 0
         print(f"\n{BOLD}{UNDERLINE}{YELLOW}🌟 Comenzando cosecha del año {year} 🌟{RESET}")
-        while True:
-            cartas = obtener_cartas_de_pagina(year, pagina)
+        paginas = crawler.recorrer(lambda pagina: BASE_URL.format(year=year, page=pagina),
+                                   lambda resp: parsear_pagina(resp, year),
+                                   headers=HEADERS, timeout=TIMEOUT, reintentos=REINTENTOS, espera=20,
+                                   checkpoint=f"Ficheros/.crawl_rivendelelconcilio_{year}.jsonl")
+        for pagina, cartas in paginas:
+            if cartas is None:
+                print(f"{RED}❌ Año {year}, página {pagina}: falló; la próxima corrida la vuelve a pedir.{RESET}")
+                continue
             if not cartas:
                 print(f"{GREEN}✅ Fin del año {year}. No hay más cartas.{RESET}")
-                break
+                continue
             todas.extend(cartas)
             contador_por_año += len(cartas)
             # Barra de progreso sencilla
-            print(f"{BLUE}📦 {len(cartas)} cartas agregadas en esta página. Total hasta ahora: {contador_por_año}{RESET}")
-            pagina += 1
+            print(f"{BLUE}📦 Año {year}, página {pagina}: {len(cartas)} cartas. Total hasta ahora: {contador_por_año}{RESET}")
+            print(f"{MAGENTA}{random.choice(MENSAJES)}{RESET}")
         resumen_por_año[year] = contador_por_año
+        if not paginas.completo:
+            incompletos.append(year)
         print(f"{CYAN}🎉 Total de cartas capturadas en {year}: {contador_por_año}{RESET}")
 
-    # Guardar CSV
-    if todas:
+    # Guardar CSV (sólo si todos los años quedaron completos: un catálogo a medias daría falsos "No")
+    if incompletos:
+        print(f"{RED}❌ Crawl incompleto en {', '.join(map(str, incompletos))}: no se escribe {OUTPUT_FILE}. "
+              f"Vuelva a correrlo; el checkpoint pide sólo lo que falta.{RESET}")
+    elif todas:
         with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
             campos = ["año", "nombre_original", "nombre", "precio", "url"]
             writer = csv.DictWriter(f, fieldnames=campos)
@@ -161,10 +155,11 @@ def scrapear_años_especificos(años):
     print(f"\n{YELLOW}{BOLD}📊 Resumen final por año:{RESET}")
     for year, total in resumen_por_año.items():
         print(f"{CYAN}- {year}: {total} cartas capturadas 🃏{RESET}")
+    return not incompletos and bool(todas)
 
 # =========================================
 # Ejecutar scraper
 # =========================================
 if __name__ == "__main__":
-    scrapear_años_especificos(AÑOS)
-    print(f"\n{MAGENTA}{BOLD}🏆 ¡Cosecha completa! Gracias por usar el Scraper Mágico 🌵🃏{RESET}\n")
+    if scrapear_años_especificos(AÑOS):
+        print(f"\n{MAGENTA}{BOLD}🏆 ¡Cosecha completa! Gracias por usar el Scraper Mágico 🌵🃏{RESET}\n")
@@ -1,10 +1,12 @@
-import requests
+import argparse
 import csv
 import os
 from datetime import datetime
-import time
 import random
 
+from tiendas import crawler, incremental
+from tiendas.shopify import precio_shopify
+
 # =========================================
 # ANSI colors y estilos
 # =========================================
@@ -22,10 +24,13 @@ UNDERLINE = "\033[4m"
 # =========================================
 # Configuración
 # =========================================
+# products.json no acepta orden por updated_at: sale en el orden de la colección. --incremental sólo
+# para antes si ese orden resulta ser por modificación; si no, el crawl es completo (ver tiendas.incremental)
 BASE_URL = "https://www.tiendalacomarca.cl/collections/mtg-singles/products.json"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 TIMEOUT = 10
 REINTENTOS = 5
+POR_PAGINA = 250  # máximo de products.json
 
 # Carpeta y nombre de archivo
 os.makedirs("Ficheros", exist_ok=True)
@@ -55,26 +60,12 @@ def limpiar_precio(precio):
     except:
         return 0
 
-def obtener_productos(pagina):
-    """Obtiene productos de la página JSON de Shopify"""
-    url = f"{BASE_URL}?page={pagina}"
-    intentos = 0
-    while intentos < REINTENTOS:
-        try:
-            print(f"{CYAN}🌾 Explorando página {pagina}...{RESET}")
-            resp = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-            productos = data.get("products", [])
-            print(f"{BLUE}🔹 Encontrados {len(productos)} productos en la página {pagina}{RESET}")
-            return productos
-        except requests.exceptions.RequestException as e:
-            intentos += 1
-            print(f"{RED}⚠️ Error al acceder a la página {pagina}: {e}{RESET}")
-            print(f"{YELLOW}⏱ Reintentando en 5 segundos...{RESET}")
-            time.sleep(5)
-    print(f"{RED}❌ Página {pagina} fallida {REINTENTOS} veces. Saltando...{RESET}")
-    return []
+def url_pagina(pagina):
+    return f"{BASE_URL}?limit={POR_PAGINA}&page={pagina}"
+
+def parsear_pagina(resp):
+    """Productos de la página JSON de Shopify"""
+    return extraer_datos(resp.json().get("products", []))
 
 def extraer_datos(productos):
     """Extrae nombre, precio y URL de cada producto"""
@@ -85,13 +76,15 @@ def extraer_datos(productos):
         url = f"https://www.tiendalacomarca.cl/products/{handle}" if handle else ""
         
         variantes = prod.get("variants", [])
-        precio_mas_bajo = min([int(v.get("price", 0)) for v in variantes]) if variantes else 0
+        # products.json trae "4200.00": int() directo fallaba en cada página
+        precio_mas_bajo = min([precio_shopify(v.get("price")) or 0 for v in variantes]) if variantes else 0
         precio_formateado = limpiar_precio(precio_mas_bajo)
         
         lista.append({
             "nombre": nombre,
             "precio": precio_formateado,
-            "url": url
+            "url": url,
+            "updated_at": incremental.fecha_utc(prod.get("updated_at"))
         })
     return lista
 
@@ -101,7 +94,7 @@ def guardar_csv(productos):
         print(f"{RED}❌ No hay productos para guardar.{RESET}")
         return
     with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-        campos = ["nombre", "precio", "url"]
+        campos = ["nombre", "precio", "url", "updated_at"]
         writer = csv.DictWriter(f, fieldnames=campos)
         writer.writeheader()
         writer.writerows(productos)
@@ -110,16 +103,32 @@ def guardar_csv(productos):
 # =========================================
 # Scraper principal
 # =========================================
-def scrapear_tienda():
+def scrapear_tienda(solo_cambios=False):
     todos_productos = []
-    pagina = 1
-    while True:
-        productos_json = obtener_productos(pagina)
-        if not productos_json:
+    cambios = None
+    if solo_cambios:
+        # Para al llegar a productos con updated_at anterior al último snapshot
+        ruta, previos = incremental.cargar_snapshot("TiendaLaComarca")
+        cambios = incremental.Cambios(previos, fecha="updated_at")
+        print(f"{CYAN}🔁 Crawl incremental contra {ruta or 'ningún snapshot (se baja todo)'}{RESET}")
+        print(f"{YELLOW}⚠ products.json no se puede pedir ordenado por updated_at: si la colección no viene "
+              f"ordenada así, el crawl será completo y sólo se informará lo que cambió.{RESET}")
+    avisado = False
+    paginas = crawler.recorrer(url_pagina, parsear_pagina, headers=HEADERS, timeout=TIMEOUT, reintentos=REINTENTOS,
+                               detener=cambios, checkpoint="Ficheros/.crawl_TiendaLaComarca.jsonl")
+    for pagina, productos_extraidos in paginas:
+        if productos_extraidos is None:
+            print(f"{RED}❌ La página {pagina} falló; la próxima corrida la vuelve a pedir.{RESET}")
+            continue
+        if not productos_extraidos:
             print(f"{GREEN}✅ No hay más productos en la página {pagina}. Finalizando.{RESET}")
-            break
-        
-        productos_extraidos = extraer_datos(productos_json)
+            continue
+
+        if cambios is not None and not cambios.ordenado and not avisado:
+            avisado = True
+            print(f"{YELLOW}⚠ Página {pagina}: los productos no vienen ordenados por updated_at; "
+                  f"se sigue con el crawl completo.{RESET}")
+
         todos_productos.extend(productos_extraidos)
         print(f"{MAGENTA}📦 Capturadas {len(productos_extraidos)} cartas en la página {pagina}{RESET}")
         
@@ -131,10 +140,15 @@ def scrapear_tienda():
             "💨 Polvo de cartas por todas partes..."
         ]
         print(f"{MAGENTA}{random.choice(mensajes)}{RESET}")
-        
-        pagina += 1
-        time.sleep(random.uniform(1, 2))
-    
+
+    if not paginas.completo:
+        # Un catálogo a medias daría falsos "No" en la búsqueda offline (tiendas.catalogo)
+        print(f"{RED}❌ El crawl quedó incompleto ({len(paginas.fallidas)} páginas fallidas): "
+              f"no se escribe {OUTPUT_FILE}. Vuelva a correrlo; el checkpoint pide sólo lo que falta.{RESET}")
+        return
+    if cambios is not None:
+        print(f"{CYAN}🔁 {cambios.resumen()}{RESET}")
+        todos_productos = cambios.fusionar()
     guardar_csv(todos_productos)
     print(f"\n{MAGENTA}{BOLD}🏆 ¡Cosecha completa! Gracias por usar el Scraper Mágico 🌵🃏{RESET}\n")
 
@@ -142,4 +156,8 @@ def scrapear_tienda():
 # Ejecutar scraper
 # =========================================
 if __name__ == "__main__":
-    scrapear_tienda()
+    parser = argparse.ArgumentParser(description="Crawl del catálogo de singles de Tienda La Comarca.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="bajar sólo lo modificado desde el último CSV en Ficheros/ y copiar el resto")
+    args = parser.parse_args()
+    scrapear_tienda(solo_cambios=args.incremental)
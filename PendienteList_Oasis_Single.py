@@ -1,10 +1,11 @@
-import requests
 import csv
 import os
 import time
 import random
 from datetime import datetime
 
+from tiendas.sesiones import obtener_sesion
+
 # ==================== ANSI COLORS ====================
 RESET = "\033[0m"
 BOLD = "\033[1m"
@@ -51,7 +52,7 @@ BASE_URL = "https://www.oasisgames.cl/collections/mtg-singles-instock/products.j
 def obtener_productos():
     print(f"{BOLD}{YELLOW}🔥 Iniciando extracción de productos desde el desierto de Arrakis... 🔥{RESET}\n")
 
-    session = requests.Session()
+    session = obtener_sesion(BASE_URL)
     page = 1
     total_global = 0
     all_products = []
@@ -0,0 +1,44 @@
+"""
+Benchmark: optimizador de canasta (`tiendas.canasta`) con datos sintéticos.
+
+Arma una matriz carta × tienda al azar (cada tienda tiene ~50% de las cartas),
+con envío, envío gratis y compra mínima distintos por tienda, y mide cuánto
+tarda `optimizar` frente a la compra ingenua carta por carta.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_canasta.py [N_CARTAS] [N_TIENDAS]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiendas import canasta  # noqa: E402
+
+N_CARTAS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+N_TIENDAS = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+def datos_sinteticos(semilla=1):
+    azar = random.Random(semilla)
+    tiendas = [f"Tienda{i}" for i in range(N_TIENDAS)]
+    envios = {t: {"envio": azar.choice([3000, 4000, 5000]),
+                  "gratis_desde": azar.choice([None, 30000, 50000]),
+                  "minimo": azar.choice([0, 0, 5000])} for t in tiendas}
+    precios = {f"Carta {i}": {t: azar.randint(2, 60) * 100 for t in tiendas if azar.random() < 0.5}
+               for i in range(N_CARTAS)}
+    return precios, envios
+
+if __name__ == "__main__":
+    precios, envios = datos_sinteticos()
+    ingenua = canasta.mas_barata_por_carta(precios, envios=envios)
+    print(f"{N_CARTAS} cartas × {N_TIENDAS} tiendas")
+    print(f"carta por carta: ${ingenua.total:,} en {len(ingenua.tiendas)} tiendas")
+    for max_tiendas in (None, 5, 3):
+        inicio = time.perf_counter()
+        plan = canasta.optimizar(precios, max_tiendas=max_tiendas, envios=envios)
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"optimizar(max_tiendas={max_tiendas}): ${plan.total:,} en {len(plan.tiendas)} tiendas, "
+              f"{len(plan.faltantes)} sin cubrir, {ms:.0f} ms")
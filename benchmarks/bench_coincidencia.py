@@ -0,0 +1,77 @@
+"""
+Benchmark: comparación de nombres, reglas por adaptador vs tiendas.coincidencia.
+
+Arma una lista grande de títulos de producto (nombres de buscar.txt con
+edición y variante, p.ej. "Sol Ring (CMM) - Foil") y cruza cada consulta
+contra todos los títulos con:
+1) la regla vieja de AFKStore/CardNexus/TCGMatch: re.findall(r'\\w+') de la
+   consulta y del título en cada comparación
+2) la regla vieja de substring (inekosingles, huntercardtcg, ...)
+3) `consulta(carta).coincide(titulo)` y `.contiene(titulo)`, con la consulta
+   precompilada y los títulos normalizados una sola vez
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_coincidencia.py [N_TITULOS] [N_CONSULTAS]
+"""
+
+import itertools
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiendas import coincidencia  # noqa: E402
+
+N_TITULOS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+N_CONSULTAS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+EDICIONES = ["CMM", "C21", "M10", "2XM", "LTC", "FIN", "ONE", "MH3"]
+VARIANTES = ["", " - Foil", " - Borderless", " – Foil Etched", " [Showcase]"]
+
+def cargar_nombres():
+    try:
+        with open("buscar.txt", encoding="utf-8") as f:
+            nombres = [linea.strip() for linea in f if linea.strip()]
+    except FileNotFoundError:
+        nombres = []
+    return nombres or [f"Carta de Prueba {i}" for i in range(500)]
+
+def regla_palabras(nombre_producto, nombre):
+    palabras_busqueda = re.findall(r'\w+', nombre_producto.lower())
+    palabras_titulo = re.findall(r'\w+', nombre.lower())
+    return all(palabra in palabras_titulo for palabra in palabras_busqueda)
+
+def regla_substring(nombre_producto, nombre):
+    return nombre_producto.lower() in nombre.lower()
+
+def medir(etiqueta, funcion, consultas, titulos):
+    inicio = time.perf_counter()
+    aciertos = 0
+    for c in consultas:
+        for t in titulos:
+            if funcion(c, t):
+                aciertos += 1
+    total = time.perf_counter() - inicio
+    comparaciones = len(consultas) * len(titulos)
+    print(f"{etiqueta:<28} {total:8.2f}s {comparaciones / total / 1e6:8.2f} M/s {aciertos:>8}")
+    return total
+
+def main():
+    nombres = cargar_nombres()
+    combinaciones = itertools.cycle(itertools.product(nombres, EDICIONES, VARIANTES))
+    titulos = [f"{n} ({e}){v}" for n, e, v in itertools.islice(combinaciones, N_TITULOS)]
+    consultas = nombres[:N_CONSULTAS]
+
+    print(f"títulos: {len(titulos)} | consultas: {len(consultas)}\n")
+    print(f"{'Regla':<28} {'tiempo':>9} {'comparac.':>10} {'aciertos':>8}")
+    viejo = medir("palabras (re.findall)", regla_palabras, consultas, titulos)
+    medir("substring (.lower() in)", regla_substring, consultas, titulos)
+    coincidencia.palabras_titulo.cache_clear()
+    nuevo = medir("coincidencia.coincide", coincidencia.coincide, consultas, titulos)
+    medir("coincidencia.contiene", coincidencia.contiene, consultas, titulos)
+    print(f"\ncoincide vs re.findall: {viejo / nuevo:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: crawl de catálogo página por página vs. `tiendas.crawler`.
+
+Levanta un servidor local que responde N páginas con una latencia fija y mide:
+1) una página a la vez (como hacían los List_* salvo BloodMoon)
+2) `crawler.recorrer` con `CONCURRENCIA` páginas en vuelo, en orden
+
+Sin el límite por dominio (`tiendas.limites.ACTIVO = False`), para medir sólo
+el motor; contra una tienda real el límite de tasa manda.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_crawler.py [N_PAGINAS] [LATENCIA_SEGUNDOS]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiendas import crawler, limites  # noqa: E402
+
+N_PAGINAS = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+LATENCIA = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+class Catalogo(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        pagina = int(parse_qs(urlsplit(self.path).query)["page"][0])
+        time.sleep(LATENCIA)
+        items = [] if pagina > N_PAGINAS else [f"Carta {pagina}-{i}" for i in range(24)]
+        cuerpo = json.dumps({"products": items}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+def correr(url_pagina, concurrencia):
+    inicio = time.perf_counter()
+    items = crawler.recorrer_todo(url_pagina, lambda r: r.json()["products"], concurrencia=concurrencia)
+    return time.perf_counter() - inicio, len(items)
+
+if __name__ == "__main__":
+    limites.ACTIVO = False
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Catalogo)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_port}/products.json?page={{}}"
+
+    t_serie, n_serie = correr(base.format, 1)
+    t_ventana, n_ventana = correr(base.format, crawler.CONCURRENCIA)
+    servidor.shutdown()
+
+    print(f"{N_PAGINAS} páginas, {LATENCIA:.2f}s de latencia por página")
+    print(f"Una a la vez:            {t_serie:6.2f}s ({n_serie} items)")
+    print(f"Ventana de {crawler.CONCURRENCIA} páginas:    {t_ventana:6.2f}s ({n_ventana} items)")
+    print(f"Aceleración:             {t_serie / t_ventana:6.1f}x")
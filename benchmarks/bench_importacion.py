@@ -0,0 +1,53 @@
+"""
+Benchmark: tiempo de importación con el registro diferido de tiendas.
+
+Cada caso corre en un proceso nuevo (Python en frío) y mide cuánto tarda en
+importar y dejar listas las tiendas pedidas:
+- `import tiendas` (lo que pagan los scripts List_* y los clientes)
+- `import tiendas.motor` sin cargar adaptadores (respuestas desde caché/catálogo)
+- motor + adaptadores de una selección (`--tiendas shopify`, `TCGMatch`, todas)
+
+Referencia antes del registro (mismo equipo, `python -X importtime`):
+`import tiendas` ~150-200 ms y `import tiendas.motor` ~215-235 ms, porque
+se importaban siempre los 15 adaptadores, BeautifulSoup y requests.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_importacion.py [REPETICIONES]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPETICIONES = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+CASOS = [
+    ("import tiendas", "import tiendas"),
+    ("import tiendas.motor", "import tiendas.motor"),
+    ("motor + TCGMatch", "import tiendas.motor; from tiendas import registro\n"
+                         "for t in registro.configurar('TCGMatch'): t.metadata"),
+    ("motor + shopify", "import tiendas.motor; from tiendas import registro\n"
+                        "for t in registro.configurar('shopify'): t.metadata"),
+    ("motor + todas", "import tiendas.motor; from tiendas import registro\n"
+                      "for t in registro.configurar(): t.metadata"),
+]
+
+PLANTILLA = """
+import time
+inicio = time.perf_counter()
+{codigo}
+print((time.perf_counter() - inicio) * 1000)
+"""
+
+def medir(codigo):
+    salida = subprocess.run([sys.executable, "-c", PLANTILLA.format(codigo=codigo)],
+                            cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    return float(salida.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    print(f"{'caso':<24} {'mediana':>10} {'mín':>10}   ({REPETICIONES} procesos)")
+    for nombre, codigo in CASOS:
+        tiempos = [medir(codigo) for _ in range(REPETICIONES)]
+        print(f"{nombre:<24} {statistics.median(tiempos):>8.1f}ms {min(tiempos):>8.1f}ms")
@@ -0,0 +1,59 @@
+"""
+Benchmark: estadísticas del lote con la matriz NumPy vs. recorrer listas.
+
+Genera N cartas × todas las tiendas con resultados sintéticos y compara
+mejor precio + segundo mejor + diferencia + cobertura calculados:
+1) carta por carta en Python (como `obtener_mejor_precio`)
+2) con `tiendas.matriz.MatrizPrecios` (vectorizado)
+
+Uso (desde la raíz del repo, necesita numpy):
+    python benchmarks/bench_matriz.py [N_CARTAS] [N_TIENDAS]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiendas.matriz import MatrizPrecios  # noqa: E402
+from tiendas.resultado import Resultado  # noqa: E402
+
+N_CARTAS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+N_TIENDAS = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+def con_listas(resultados_por_carta):
+    cobertura = {}
+    filas = []
+    for carta, resultados in resultados_por_carta.items():
+        disponibles = sorted(r.precio for r in resultados if r.disponible and r.precio is not None)
+        for r in resultados:
+            if r.disponible and r.precio is not None:
+                cobertura[r.tienda] = cobertura.get(r.tienda, 0) + 1
+        mejor = disponibles[0] if disponibles else None
+        segundo = disponibles[1] if len(disponibles) > 1 else None
+        filas.append((carta, mejor, segundo, segundo - mejor if segundo else 0))
+    return filas, cobertura
+
+if __name__ == "__main__":
+    azar = random.Random(1)
+    tiendas = [f"Tienda{i}" for i in range(N_TIENDAS)]
+    datos = {f"Carta {i}": [Resultado(t, azar.random() < 0.6, "x", azar.randint(1, 500) * 100) for t in tiendas]
+             for i in range(N_CARTAS)}
+
+    inicio = time.perf_counter()
+    con_listas(datos)
+    t_listas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    precios = MatrizPrecios.desde_resultados(datos, tiendas)
+    t_armar = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    precios.mejores(), precios.segundos(), precios.diferencia(), precios.cobertura()
+    t_vector = time.perf_counter() - inicio
+
+    print(f"{N_CARTAS} cartas × {N_TIENDAS} tiendas")
+    print(f"listas en Python:        {t_listas * 1000:8.1f} ms")
+    print(f"armar matriz:            {t_armar * 1000:8.1f} ms")
+    print(f"estadísticas vectorizadas: {t_vector * 1000:6.1f} ms")
@@ -0,0 +1,65 @@
+"""
+Benchmark: tiempo de parseo por tienda, camino clásico vs capa rápida.
+
+Para cada adaptador de `tiendas` que declara CONTENEDORES, toma su página de
+búsqueda guardada en benchmarks/paginas/<modulo>.html (p.ej. AFKStore.html,
+guardada desde el navegador o con curl) y compara:
+1) BeautifulSoup(html, 'html.parser') de la página completa (como antes)
+2) tiendas.parseo.crear_sopa(html, CONTENEDORES) (lxml + sólo productos)
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_parseo.py [CARPETA_PAGINAS] [REPETICIONES]
+"""
+
+import glob
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from tiendas.parseo import PARSER, crear_sopa  # noqa: E402
+
+CARPETA = sys.argv[1] if len(sys.argv) > 1 else os.path.join("benchmarks", "paginas")
+REPETICIONES = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+def main():
+    paginas = sorted(glob.glob(os.path.join(CARPETA, "*.html")))
+    if not paginas:
+        print(f"No hay páginas guardadas en {CARPETA}/ (se espera <modulo>.html, ej: AFKStore.html)")
+        return
+
+    print(f"Parser rápido: {PARSER or 'no disponible (se usará html.parser)'} | repeticiones: {REPETICIONES}\n")
+    print(f"{'Tienda':<22} {'KB':>6} {'clásico ms':>11} {'rápido ms':>10} {'x':>6}")
+    total_clasico = total_rapido = 0.0
+    for ruta in paginas:
+        modulo_nombre = os.path.splitext(os.path.basename(ruta))[0]
+        try:
+            modulo = importlib.import_module(f"tiendas.{modulo_nombre}")
+        except ImportError:
+            print(f"{modulo_nombre:<22} (no existe tiendas.{modulo_nombre}, se omite)")
+            continue
+        with open(ruta, "rb") as f:
+            html = f.read()
+        solo = getattr(modulo, "CONTENEDORES", None)
+
+        clasico = medir(lambda: BeautifulSoup(html, "html.parser"), REPETICIONES)
+        rapido = medir(lambda: crear_sopa(html, solo), REPETICIONES)
+        total_clasico += clasico
+        total_rapido += rapido
+        print(f"{modulo_nombre:<22} {len(html) / 1024:6.0f} {clasico:11.1f} {rapido:10.1f} {clasico / rapido:6.1f}")
+
+    if total_rapido:
+        print(f"\n{'TOTAL':<22} {'':>6} {total_clasico:11.1f} {total_rapido:10.1f} {total_clasico / total_rapido:6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: handshakes TCP+TLS ahorrados por el registro de sesiones.
+
+Corre las mismas N cartas de buscar.txt contra todas las tiendas dos veces:
+1) sin reutilizar conexiones (una sesión nueva por consulta, como antes)
+2) con el pool keep-alive por host de `tiendas.sesiones`
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_sesiones.py [N_CARTAS]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiendas import sesiones  # noqa: E402
+from tiendas.motor import buscar_en_tiendas  # noqa: E402
+
+N_CARTAS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+_crear_sesion_original = sesiones.crear_sesion
+consultas = 0
+
+def crear_sesion_contada():
+    """Igual que crear_sesion, pero cuenta cada respuesta recibida."""
+    def contar(respuesta, *args, **kwargs):
+        global consultas
+        consultas += 1
+    sesion = _crear_sesion_original()
+    sesion.hooks["response"].append(contar)
+    return sesion
+
+def correr(cartas, reutilizar):
+    global consultas
+    consultas = 0
+    sesiones.cerrar_sesiones()
+    sesiones.REUTILIZAR_CONEXIONES = reutilizar
+    inicio = time.perf_counter()
+    for carta in cartas:
+        buscar_en_tiendas(carta)
+    total = time.perf_counter() - inicio
+    if reutilizar:
+        handshakes = sum(sesiones.conexiones_abiertas().values())
+    else:
+        handshakes = consultas
+    return total, consultas, handshakes
+
+def main():
+    with open("buscar.txt", "r", encoding="utf-8") as f:
+        cartas = [line.strip() for line in f if line.strip()][:N_CARTAS]
+
+    sesiones.crear_sesion = crear_sesion_contada
+    t_frio, q_frio, h_frio = correr(cartas, reutilizar=False)
+    t_pool, q_pool, h_pool = correr(cartas, reutilizar=True)
+
+    print("\n=== Sesiones: sin pool vs pool keep-alive ===")
+    print(f"Cartas: {len(cartas)}")
+    print(f"Sin pool : {t_frio:7.2f}s | consultas {q_frio:4d} | handshakes {h_frio:4d}")
+    print(f"Con pool : {t_pool:7.2f}s | consultas {q_pool:4d} | handshakes {h_pool:4d}")
+    ahorrados = h_frio - h_pool
+    if ahorrados > 0:
+        print(f"Handshakes ahorrados: {ahorrados} (~{(t_frio - t_pool) / ahorrados * 1000:.0f} ms c/u)")
+    print(f"Tiempo ahorrado: {t_frio - t_pool:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Suite de benchmarks reproducible sobre las respuestas grabadas.
+
+Levanta benchmarks/servidor_replay.py en un puerto libre, redirige ahí todas
+las sesiones (`tiendas.sesiones.redirigir_a`) y mide, sin tocar las tiendas:
+1) Throughput por adaptador: cada `buscar` contra el replay sin latencia,
+   o sea, casi sólo parseo (consultas/s y ms por consulta).
+2) Latencia end-to-end por carta (p50/p90/p99/máx) con la latencia, jitter y
+   errores que se indiquen: total, tiempo al primer resultado y tiempo hasta
+   que llegó el más barato (`buscar_en_vivo`).
+Caché y catálogo quedan desactivados, y el límite de tasa también salvo
+--con-limites. Las cartas salen de fixtures/cartas.txt (ver grabar_fixtures.py).
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_suite.py [--repeticiones 3] [--latencia 80] [--jitter 40]
+                                     [--errores 0.02] [--429 0.02] [--solo-adaptadores | --solo-e2e]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+from servidor_replay import iniciar_servidor  # noqa: E402
+
+from tiendas import cache, catalogo, limites, sesiones, tiendas  # noqa: E402
+from tiendas.motor import buscar_en_vivo  # noqa: E402
+
+def percentil(valores, p):
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+def bench_adaptadores(cartas, repeticiones):
+    print(f"{'Tienda':<22} {'consultas/s':>12} {'ms/consulta':>12} {'con stock':>10}")
+    for tienda in tiendas:
+        con_stock = 0
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeticiones):
+                for carta in cartas:
+                    if tienda["func"](carta).disponible:
+                        con_stock += 1
+        total = time.perf_counter() - inicio
+        consultas = repeticiones * len(cartas)
+        print(f"{tienda['nombre']:<22} {consultas / total:12.1f} {total / consultas * 1000:12.1f} "
+              f"{con_stock // repeticiones:>6}/{len(cartas)}")
+
+def bench_e2e(cartas, repeticiones):
+    tiempos = {"total": [], "primer resultado": [], "más barato": []}
+    inicio_total = time.perf_counter()
+    for _ in range(repeticiones):
+        for carta in cartas:
+            inicio = time.perf_counter()
+            primero = mejor = precio_mejor = None
+            with contextlib.redirect_stdout(io.StringIO()):
+                for segundos, r in buscar_en_vivo(carta):
+                    if primero is None:
+                        primero = segundos
+                    if r.disponible and r.precio is not None and (precio_mejor is None or r.precio < precio_mejor):
+                        precio_mejor, mejor = r.precio, segundos
+            tiempos["total"].append((time.perf_counter() - inicio) * 1000)
+            if primero is not None:
+                tiempos["primer resultado"].append(primero * 1000)
+            if mejor is not None:
+                tiempos["más barato"].append(mejor * 1000)
+    total = time.perf_counter() - inicio_total
+    print(f"cartas: {len(tiempos['total'])} | total: {total:.2f}s")
+    for nombre, valores in tiempos.items():
+        if valores:
+            print(f"{nombre:<17} p50: {percentil(valores, 50):5.0f} ms | p90: {percentil(valores, 90):5.0f} ms | "
+                  f"p99: {percentil(valores, 99):5.0f} ms | máx: {max(valores):5.0f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks sobre respuestas grabadas de las tiendas.")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--latencia", type=float, default=0, help="ms fijos por respuesta (sólo e2e)")
+    parser.add_argument("--jitter", type=float, default=0, help="ms aleatorios extra (sólo e2e)")
+    parser.add_argument("--errores", type=float, default=0.0, help="fracción de respuestas 500 (sólo e2e)")
+    parser.add_argument("--429", dest="tasa_429", type=float, default=0.0, help="fracción de 429 (sólo e2e)")
+    parser.add_argument("--con-limites", action="store_true", help="mantener el límite de tasa por dominio")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--solo-adaptadores", action="store_true")
+    grupo.add_argument("--solo-e2e", action="store_true")
+    args = parser.parse_args()
+
+    cartas = fixtures.leer_cartas()
+    if not cartas:
+        print(f"No hay fixtures en {fixtures.CARPETA}/; grábalas primero con benchmarks/grabar_fixtures.py")
+        return
+
+    cache.configurar(usar=False)
+    catalogo.configurar(usar=False)
+    limites.ACTIVO = args.con_limites
+
+    if not args.solo_e2e:
+        servidor, base = iniciar_servidor()
+        sesiones.redirigir_a(base)
+        print(f"== Throughput por adaptador (replay sin latencia, {args.repeticiones} repeticiones) ==")
+        bench_adaptadores(cartas, args.repeticiones)
+        servidor.shutdown()
+        sesiones.cerrar_sesiones()
+        print()
+
+    if not args.solo_adaptadores:
+        servidor, base = iniciar_servidor(
+            latencia=args.latencia, jitter=args.jitter, tasa_error=args.errores, tasa_429=args.tasa_429,
+        )
+        sesiones.redirigir_a(base)
+        print(f"== Búsqueda end-to-end (latencia {args.latencia:.0f}±{args.jitter:.0f} ms, "
+              f"errores {args.errores:.0%}, 429 {args.tasa_429:.0%}) ==")
+        bench_e2e(cartas, args.repeticiones)
+        servidor.shutdown()
+
+    sesiones.redirigir_a(None)
+    sesiones.cerrar_sesiones()
+
+if __name__ == "__main__":
+    main()
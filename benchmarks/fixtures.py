@@ -0,0 +1,56 @@
+"""
+Formato de las respuestas grabadas (fixtures) que usan los benchmarks.
+
+Cada respuesta queda en benchmarks/fixtures/<host>/<clave>.json, donde la
+clave sale de la ruta + query de la URL original. Se guarda el cuerpo ya
+descomprimido, así que el servidor de reproducción no reenvía
+Content-Encoding ni Content-Length.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+
+CARPETA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+RUTA_CARTAS = os.path.join(CARPETA, "cartas.txt")
+HEADERS_GUARDADOS = ("Content-Type", "Location", "Retry-After")
+
+def clave(ruta_y_query):
+    return hashlib.sha1(ruta_y_query.encode("utf-8")).hexdigest()[:20]
+
+def ruta_fixture(host, ruta_y_query, carpeta=CARPETA):
+    return os.path.join(carpeta, host.lower(), clave(ruta_y_query) + ".json")
+
+def ruta_y_query(url):
+    partes = urlsplit(url)
+    return (partes.path or "/") + (f"?{partes.query}" if partes.query else "")
+
+def guardar(url, respuesta, carpeta=CARPETA):
+    """Graba una respuesta de requests para la URL original `url`."""
+    ruta = ruta_fixture(urlsplit(url).netloc, ruta_y_query(url), carpeta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    datos = {
+        "url": url,
+        "estado": respuesta.status_code,
+        "headers": {h: respuesta.headers[h] for h in HEADERS_GUARDADOS if h in respuesta.headers},
+        "cuerpo": base64.b64encode(respuesta.content).decode("ascii"),
+    }
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+
+def cargar(host, ruta_y_query_, carpeta=CARPETA):
+    """Devuelve (estado, headers, cuerpo) o None si no está grabada."""
+    ruta = ruta_fixture(host, ruta_y_query_, carpeta)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    return datos["estado"], datos["headers"], base64.b64decode(datos["cuerpo"])
+
+def leer_cartas(ruta=RUTA_CARTAS):
+    if not os.path.exists(ruta):
+        return []
+    with open(ruta, encoding="utf-8") as f:
+        return [linea.strip() for linea in f if linea.strip()]
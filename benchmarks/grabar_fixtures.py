@@ -0,0 +1,65 @@
+"""
+Graba las respuestas reales de las 15 tiendas para un set de cartas.
+
+Corre `buscar_en_tiendas` (sin caché ni catálogo, para ir siempre en vivo)
+y guarda cada respuesta HTTP, redirecciones incluidas, en
+benchmarks/fixtures/. La lista de cartas queda en fixtures/cartas.txt para
+que bench_suite.py repita exactamente las mismas búsquedas.
+
+Uso (desde la raíz del repo):
+    python benchmarks/grabar_fixtures.py [N_CARTAS | carta1 carta2 ...]
+Sin argumentos toma las primeras 10 cartas de buscar.txt.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+from tiendas import cache, catalogo, sesiones  # noqa: E402
+from tiendas.motor import buscar_en_tiendas  # noqa: E402
+
+def elegir_cartas(argumentos):
+    if argumentos and not argumentos[0].isdigit():
+        return argumentos
+    n = int(argumentos[0]) if argumentos else 10
+    with open("buscar.txt", encoding="utf-8") as f:
+        return [linea.strip() for linea in f if linea.strip()][:n]
+
+def main():
+    cartas = elegir_cartas(sys.argv[1:])
+    cache.configurar(usar=False)
+    catalogo.configurar(usar=False)
+
+    grabadas = 0
+    lock = threading.Lock()
+
+    def grabar(url, respuesta):
+        nonlocal grabadas
+        fixtures.guardar(url, respuesta)
+        with lock:
+            grabadas += 1
+
+    sesiones.grabar_respuestas(grabar)
+    try:
+        for carta in cartas:
+            with contextlib.redirect_stdout(io.StringIO()):
+                resultados = buscar_en_tiendas(carta)
+            encontradas = sum(1 for r in resultados if r.disponible)
+            print(f"{carta}: {encontradas}/{len(resultados)} tiendas con stock")
+    finally:
+        sesiones.grabar_respuestas(None)
+
+    os.makedirs(fixtures.CARPETA, exist_ok=True)
+    with open(fixtures.RUTA_CARTAS, "w", encoding="utf-8") as f:
+        f.write("\n".join(cartas) + "\n")
+    print(f"\n{grabadas} respuestas grabadas en {fixtures.CARPETA}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Servidor HTTP local que reproduce las respuestas grabadas en benchmarks/fixtures/.
+
+Recibe las consultas que `tiendas.sesiones.redirigir_a` reescribe como
+/<host>/<ruta>?<query> y devuelve la respuesta grabada (404 si no existe).
+Para simular la red se puede agregar latencia, jitter y errores:
+- latencia: milisegundos fijos por respuesta
+- jitter: milisegundos aleatorios extra (uniforme 0..jitter)
+- tasa_error: fracción de respuestas que vuelven 500
+- tasa_429: fracción que vuelven 429 con Retry-After: 0
+
+Uso (desde la raíz del repo, para dejarlo corriendo):
+    python benchmarks/servidor_replay.py [PUERTO] [LATENCIA_MS] [JITTER_MS] [TASA_ERROR] [TASA_429]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+class ManejadorReplay(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                # keep-alive, como las tiendas reales
+
+    def do_GET(self):
+        config = self.server.config
+        espera = config["latencia"] + random.uniform(0, config["jitter"])
+        if espera:
+            time.sleep(espera / 1000)
+
+        azar = random.random()
+        if azar < config["tasa_error"]:
+            return self.responder(500, {"Content-Type": "text/plain"}, b"error inyectado")
+        if azar < config["tasa_error"] + config["tasa_429"]:
+            return self.responder(429, {"Content-Type": "text/plain", "Retry-After": "0"}, b"limitado")
+
+        host, _, resto = self.path.lstrip("/").partition("/")
+        grabada = fixtures.cargar(host, "/" + resto, config["carpeta"])
+        if grabada is None:
+            return self.responder(404, {"Content-Type": "text/plain"}, b"sin fixture")
+        self.responder(*grabada)
+
+    def responder(self, estado, headers, cuerpo):
+        self.send_response(estado)
+        for nombre, valor in headers.items():
+            self.send_header(nombre, valor)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+def iniciar_servidor(puerto=0, latencia=0, jitter=0, tasa_error=0.0, tasa_429=0.0, carpeta=fixtures.CARPETA):
+    """Arranca el servidor en un hilo; devuelve (servidor, base_url). `puerto=0` elige uno libre."""
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), ManejadorReplay)
+    servidor.daemon_threads = True
+    servidor.config = {
+        "latencia": latencia,
+        "jitter": jitter,
+        "tasa_error": tasa_error,
+        "tasa_429": tasa_429,
+        "carpeta": carpeta,
+    }
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    servidor, base = iniciar_servidor(
+        puerto=int(args[0]) if len(args) > 0 else 8765,
+        latencia=float(args[1]) if len(args) > 1 else 0,
+        jitter=float(args[2]) if len(args) > 2 else 0,
+        tasa_error=float(args[3]) if len(args) > 3 else 0.0,
+        tasa_429=float(args[4]) if len(args) > 4 else 0.0,
+    )
+    print(f"Reproduciendo {fixtures.CARPETA} en {base} (Ctrl+C para salir)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -0,0 +1,96 @@
+"""
+Verificación: optimizador de canasta (`tiendas.canasta`) contra fuerza bruta.
+
+Genera casos chicos al azar (pocas cartas y tiendas, con envío, envío gratis,
+compra mínima, cantidades y máximo de tiendas distintos) y compara
+`optimizar` con la mejor de todas las asignaciones carta -> tienda posibles
+(incluida la de no comprar una carta). Se revisan dos caminos:
+- `optimizar` tal cual: en casos chicos debe dar exactamente el óptimo.
+- la heurística (con `MAX_EXACTO = 0`): no debe caerse; se informa en cuántos
+  casos quedó peor que el óptimo y por cuánto.
+Termina con código 1 si el primer camino no da el óptimo o si alguno se cae.
+
+Uso (desde la raíz del repo):
+    python benchmarks/verificar_canasta.py [CASOS] [SEMILLA]
+"""
+
+import itertools
+import os
+import random
+import sys
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiendas import canasta  # noqa: E402
+
+CASOS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+SEMILLA = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+def caso(azar, n_cartas=5, n_tiendas=4):
+    tiendas = [f"Tienda{i}" for i in range(n_tiendas)]
+    envios = {t: {"envio": azar.choice([2000, 3000, 4000, 5000]),
+                  "gratis_desde": azar.choice([None, 4000, 5000, 8000, 10000]),
+                  "minimo": azar.choice([0, 0, 0, 3000])} for t in tiendas}
+    precios = {f"Carta {i}": {t: azar.randint(5, 40) * 100 for t in tiendas if azar.random() < 0.6}
+               for i in range(n_cartas)}
+    cantidades = {c: azar.choice([1, 1, 1, 2]) for c in precios}
+    max_tiendas = azar.choice([None, None, 2])
+    return precios, cantidades, max_tiendas, envios
+
+def fuerza_bruta(precios, cantidades, max_tiendas, envios):
+    """La mejor canasta entre todas las asignaciones (None = no comprar la carta)."""
+    cartas = list(precios)
+    mejor = None
+    for eleccion in itertools.product(*([None, *precios[c]] for c in cartas)):
+        usadas = {t for t in eleccion if t}
+        if max_tiendas and len(usadas) > max_tiendas:
+            continue
+        asignacion = {c: (t, precios[c][t]) for c, t in zip(cartas, eleccion) if t}
+        faltantes = [c for c, t in zip(cartas, eleccion) if not t]
+        plan = canasta.Canasta(asignacion, cantidades, faltantes, envios)
+        if any(s < canasta.envio_de(t, envios)["minimo"] for t, s in plan.subtotales.items()):
+            continue
+        if mejor is None or plan.clave() < mejor.clave():
+            mejor = plan
+    return mejor
+
+def probar(precios, cantidades, max_tiendas, envios):
+    """Canasta de `optimizar`, o None si se cayó (el error se imprime)."""
+    try:
+        return canasta.optimizar(precios, cantidades, max_tiendas=max_tiendas, envios=envios)
+    except Exception:
+        traceback.print_exc()
+        return None
+
+def main():
+    azar = random.Random(SEMILLA)
+    casos = [caso(azar) for _ in range(CASOS)]
+    optimos = [fuerza_bruta(*c) for c in casos]
+
+    errores = 0
+    distintos = sum(1 for c, o in zip(casos, optimos) if (r := probar(*c)) is None or r.clave() != o.clave())
+    print(f"optimizar: {distintos} de {CASOS} casos distintos del óptimo")
+    errores += distintos
+
+    exacto, canasta.MAX_EXACTO = canasta.MAX_EXACTO, 0
+    caidas = peores = 0
+    peor = 0.0
+    try:
+        for c, optimo in zip(casos, optimos):
+            r = probar(*c)
+            if r is None:
+                caidas += 1
+            elif r.clave() > optimo.clave():
+                peores += 1
+                if len(r.faltantes) == len(optimo.faltantes):
+                    peor = max(peor, r.total / optimo.total - 1)
+    finally:
+        canasta.MAX_EXACTO = exacto
+    print(f"heurística: {caidas} caídas, {peores} de {CASOS} casos peores que el óptimo "
+          f"(hasta {peor:.1%} más caro)")
+    errores += caidas
+    return 1 if errores else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,61 @@
 import os
+import re
 import csv
+import sys
+import json
+import time
+import shutil
+import unicodedata
+import argparse
+from contextlib import redirect_stdout
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from tiendas import tiendas  # tu lista de tiendas con {"nombre":..., "func":...}
+from tiendas import bitacora, cache, canasta, catalogo, matriz, mazo, motor, registro, salud
+from tiendas.motor import buscar_a_medida, buscar_en_vivo, buscar_en_orden
+from tiendas.resultado import formatear_moneda
+
+# --- Opciones de línea de comandos ---
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Busca cartas en todas las tiendas y resalta la opción más económica.")
+    parser.add_argument("--no-cache", action="store_true", help="no leer ni guardar el caché de búsquedas")
+    parser.add_argument("--refresh", action="store_true", help="ignorar el caché al leer y volver a descargar todo")
+    parser.add_argument("--no-catalog", action="store_true", help="no responder desde los catálogos crawleados en Ficheros/")
+    parser.add_argument("--plazo", type=float, default=None, metavar="SEGUNDOS",
+                        help="mostrar lo que llegó en ese tiempo; las tiendas lentas quedan pendientes y siguen llenando el caché")
+    parser.add_argument("--max-tiendas", type=int, default=None, metavar="N",
+                        help="en varias cartas, armar la canasta más barata (con envío) usando a lo más N tiendas")
+    parser.add_argument("--parquet", action="store_true",
+                        help="en varias cartas, guardar también la matriz de precios en Parquet (necesita numpy y pyarrow)")
+    parser.add_argument("--tiendas", default=os.environ.get("BUSCADOR_TIENDAS"), metavar="LISTA",
+                        help="sólo estas tiendas, plataformas o capacidades, separadas por coma (ej. shopify,TCGMatch)")
+    parser.add_argument("--exclude", default=os.environ.get("BUSCADOR_EXCLUIR"), metavar="LISTA",
+                        help="tiendas, plataformas o capacidades a omitir, separadas por coma")
+    pendiente = parser.add_mutually_exclusive_group()
+    pendiente.add_argument("--resume", action="store_true",
+                           help="en varias cartas, seguir la búsqueda cortada usando la bitácora (no repite lo ya buscado)")
+    pendiente.add_argument("--fresh", action="store_true",
+                           help="en varias cartas, descartar la bitácora de una búsqueda cortada y empezar de cero")
+    parser.add_argument("--reconstruir", action="store_true",
+                        help="armar la Ficha_Cartas desde la bitácora de una búsqueda cortada, sin buscar nada")
+    lote = parser.add_mutually_exclusive_group()
+    lote.add_argument("--file", metavar="ARCHIVO",
+                      help="modo no interactivo: buscar las cartas de ARCHIVO y escribir cada resultado en stdout")
+    lote.add_argument("--stdin", action="store_true",
+                      help="modo no interactivo: leer las cartas desde stdin")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson",
+                        help="formato de salida del modo no interactivo (una fila por carta y tienda)")
+    parser.add_argument("--concurrency", type=int, default=None, metavar="N",
+                        help=f"pares (carta, tienda) consultados a la vez (por defecto {motor.MAX_EN_VUELO})")
+    return parser
+
+def configurar(args, parser):
+    cache.configurar(usar=not args.no_cache, refrescar=args.refresh)
+    catalogo.configurar(usar=not args.no_catalog)
+    try:
+        registro.configurar(args.tiendas, args.exclude)
+        motor.configurar(max_en_vuelo=args.concurrency)
+    except ValueError as e:
+        parser.error(str(e))
 
 # --- Colores para la terminal ---
 class Colores:
@@ -32,73 +85,310 @@ def mostrar_resultados(resultados):
         print("No se encontraron resultados.")
         return
 
-    disponibles = [r for r in resultados if r['Disponible'] == "Sí"]
-    no_disponibles = [r for r in resultados if r['Disponible'] != "Sí"]
+    disponibles = [r for r in resultados if r.disponible]
+    no_disponibles = [r for r in resultados if not r.disponible and not r.pendiente and not r.caida]
+    pendientes = [r for r in resultados if r.pendiente]
+    caidas = [r for r in resultados if r.caida]
 
     # Mostrar disponibles
     if disponibles:
         print("\n✅ Disponibles:")
 
-        precios = []
-        for r in disponibles:
-            precio_num = int(''.join(filter(str.isdigit, r['Precio']))) if r['Precio'] != "-" else float('inf')
-            precios.append(precio_num)
-        precio_min = min(precios)
+        mejor = obtener_mejor_precio(disponibles)
+        precio_min = mejor.precio if mejor else None
 
         for r in disponibles:
-            precio_num = int(''.join(filter(str.isdigit, r['Precio']))) if r['Precio'] != "-" else float('inf')
-            tienda_info = tienda_visual.get(r['Tienda'], {"color": Colores.GRIS, "emoji": "🛒"})
-            color = Colores.VERDE if precio_num == precio_min else tienda_info["color"]
-            simbolo = "💰" if precio_num == precio_min else tienda_info["emoji"]
-            print(f"{color}{simbolo} {r['Tienda']} | {r['Producto']} | {r['Precio']} | {r['URL']}{Colores.RESET}")
+            tienda_info = tienda_visual.get(r.tienda, {"color": Colores.GRIS, "emoji": "🛒"})
+            es_mejor = r.precio is not None and r.precio == precio_min
+            color = Colores.VERDE if es_mejor else tienda_info["color"]
+            simbolo = "💰" if es_mejor else tienda_info["emoji"]
+            print(f"{color}{simbolo} {r.tienda} | {r.producto} | {r.precio_texto} | {r.url}{Colores.RESET}")
 
     # Mostrar no disponibles
     if no_disponibles:
         print("\n❌ No disponibles:")
         for r in no_disponibles:
-            tienda_info = tienda_visual.get(r['Tienda'], {"color": Colores.GRIS, "emoji": "🛒"})
-            print(f"{tienda_info['color']}{tienda_info['emoji']} {r['Tienda']} | {r['Producto']} | {r['Precio']} | {r['URL']}{Colores.RESET}")
+            tienda_info = tienda_visual.get(r.tienda, {"color": Colores.GRIS, "emoji": "🛒"})
+            print(f"{tienda_info['color']}{tienda_info['emoji']} {r.tienda} | {r.producto} | {r.precio_texto} | {r.url}{Colores.RESET}")
+
+    # Tiendas que no respondieron dentro del plazo
+    if pendientes:
+        print("\n⏳ Pendientes (siguen buscando en segundo plano):")
+        print(f"{Colores.GRIS}{', '.join(r.tienda for r in pendientes)}{Colores.RESET}")
+
+    # Tiendas que están fallando (circuit breaker abierto o sin respuesta)
+    if caidas:
+        print("\n⛔ Tiendas no disponibles:")
+        print(f"{Colores.ROJO}{', '.join(r.tienda for r in caidas)}{Colores.RESET}")
+
+# --- Canasta más barata considerando envío (modo varias cartas) ---
+def mostrar_canasta(precios, cantidades=None, max_tiendas=None, mas_baratas=None):
+    """`precios`: {carta: {tienda: precio}}; `mas_baratas` de la matriz si ya está armada."""
+    ingenua = canasta.mas_barata_por_carta(precios, cantidades, asignacion=mas_baratas)
+    plan = canasta.optimizar(precios, cantidades, max_tiendas=max_tiendas)
+    grupos = plan.por_tienda()
+
+    print(f"\n🧺 Canasta más barata ({len(plan.tiendas)} tiendas, envío incluido):")
+    for tienda in plan.tiendas:
+        envio = formatear_moneda(plan.envios[tienda]) if plan.envios[tienda] else "gratis"
+        print(f"{Colores.AZUL}{tienda} | {len(grupos[tienda])} cartas | "
+              f"{formatear_moneda(plan.subtotales[tienda])} + envío {envio}{Colores.RESET}")
+        nombres = [f"{cantidades[c]}x {c}" if cantidades and cantidades.get(c, 1) > 1 else c for c in grupos[tienda]]
+        print(f"{Colores.GRIS}   {', '.join(nombres)}{Colores.RESET}")
+    if plan.faltantes:
+        print(f"{Colores.ROJO}Sin stock en las tiendas elegidas: {', '.join(plan.faltantes)}{Colores.RESET}")
+    ahorro = ingenua.total - plan.total if len(plan.faltantes) == len(ingenua.faltantes) else 0
+    print(f"{Colores.VERDE}💰 Total {formatear_moneda(plan.total)} "
+          f"(carta por carta: {formatear_moneda(ingenua.total)} en {len(ingenua.tiendas)} tiendas"
+          f"{f', ahorro {formatear_moneda(ahorro)}' if ahorro > 0 else ''}){Colores.RESET}")
+
+# --- Matriz de precios carta × tienda (modo varias cartas, necesita numpy) ---
+def guardar_matriz(precios, base_archivo, parquet=False):
+    ruta_csv = f"{base_archivo}.csv"
+    precios.exportar_csv(ruta_csv)
+    print(f"\n📊 Matriz de precios guardada en: {ruta_csv}")
+    if parquet:
+        try:
+            precios.exportar_parquet(f"{base_archivo}.parquet")
+            print(f"📊 Matriz de precios guardada en: {base_archivo}.parquet")
+        except ImportError:
+            print(f"{Colores.ROJO}Para exportar a Parquet instale pyarrow (pip install pyarrow).{Colores.RESET}")
+
+    cobertura = sorted(precios.cobertura().items(), key=lambda x: -x[1])
+    print(f"{Colores.GRIS}Cartas con stock por tienda: "
+          f"{', '.join(f'{t} {n}/{len(precios.cartas)}' for t, n in cobertura)}{Colores.RESET}")
+    unicas = [f"{r['carta']} ({r['tienda']})" for r in precios.resumen() if r["tiendas_con_stock"] == 1]
+    if unicas:
+        print(f"{Colores.GRIS}Sólo en una tienda: {', '.join(unicas)}{Colores.RESET}")
+
+# --- Resumen de salud de las tiendas al final de un lote ---
+def mostrar_salud():
+    filas = [f for f in salud.resumen() if f["fallos"] or f["saltadas"] or f["estado"] != salud.CERRADO]
+    if not filas:
+        return
+    print("\n🩺 Salud de las tiendas:")
+    for f in filas:
+        color = Colores.VERDE if f["estado"] == salud.CERRADO else Colores.ROJO
+        print(f"{color}{f['tienda']} | {f['estado']} | consultas {f['consultas']} | fallos {f['fallos']} | "
+              f"saltadas {f['saltadas']} | {f['latencia']:.2f}s promedio{Colores.RESET}")
+
+# --- Filas de la Ficha (mejor precio por carta) de un batch ---
+def escribir_ficha(writer, resultados_por_carta, copias):
+    """
+    Escribe la mejor oferta de cada carta del batch. Con numpy sale de la
+    matriz del batch (que se devuelve para la matriz y la canasta del final);
+    sin numpy, carta por carta. Devuelve (filas escritas, matriz o None).
+    """
+    if matriz.NUMPY:
+        precios = matriz.MatrizPrecios.desde_resultados(resultados_por_carta, [t["nombre"] for t in tiendas])
+        mejores = precios.mejores_resultados(resultados_por_carta)
+    else:
+        precios = None
+        mejores = [obtener_mejor_precio(resultados) for resultados in resultados_por_carta.values()]
+
+    filas = 0
+    for carta, mejor in zip(resultados_por_carta, mejores):
+        if mejor:
+            writer.writerow({
+                "Nombre de la carta": carta,
+                "Tienda": mejor.tienda,
+                "Precio": mejor.precio_texto,
+                "URL": mejor.url,
+                "Cantidad": copias.get(carta, 1),
+            })
+            filas += 1
+    return filas, precios
 
 # --- Función para obtener mejor opción por precio ---
 def obtener_mejor_precio(resultados):
-    disponibles = [r for r in resultados if r['Disponible'] == "Sí" and r['Precio'] != "-"]
+    disponibles = [r for r in resultados if r.disponible and r.precio is not None]
     if not disponibles:
         return None
-    return min(disponibles, key=lambda r: int(''.join(filter(str.isdigit, r['Precio']))))
-
-# --- Buscar en todas las tiendas en paralelo ---
-def buscar_en_tiendas(carta):
-    resultados = []
-    with ThreadPoolExecutor(max_workers=len(tiendas)) as executor:
-        futures = {executor.submit(tienda["func"], carta): tienda for tienda in tiendas}
-        for future in as_completed(futures):
-            try:
-                resultado = future.result()
-                resultados.append(resultado)
-            except Exception as e:
-                print(f"{Colores.ROJO}Error al buscar en {futures[future]['Tienda']}: {e}{Colores.RESET}")
-    return resultados
+    return min(disponibles, key=lambda r: r.precio)
 
-# --- Preguntar si desea buscar 1 carta o varias ---
-while True:
-    opcion = input("¿Desea buscar 1 carta o varias? (1/+): ").strip()
-    if opcion in ("1", "+"):
-        break
+# --- Vista en vivo: cada tienda aparece apenas responde ---
+class VistaEnVivo:
+    """
+    Imprime una fila por tienda en el orden en que llegan y vuelve a pintar en
+    verde la opción más barata cada vez que cambia. En una terminal la fila
+    anterior se re-pinta en su lugar (ANSI); si la salida no es una terminal
+    sólo se agregan filas y el resumen final indica la más barata.
+    """
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.filas = []                          # (resultado, línea donde empieza) por fila impresa
+        self.lineas = 0
+        self.mejor = None
+        self.fila_mejor = None
+        self.t_primero = None
+        self.t_mejor = None
+        self.en_terminal = sys.stdout.isatty()
+
+    def texto(self, r, mejor=False):
+        tienda_info = tienda_visual.get(r.tienda, {"color": Colores.GRIS, "emoji": "🛒"})
+        if r.pendiente:
+            return f"{Colores.GRIS}⏳ {r.tienda} | pendiente{Colores.RESET}"
+        if r.caida:
+            return f"{Colores.ROJO}⛔ {r.tienda} | tienda no disponible{Colores.RESET}"
+        if not r.disponible:
+            return f"{tienda_info['color']}❌ {r.tienda} | {r.producto} | {r.precio_texto} | {r.url}{Colores.RESET}"
+        if mejor:
+            return f"{Colores.VERDE}💰 {r.tienda} | {r.producto} | {r.precio_texto} | {r.url}{Colores.RESET}"
+        return f"{tienda_info['color']}{tienda_info['emoji']} {r.tienda} | {r.producto} | {r.precio_texto} | {r.url}{Colores.RESET}"
+
+    def agregar(self, segundos, r):
+        if self.t_primero is None:
+            self.t_primero = segundos
+        anterior = self.fila_mejor
+        es_mejor = r.disponible and r.precio is not None and (self.mejor is None or r.precio < self.mejor.precio)
+        if es_mejor:
+            self.mejor = r
+            self.fila_mejor = len(self.filas)
+            self.t_mejor = segundos
+
+        linea = self.texto(r, es_mejor)
+        self.filas.append((r, self.lineas))
+        print(linea)
+        self.lineas += self.alto(linea)
+        if es_mejor and anterior is not None:
+            self.repintar(anterior)
+
+    @staticmethod
+    def ancho(texto):
+        """Columnas que ocupa `texto`: los emojis y caracteres anchos ocupan 2, los combinantes 0."""
+        columnas = 0
+        for c in texto:
+            if unicodedata.combining(c) or c == "\ufe0f":
+                continue
+            columnas += 2 if unicodedata.east_asian_width(c) in ("W", "F") else 1
+        return columnas
+
+    def alto(self, linea):
+        """Líneas de terminal que ocupa `linea` (sin códigos de color)."""
+        visible = self.ancho(re.sub(r"\033\[[0-9;]*m", "", linea)) + 1
+        return max(1, -(-visible // shutil.get_terminal_size().columns))
+
+    def repintar(self, fila):
+        r, inicio = self.filas[fila]
+        arriba = self.lineas - inicio
+        if not self.en_terminal or arriba >= shutil.get_terminal_size().lines:
+            return
+        sys.stdout.write(f"\0337\033[{arriba}A\r\033[2K{self.texto(r)}\0338")
+        sys.stdout.flush()
+
+    def cerrar(self):
+        total = time.perf_counter() - self.inicio
+        if self.mejor:
+            print(f"\n{Colores.VERDE}💰 Más barato: {self.mejor.tienda} | {self.mejor.precio_texto} | {self.mejor.url}{Colores.RESET}")
+        else:
+            print("\nNo se encontraron resultados disponibles.")
+        tiempos = [f"primer resultado {self.t_primero:.2f}s" if self.t_primero is not None else "sin resultados"]
+        if self.t_mejor is not None:
+            tiempos.append(f"más barato {self.t_mejor:.2f}s")
+        tiempos.append(f"total {total:.2f}s")
+        print(f"{Colores.GRIS}⏱️  {' | '.join(tiempos)}{Colores.RESET}")
+
+# --- API sin preguntas: para cron, pipelines u otros scripts ---
+CAMPOS_LOTE = ["carta", "tienda", "estado", "disponible", "producto", "precio", "url", "foil"]
+
+def leer_cartas(lineas):
+    """Cartas a buscar desde líneas de texto (acepta listas exportadas), cada una una vez."""
+    return mazo.consultas(mazo.leer_lineas(lineas))
+
+def buscar_lote(cartas, plazo=None, lista_tiendas=None):
+    """
+    Generador de `(carta, Resultado)` por cada par (carta, tienda) apenas
+    responde, sin preguntar nada (no usa input()).
+    """
+    yield from buscar_a_medida(cartas, lista_tiendas, plazo)
+
+def escribir_lote(pares, salida=None, formato="ndjson"):
+    """Escribe cada par apenas llega (una línea por carta y tienda); devuelve cuántos escribió."""
+    salida = salida or sys.stdout
+    writer = None
+    if formato == "csv":
+        writer = csv.DictWriter(salida, fieldnames=CAMPOS_LOTE)
+        writer.writeheader()
+    n = 0
+    for carta, resultado in pares:
+        fila = {"carta": carta, **resultado.como_json()}
+        if writer:
+            writer.writerow(fila)
+        else:
+            salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        salida.flush()
+        n += 1
+    return n
+
+def modo_lote(args):
+    if args.stdin:
+        cartas = leer_cartas(sys.stdin)
     else:
-        print("Por favor ingrese '1' para una carta o '+' para varias cartas.")
+        with open(args.file, "r", encoding="utf-8") as f:
+            cartas = leer_cartas(f)
+    salida = sys.stdout
+    if args.resume or args.fresh:
+        # Bitácora sólo si se pide, y una por lista: una búsqueda cortada no bloquea cron ni pipelines
+        bitacora.abrir(bitacora.ruta_lote(cartas), reanudar=args.resume, descartar=args.fresh)
+    completa = False
+    try:
+        # Los avisos de tiendas y motor van a stderr: stdout queda sólo con datos
+        with redirect_stdout(sys.stderr):
+            escribir_lote(buscar_lote(cartas, args.plazo), salida, args.format)
+        completa = True
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (ej. `| head`): se termina sin traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), salida.fileno())
+    finally:
+        bitacora.cerrar(borrar=completa)
+
+# --- Bitácora: una búsqueda cortada no se descarta sin preguntar ---
+def abrir_bitacora(args):
+    """Abre la bitácora; si hay una búsqueda cortada sin --resume ni --fresh, pregunta qué hacer."""
+    try:
+        return bitacora.abrir(reanudar=args.resume, descartar=args.fresh)
+    except bitacora.BitacoraPendiente:
+        pass
+    print(f"Hay una búsqueda cortada en {bitacora.RUTA_BITACORA}.")
+    while True:
+        opcion = input("¿Reanudarla [R], descartarla y empezar de cero [D] o salir [S]? ").strip().upper()
+        if opcion in ("R", "D", "S"):
+            break
+        print("Ingrese 'R', 'D' o 'S'.")
+    if opcion == "S":
+        sys.exit(0)
+    return bitacora.abrir(reanudar=opcion == "R", descartar=opcion == "D")
+
+# --- Ficha desde la bitácora de una búsqueda cortada (sin buscar) ---
+def reconstruir():
+    if not bitacora.hay_pendiente():
+        sys.exit(f"No hay bitácora en {bitacora.RUTA_BITACORA}.")
+    copias = mazo.cantidades(mazo.leer_archivo("buscar.txt")) if os.path.exists("buscar.txt") else {}
+    now = datetime.now()
+    archivo = f"Ficheros/Ficha_Cartas_en_curso____{now.strftime('%Y-%m-%d')}___{now.strftime('%H-%M')}.csv"
+    filas_csv = bitacora.reconstruir_ficha(archivo, cantidades=copias)
+    nombre_archivo = archivo.replace("Ficha_Cartas_en_curso", f"Ficha_Cartas_{filas_csv}")
+    os.replace(archivo, nombre_archivo)
+    print(f"✅ Datos guardados en: {nombre_archivo}")
 
 # --- Buscar 1 carta ---
-if opcion == "1":
+def buscar_una_carta(args):
     carta = input("Ingrese el nombre de la carta: ").strip()
-    print(f"\nBuscando {carta} en {len(tiendas)} tiendas en paralelo...")
-    resultados = buscar_en_tiendas(carta)
-    mostrar_resultados(resultados)
+    print(f"\nBuscando {carta} en {len(tiendas)} tiendas en paralelo...\n")
+    vista = VistaEnVivo()
+    for segundos, resultado in buscar_en_vivo(carta, plazo=args.plazo):
+        vista.agregar(segundos, resultado)
+    vista.cerrar()
 
 # --- Buscar varias cartas ---
-else:
+def buscar_varias_cartas(args):
     try:
-        with open("buscar.txt", "r", encoding="utf-8") as f:
-            cartas = [line.strip() for line in f if line.strip()]
+        # Acepta listas exportadas ("1 Sol Ring (CMM) 410 *F*"); cada carta distinta se busca una vez
+        entradas = mazo.leer_archivo("buscar.txt")
+        cartas = mazo.consultas(entradas)
+        copias = mazo.cantidades(entradas)
+        if sum(copias.values()) != len(cartas):
+            print(f"{len(cartas)} cartas distintas ({sum(copias.values())} copias en total).")
 
         while True:
             pausa = input("¿Cada cuántas cartas desea pausar? (Ingrese un número >0 o '-' para todas): ").strip()
@@ -110,52 +400,98 @@ else:
                 break
             else:
                 print("Entrada inválida. Ingrese un número mayor que 0 o '-'.")
-        
+
         os.makedirs("Ficheros", exist_ok=True)
-        datos_csv = []
+        now = datetime.now()
+        archivo_parcial = f"Ficheros/Ficha_Cartas_en_curso____{now.strftime('%Y-%m-%d')}___{now.strftime('%H-%M')}.csv"
+        filas_csv = 0
+        resultados_por_carta = {}
+        lote = {}                                # cartas del batch en curso
+        partes = []                              # matriz de cada batch (con numpy)
+        completa = True
+
+        # --- Bitácora: cada resultado queda en disco; con --resume no se repite lo ya buscado ---
+        previos = abrir_bitacora(args)
+        if previos:
+            print(f"Reanudando: {previos} resultados ya buscados en {bitacora.RUTA_BITACORA}.")
 
-        for i in range(0, len(cartas), batch_size):
-            batch = cartas[i:i+batch_size]
-            for carta in batch:
-                print(f"\nBuscando: {carta}")
-                resultados = buscar_en_tiendas(carta)
+        # --- Todas las cartas se envían de una vez; se muestran y guardan en orden ---
+        print(f"\nBuscando {len(cartas)} cartas en {len(tiendas)} tiendas en paralelo...")
+        with open(archivo_parcial, "w", newline="", encoding="utf-8") as f_csv:
+            writer = csv.DictWriter(f_csv, fieldnames=["Nombre de la carta", "Tienda", "Precio", "URL", "Cantidad"])
+            writer.writeheader()
+
+            for i, (carta, resultados) in enumerate(buscar_en_orden(cartas, plazo=args.plazo), start=1):
+                print(f"\nResultados para: {carta}")
                 mostrar_resultados(resultados)
+                resultados_por_carta[carta] = resultados
+                lote[carta] = resultados
 
-                mejor = obtener_mejor_precio(resultados)
-                if mejor:
-                    datos_csv.append({
-                        "Nombre de la carta": carta,
-                        "Tienda": mejor["Tienda"],
-                        "Precio": mejor["Precio"],
-                        "URL": mejor["URL"]
-                    })
-
-            if batch_size != len(cartas) and i + batch_size < len(cartas):
-                while True:
-                    continuar = input("\nDesea continuar con el siguiente batch de cartas? [S/N]: ").strip().upper()
-                    if continuar == "S":
-                        break
-                    elif continuar == "N":
-                        if datos_csv:
-                            now = datetime.now()
-                            nombre_archivo = f"Ficheros/Ficha_Cartas_{len(datos_csv)}____{now.strftime('%Y-%m-%d')}___{now.strftime('%H-%M')}.csv"
-                            with open(nombre_archivo, "w", newline="", encoding="utf-8") as f:
-                                writer = csv.DictWriter(f, fieldnames=["Nombre de la carta", "Tienda", "Precio", "URL"])
-                                writer.writeheader()
-                                writer.writerows(datos_csv)
-                            print(f"\n✅ Datos guardados en: {nombre_archivo}")
-                        exit()
-                    else:
+                # Al cerrar cada batch: una matriz para sus filas de la Ficha
+                if i % batch_size == 0 or i == len(cartas):
+                    filas, parte = escribir_ficha(writer, lote, copias)
+                    f_csv.flush()
+                    filas_csv += filas
+                    if parte is not None:
+                        partes.append(parte)
+                    lote = {}
+
+                if batch_size != len(cartas) and i % batch_size == 0 and i < len(cartas):
+                    while True:
+                        continuar = input("\nDesea continuar con el siguiente batch de cartas? [S/N]: ").strip().upper()
+                        if continuar in ("S", "N"):
+                            break
                         print("Ingrese 'S' para continuar o 'N' para detener y guardar.")
+                    if continuar == "N":
+                        completa = False
+                        break
 
-        if datos_csv:
-            now = datetime.now()
-            nombre_archivo = f"Ficheros/Ficha_Cartas_{len(datos_csv)}____{now.strftime('%Y-%m-%d')}___{now.strftime('%H-%M')}.csv"
-            with open(nombre_archivo, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=["Nombre de la carta", "Tienda", "Precio", "URL"])
-                writer.writeheader()
-                writer.writerows(datos_csv)
+        bitacora.cerrar(borrar=completa)
+        if not completa:
+            print(f"La bitácora queda en {bitacora.RUTA_BITACORA}; use --resume para seguir.")
+        if filas_csv:
+            nombre_archivo = archivo_parcial.replace("Ficha_Cartas_en_curso", f"Ficha_Cartas_{filas_csv}")
+            os.replace(archivo_parcial, nombre_archivo)
             print(f"\n✅ Datos guardados en: {nombre_archivo}")
+        else:
+            os.remove(archivo_parcial)
+        if len(resultados_por_carta) > 1:
+            if partes:
+                precios = matriz.MatrizPrecios.apilar(partes)
+                guardar_matriz(precios,
+                               f"Ficheros/Matriz_Precios_{now.strftime('%Y-%m-%d')}___{now.strftime('%H-%M')}",
+                               parquet=args.parquet)
+                mostrar_canasta(precios.ofertas(), copias, args.max_tiendas, precios.mas_baratas())
+            else:
+                mostrar_canasta(canasta.precios_de(resultados_por_carta), copias, args.max_tiendas)
+        mostrar_salud()
 
     except FileNotFoundError:
         print("No se encontró el archivo 'buscar.txt'. Asegúrese de que exista en el mismo directorio.")
+
+# --- Preguntar si desea buscar 1 carta o varias ---
+def modo_interactivo(args):
+    while True:
+        opcion = input("¿Desea buscar 1 carta o varias? (1/+): ").strip()
+        if opcion in ("1", "+"):
+            break
+        else:
+            print("Por favor ingrese '1' para una carta o '+' para varias cartas.")
+    if opcion == "1":
+        buscar_una_carta(args)
+    else:
+        buscar_varias_cartas(args)
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    configurar(args, parser)
+    if args.reconstruir:
+        reconstruir()
+    elif args.file or args.stdin:
+        modo_lote(args)
+    else:
+        modo_interactivo(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Cliente liviano de servidor_busqueda.py.
+
+No importa los adaptadores ni requests: sólo la librería estándar, así una
+consulta desde la terminal o desde otro script responde en milisegundos si
+el servidor ya tiene la carta en caché.
+
+Uso:
+    python cliente_busqueda.py "Sol Ring"               # resultados de una carta
+    python cliente_busqueda.py -a buscar.txt            # varias cartas, una por línea
+    python cliente_busqueda.py "Sol Ring" --ndjson      # una línea JSON por tienda apenas responde
+    python cliente_busqueda.py -a buscar.txt --json     # JSON crudo
+"""
+
+import argparse
+import json
+import sys
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+SERVIDOR = "http://127.0.0.1:8766"               # PUERTO de servidor_busqueda.py
+
+VERDE = '\033[92m'
+GRIS = '\033[90m'
+ROJO = '\033[91m'
+RESET = '\033[0m'
+
+def formatear_moneda(valor):
+    return f"${valor:,}".replace(",", ".") if valor is not None else "-"
+
+# ----------------------------
+# Consultas
+# ----------------------------
+def pedir(servidor, cartas, plazo=None, ndjson=False):
+    """Abre la consulta al servidor: GET para una carta, POST para varias."""
+    params = {"formato": "ndjson"} if ndjson else {}
+    if len(cartas) == 1:
+        params["q"] = cartas[0]
+        if plazo is not None:
+            params["plazo"] = plazo
+        return urlopen(f"{servidor}/buscar?{urlencode(params)}")
+    cuerpo = json.dumps({"cartas": cartas, "plazo": plazo}).encode("utf-8")
+    consulta = f"{servidor}/buscar?{urlencode(params)}" if params else f"{servidor}/buscar"
+    return urlopen(Request(consulta, data=cuerpo, headers={"Content-Type": "application/json"}))
+
+def mostrar_ficha(ficha):
+    print(f"\nResultados para: {ficha['carta']}")
+    mejor = ficha.get("mejor")
+    for r in ficha["resultados"]:
+        if r["estado"] == "disponible":
+            color = VERDE if mejor and r["tienda"] == mejor["tienda"] and r["precio"] == mejor["precio"] else ""
+            print(f"{color}{r['tienda']} | {r['producto']} | {formatear_moneda(r['precio'])} | {r['url']}{RESET}")
+    otras = [r["tienda"] for r in ficha["resultados"] if r["estado"] != "disponible"]
+    if otras:
+        print(f"{GRIS}Sin stock o sin respuesta: {', '.join(otras)}{RESET}")
+    if mejor:
+        print(f"{VERDE}💰 Más barato: {mejor['tienda']} | {formatear_moneda(mejor['precio'])} | {mejor['url']}{RESET}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta el servidor local de búsqueda de cartas.")
+    parser.add_argument("cartas", nargs="*", help="nombres de carta")
+    parser.add_argument("-a", "--archivo", help="archivo con una carta por línea ('-' = entrada estándar)")
+    parser.add_argument("--plazo", type=float, default=None, metavar="SEGUNDOS")
+    parser.add_argument("--servidor", default=SERVIDOR)
+    salida = parser.add_mutually_exclusive_group()
+    salida.add_argument("--json", action="store_true", help="imprimir el JSON del servidor")
+    salida.add_argument("--ndjson", action="store_true", help="imprimir NDJSON a medida que llega")
+    args = parser.parse_args()
+
+    cartas = list(args.cartas)
+    if args.archivo:
+        archivo = sys.stdin if args.archivo == "-" else open(args.archivo, encoding="utf-8")
+        with archivo:
+            cartas += [linea.strip() for linea in archivo if linea.strip()]
+    if not cartas:
+        parser.error("indique al menos una carta")
+
+    try:
+        with pedir(args.servidor, cartas, args.plazo, ndjson=args.ndjson) as respuesta:
+            if args.ndjson:
+                for linea in respuesta:
+                    sys.stdout.write(linea.decode("utf-8"))
+                    sys.stdout.flush()
+                return 0
+            datos = json.load(respuesta)
+    except URLError as e:
+        print(f"{ROJO}No se pudo conectar con {args.servidor} ({e.reason}). "
+              f"¿Está corriendo python servidor_busqueda.py?{RESET}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(datos, ensure_ascii=False, indent=2))
+        return 0
+    for ficha in datos if isinstance(datos, list) else [datos]:
+        mostrar_ficha(ficha)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Servidor de búsqueda que queda corriendo con todo precalentado.
+
+Cada ejecución de buscador_cartas.py paga el arranque de Python, importar los
+15 adaptadores y BeautifulSoup, y abrir conexiones nuevas. Este proceso los
+carga una sola vez y mantiene vivos los pools keep-alive, el caché SQLite y
+los catálogos ya leídos; cliente_busqueda.py le pregunta por HTTP local.
+
+API (JSON, sólo en 127.0.0.1 por defecto):
+    GET  /buscar?q=<carta>[&plazo=3][&formato=ndjson]
+         JSON con todos los resultados, o NDJSON con una línea por tienda
+         apenas responde.
+    POST /buscar[?formato=ndjson]
+         Cuerpo: {"cartas": [...], "plazo": 3}, una lista JSON o una carta por
+         línea (también líneas de mazo; las repetidas se buscan una vez). JSON
+         con una entrada por carta, o NDJSON con una línea por carta a medida
+         que terminan (en el orden enviado).
+    GET  /salud
+         Resumen del circuit breaker por tienda.
+
+Uso:
+    python servidor_busqueda.py [--puerto 8766] [--tiendas shopify] [--exclude TCGMatch] [--no-cache] ...
+"""
+
+import argparse
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from tiendas import tiendas, cache, catalogo, mazo, registro, salud
+from tiendas.motor import buscar_en_tiendas, buscar_en_vivo, buscar_en_orden, obtener_loop
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+HOST = "127.0.0.1"
+PUERTO = 8766                                    # el mismo que usa cliente_busqueda.py
+MAX_CUERPO = 1024 * 1024                         # bytes aceptados en POST /buscar
+
+# ----------------------------
+# Respuestas
+# ----------------------------
+def mejor_resultado(resultados):
+    disponibles = [r for r in resultados if r.disponible and r.precio is not None]
+    return min(disponibles, key=lambda r: r.precio) if disponibles else None
+
+def ficha(carta, resultados, segundos=None):
+    mejor = mejor_resultado(resultados)
+    datos = {
+        "carta": carta,
+        "mejor": mejor.como_json() if mejor else None,
+        "resultados": [r.como_json() for r in resultados],
+    }
+    if segundos is not None:
+        datos["segundos"] = round(segundos, 3)
+    return datos
+
+def leer_cartas(cuerpo, tipo):
+    """
+    Cartas del cuerpo de POST /buscar: JSON ({"cartas": [...]} o lista) o texto,
+    una por línea. Se aceptan líneas de mazo ("2x Sol Ring (CMM) 410") y cada
+    carta distinta se busca una vez.
+    """
+    texto = cuerpo.decode("utf-8")
+    plazo = None
+    if "json" in tipo or texto.lstrip()[:1] in ("{", "["):
+        datos = json.loads(texto)
+        if isinstance(datos, dict):
+            datos, plazo = datos.get("cartas", []), datos.get("plazo")
+        lineas = [str(c) for c in datos]
+    else:
+        lineas = texto.splitlines()
+    return mazo.consultas(mazo.leer_lineas(lineas)), plazo
+
+class ManejadorBusqueda(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                # keep-alive para clientes que repiten consultas
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        if partes.path == "/salud":
+            return self.responder_json(200, salud.resumen())
+        if partes.path != "/buscar":
+            return self.responder_json(404, {"error": "ruta desconocida"})
+        carta = params.get("q", "").strip()
+        if not carta:
+            return self.responder_json(400, {"error": "falta el parámetro q"})
+        try:
+            plazo = float(params["plazo"]) if "plazo" in params else self.server.plazo
+        except ValueError:
+            return self.responder_json(400, {"error": "plazo inválido"})
+
+        if self.quiere_ndjson(params):
+            self.iniciar_ndjson()
+            for segundos, r in buscar_en_vivo(carta, plazo=plazo):
+                self.escribir_linea({"carta": carta, "segundos": round(segundos, 3), **r.como_json()})
+            return
+        inicio = time.perf_counter()
+        resultados = buscar_en_tiendas(carta, plazo=plazo)
+        self.responder_json(200, ficha(carta, resultados, time.perf_counter() - inicio))
+
+    def do_POST(self):
+        partes = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        if partes.path != "/buscar":
+            return self.responder_json(404, {"error": "ruta desconocida"})
+        largo = int(self.headers.get("Content-Length") or 0)
+        if largo > MAX_CUERPO:
+            return self.responder_json(413, {"error": "cuerpo demasiado grande"})
+        try:
+            cartas, plazo = leer_cartas(self.rfile.read(largo), self.headers.get("Content-Type", ""))
+        except (ValueError, UnicodeDecodeError):
+            return self.responder_json(400, {"error": "cuerpo inválido"})
+        try:
+            plazo = float(plazo) if plazo is not None else self.server.plazo
+        except (TypeError, ValueError):
+            return self.responder_json(400, {"error": "plazo inválido"})
+
+        if self.quiere_ndjson(params):
+            self.iniciar_ndjson()
+            for carta, resultados in buscar_en_orden(cartas, plazo=plazo):
+                self.escribir_linea(ficha(carta, resultados))
+            return
+        self.responder_json(200, [ficha(carta, resultados) for carta, resultados in buscar_en_orden(cartas, plazo=plazo)])
+
+    def quiere_ndjson(self, params):
+        return params.get("formato") == "ndjson" or "application/x-ndjson" in self.headers.get("Accept", "")
+
+    def responder_json(self, estado, datos):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def iniciar_ndjson(self):
+        # Sin Content-Length: cada línea sale apenas está lista y el fin lo marca el cierre
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def escribir_linea(self, datos):
+        self.wfile.write(json.dumps(datos, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+def iniciar_servidor(host=HOST, puerto=PUERTO, plazo=None):
+    """Crea el servidor (sin arrancarlo); `puerto=0` elige uno libre."""
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorBusqueda)
+    servidor.daemon_threads = True
+    servidor.plazo = plazo
+    for tienda in tiendas:
+        tienda.metadata                          # importa ahora los adaptadores elegidos, no en la primera consulta
+    obtener_loop()                               # el motor queda listo antes de la primera consulta
+    return servidor
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local de búsqueda de cartas (JSON).")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--plazo", type=float, default=None, metavar="SEGUNDOS",
+                        help="plazo por defecto de cada búsqueda (las tiendas lentas quedan pendientes)")
+    parser.add_argument("--no-cache", action="store_true", help="no leer ni guardar el caché de búsquedas")
+    parser.add_argument("--refresh", action="store_true", help="ignorar el caché al leer y volver a descargar todo")
+    parser.add_argument("--no-catalog", action="store_true", help="no responder desde los catálogos crawleados en Ficheros/")
+    parser.add_argument("--tiendas", default=os.environ.get("BUSCADOR_TIENDAS"), metavar="LISTA",
+                        help="sólo estas tiendas, plataformas o capacidades, separadas por coma (ej. shopify,TCGMatch)")
+    parser.add_argument("--exclude", default=os.environ.get("BUSCADOR_EXCLUIR"), metavar="LISTA",
+                        help="tiendas, plataformas o capacidades a omitir, separadas por coma")
+    args = parser.parse_args()
+    cache.configurar(usar=not args.no_cache, refrescar=args.refresh)
+    catalogo.configurar(usar=not args.no_catalog)
+    try:
+        registro.configurar(args.tiendas, args.exclude)
+    except ValueError as e:
+        parser.error(str(e))
+
+    servidor = iniciar_servidor(args.host, args.puerto, args.plazo)
+    print(f"Buscando en {len(tiendas)} tiendas desde http://{args.host}:{servidor.server_address[1]} (Ctrl+C para salir)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.server_close()
@@ -1,13 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("li.grid__item")
 
 # --- Función de búsqueda para AFKStore ---
 def buscar(nombre_producto):
@@ -16,16 +15,15 @@ def buscar(nombre_producto):
         "url": "https://www.afkstore.cl/search?q={}&options%5Bprefix%5D=last"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
         productos = soup.select("li.grid__item")
 
         encontrado = False
-        palabras_busqueda = re.findall(r'\w+', nombre_producto.lower())
+        buscada = consulta(nombre_producto)
 
         for producto in productos:
             titulo_tag = producto.select_one("h3.card__heading a.full-unstyled-link")
@@ -33,10 +31,8 @@ def buscar(nombre_producto):
                 continue
 
             nombre = titulo_tag.get_text(strip=True)
-            palabras_titulo = re.findall(r'\w+', nombre.lower())
-
             # Verifica que todas las palabras del nombre buscado estén en el título
-            if all(palabra in palabras_titulo for palabra in palabras_busqueda):
+            if buscada.coincide(nombre):
                 # Extraer precio
                 precio_tag = producto.select_one(".price-item--sale, .price-item--regular")
                 if precio_tag:
@@ -46,47 +42,33 @@ def buscar(nombre_producto):
 
                 # Detectar si está agotado
                 agotado_tag = producto.select_one(".badge")
-                disponible = "No" if (agotado_tag and "Agotado" in agotado_tag.get_text()) else "Sí"
+                disponible = not (agotado_tag and "Agotado" in agotado_tag.get_text())
 
                 # Construir URL completa
                 url_producto = "https://www.afkstore.cl" + titulo_tag['href']
 
-                resultado = {
-                    "Tienda": tienda['nombre'],
-                    "Disponible": disponible,
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                resultado = Resultado(tienda['nombre'], disponible, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": tienda['nombre'],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda['nombre'],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "AFKStore",
-    "func": buscar
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("AFKStore", "https://www.afkstore.cl", respaldo=buscar),
+    "func_lote": shopify.crear_buscador_lote("AFKStore", "https://www.afkstore.cl", respaldo=buscar),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
 
 # --- Ejemplo de uso ---
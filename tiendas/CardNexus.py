@@ -1,13 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from . import salud
+from . import woocommerce
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("ul.products")
 
 # --- Función de búsqueda para CardNexus ---
 def buscar(nombre_producto):
@@ -16,16 +15,15 @@ def buscar(nombre_producto):
         "url": "https://cardnexus.cl/?s={}"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
         productos = soup.select("ul.products li.product")
 
         encontrado = False
-        palabras_busqueda = re.findall(r'\w+', nombre_producto.lower())
+        buscada = consulta(nombre_producto)
 
         for producto in productos:
             titulo_tag = producto.select_one("h2.woocommerce-loop-product__title")
@@ -33,9 +31,7 @@ def buscar(nombre_producto):
                 continue
 
             nombre = titulo_tag.get_text(strip=True)
-            palabras_titulo = re.findall(r'\w+', nombre.lower())
-
-            if all(palabra in palabras_titulo for palabra in palabras_busqueda):
+            if buscada.coincide(nombre):
                 # Extraer precio
                 precio_tag = producto.select_one("span.woocommerce-Price-amount bdi")
                 if precio_tag:
@@ -50,42 +46,29 @@ def buscar(nombre_producto):
                 else:
                     url_producto = url_busqueda
 
-                resultado = {
-                    "Tienda": tienda['nombre'],
-                    "Disponible": "Sí",  # CardNexus no indica agotado en el listado
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                # CardNexus no indica agotado en el listado
+                resultado = Resultado(tienda['nombre'], True, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": tienda['nombre'],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda['nombre'],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "CardNexus",
-    "func": buscar
+    # Store API de WooCommerce (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": woocommerce.crear_buscador("CardNexus", "https://cardnexus.cl", respaldo=buscar),
+    "func_lote": woocommerce.crear_buscador_lote("CardNexus", "https://cardnexus.cl", respaldo=buscar),
+    "lote": woocommerce.TAMANO_LOTE,
+    "plataforma": "woocommerce",
 }
 
 # --- Ejemplo de uso ---
@@ -1,13 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from . import salud
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("div.product-block")
 
 # --- Función de búsqueda para PDAChile ---
 def buscar(nombre_producto):
@@ -16,16 +14,15 @@ def buscar(nombre_producto):
         "url": "https://www.pdachile.cl/search?q={}"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
         productos = soup.select("div.product-block")
 
         encontrado = False
-        palabras_busqueda = re.findall(r'\w+', nombre_producto.lower())
+        buscada = consulta(nombre_producto)
 
         for producto in productos:
             titulo_tag = producto.select_one("div.post-prev-title a")
@@ -33,10 +30,8 @@ def buscar(nombre_producto):
                 continue
 
             nombre = titulo_tag.get_text(strip=True)
-            palabras_titulo = re.findall(r'\w+', nombre.lower())
-
             # Verifica que todas las palabras del nombre buscado estén en el título
-            if all(palabra in palabras_titulo for palabra in palabras_busqueda):
+            if buscada.coincide(nombre):
                 # Extraer precio
                 precio_tag = producto.select_one("div.post-prev-text strong")
                 if precio_tag:
@@ -47,35 +42,18 @@ def buscar(nombre_producto):
                 # Construir URL completa
                 url_producto = "https://www.pdachile.cl" + titulo_tag['href']
 
-                resultado = {
-                    "Tienda": tienda['nombre'],
-                    "Disponible": "Sí",  # PDAChile no marca agotado en la estructura que me diste
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                # PDAChile no marca agotado en la estructura que me diste
+                resultado = Resultado(tienda['nombre'], True, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": tienda['nombre'],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda['nombre'],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 
@@ -1,13 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from . import salud
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("section", **{"aria-labelledby": "products"})
 
 # --- Función de búsqueda para TCGMatch ---
 def buscar(nombre_producto):
@@ -16,18 +14,17 @@ def buscar(nombre_producto):
         "url": "https://tcgmatch.cl/cartas/busqueda/palabra={}"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
 
         # <-- Cambio aquí: seleccionar todos los links de productos -->
         productos = soup.select("section[aria-labelledby='products'] a")
 
         encontrado = False
-        palabras_busqueda = re.findall(r'\w+', nombre_producto.lower())
+        buscada = consulta(nombre_producto)
 
         for producto in productos:
             nombre_tag = producto.select_one("p.text-base.font-semibold")
@@ -35,9 +32,7 @@ def buscar(nombre_producto):
                 continue
 
             nombre = nombre_tag.get_text(strip=True)
-            palabras_titulo = re.findall(r'\w+', nombre.lower())
-
-            if all(palabra in palabras_titulo for palabra in palabras_busqueda):
+            if buscada.coincide(nombre):
                 # Extraer precio
                 precio_tag = producto.select_one("p.text-xl.font-semibold.text-green-600")
                 if precio_tag:
@@ -48,35 +43,17 @@ def buscar(nombre_producto):
                 # Extraer URL completa
                 url_producto = "https://tcgmatch.cl" + producto['href']
 
-                resultado = {
-                    "Tienda": tienda['nombre'],
-                    "Disponible": "Sí",
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                resultado = Resultado(tienda['nombre'], True, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": tienda['nombre'],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda['nombre'],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 # --- Metadata de la tienda ---
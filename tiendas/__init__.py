@@ -1,34 +1,10 @@
-from .bloodmoongames import metadata as bm_metadata
-from .oasisgames import metadata as og_metadata
-from .huntercardtcg import metadata as hc_metadata
-from .gameofmagicsingles import metadata as gm_metadata
-from .piedrabruja import metadata as pb_metadata
-from .tiendalacomarca import metadata as tlc_metadata
-from .paytowin import metadata as ptw_metadata
-from .rivendelelconcilio import metadata as rc_metadata
-from .magic4ever_scraper import metadata as m4e_metadata
-from .cartasmagicsur import metadata as cms_metadata 
-from .inekosingles import metadata as in_metadata 
-from .AFKStore import metadata as AFK_metadata 
-from .PDAChile import metadata as PDA_metadata 
-from .CardNexus import metadata as Nexus_metadata 
-from .TCGMatch import metadata as TCG_metadata 
+# Las tiendas se registran en tiendas/registro.py; cada adaptador se importa
+# recién cuando se consulta (ver `registro.configurar` para elegir cuáles).
+from .registro import tiendas
 
-tiendas = [
-
-    bm_metadata,
-    og_metadata,
-    hc_metadata,
-    gm_metadata,
-    pb_metadata,
-    tlc_metadata,
-    ptw_metadata,
-    rc_metadata,
-    m4e_metadata,
-    cms_metadata,
-    AFK_metadata,
-    PDA_metadata,
-    Nexus_metadata,
-    in_metadata,
-    TCG_metadata,
-]
+def __getattr__(nombre):
+    # requests se importa sólo si alguien abre una sesión
+    if nombre in ("obtener_sesion", "cerrar_sesiones"):
+        from . import sesiones
+        return getattr(sesiones, nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -0,0 +1,180 @@
+"""
+Bitácora de una búsqueda de varias cartas, a prueba de cortes.
+
+Cada resultado (carta, tienda) se agrega como una línea JSON apenas llega
+(append-only, con flush por línea y fsync cada `FSYNC_CADA` segundos). Si el
+proceso se cae o se corta con Ctrl+C a mitad de una lista larga, lo ya
+buscado queda en disco:
+- `abrir(reanudar=True)` carga la bitácora anterior; el motor responde desde
+  ella los pares ya anotados y sólo busca los que faltan. Cada línea lleva su
+  fecha y al reanudar se descartan las que superan el TTL del caché
+  (`cache.ttl`), para no armar la Ficha con precios viejos.
+- Sin `reanudar`, una bitácora pendiente no se pisa en silencio: `abrir`
+  lanza `BitacoraPendiente` salvo que se pida `descartar=True` (la anterior
+  queda como .anterior).
+- El modo no interactivo (--file/--stdin) usa una bitácora por lista de
+  cartas (`ruta_lote`), así dos lotes distintos no se pisan ni se bloquean.
+- `reconstruir_ficha` arma el CSV Ficha_Cartas (mejor precio por carta)
+  leyendo la bitácora una sola vez, línea por línea.
+
+Una última línea cortada por el corte se ignora al leer. No se anotan los
+resultados de tiendas caídas, para volver a intentarlas al reanudar.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+
+from . import cache
+from .resultado import Resultado
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+RUTA_BITACORA = os.path.join("Ficheros", "bitacora_busqueda.jsonl")
+FSYNC_CADA = 1.0                                 # segundos entre fsync (flush va en cada línea)
+
+_archivo = None
+_previos = {}                                    # (tienda, consulta normalizada) -> Resultado
+_ultimo_fsync = 0.0
+_lock = threading.Lock()
+
+class BitacoraPendiente(Exception):
+    """Hay una búsqueda cortada sin terminar y no se pidió reanudarla ni descartarla."""
+
+def ruta_lote(cartas):
+    """Bitácora propia de una lista de cartas del modo no interactivo."""
+    huella = hashlib.sha1("\n".join(cartas).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(os.path.dirname(RUTA_BITACORA), f"bitacora_lote_{huella}.jsonl")
+
+def _clave(tienda, consulta):
+    return tienda, " ".join(consulta.lower().split())
+
+# ----------------------------
+# Lectura
+# ----------------------------
+def leer_lineas(ruta=None, con_fecha=False):
+    """
+    Genera `(carta, Resultado)` de la bitácora, saltando líneas incompletas.
+    Con `con_fecha`, `(carta, Resultado, fecha)` (None en bitácoras sin fecha).
+    """
+    ruta = ruta or RUTA_BITACORA
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                datos = json.loads(linea)
+                carta, resultado = datos["carta"], Resultado.desde_json(datos)
+            except (ValueError, KeyError, TypeError):
+                continue
+            yield (carta, resultado, datos.get("fecha")) if con_fecha else (carta, resultado)
+
+def hay_pendiente(ruta=None):
+    ruta = ruta or RUTA_BITACORA
+    return os.path.exists(ruta) and os.path.getsize(ruta) > 0
+
+# ----------------------------
+# Escritura
+# ----------------------------
+def abrir(ruta=None, reanudar=False, descartar=False):
+    """
+    Empieza a anotar en `ruta`. Con `reanudar` carga lo anotado antes (sólo lo
+    que sigue dentro del TTL del caché) y sigue agregando. Si hay una bitácora
+    pendiente y no se pidió reanudar, lanza `BitacoraPendiente`; con
+    `descartar` la guarda como .anterior y empieza de cero. Devuelve cuántos
+    resultados se cargaron.
+    """
+    global _archivo, _previos, RUTA_BITACORA
+    cerrar()
+    RUTA_BITACORA = ruta or RUTA_BITACORA
+    os.makedirs(os.path.dirname(RUTA_BITACORA) or ".", exist_ok=True)
+    _previos = {}
+    if reanudar:
+        ahora = time.time()
+        for carta, resultado, fecha in leer_lineas(RUTA_BITACORA, con_fecha=True):
+            if fecha is not None and fecha + cache.ttl(resultado.tienda, resultado) >= ahora:
+                _previos[_clave(resultado.tienda, carta)] = resultado
+    elif hay_pendiente(RUTA_BITACORA):
+        if not descartar:
+            raise BitacoraPendiente(RUTA_BITACORA)
+        os.replace(RUTA_BITACORA, RUTA_BITACORA + ".anterior")
+    _archivo = open(RUTA_BITACORA, "a", encoding="utf-8")
+    if reanudar and _archivo.tell():
+        _archivo.write("\n")                     # por si la última línea quedó cortada
+    return len(_previos)
+
+def leer(tienda, consulta):
+    """Resultado ya anotado de una bitácora reanudada (None si no está)."""
+    if not _previos:
+        return None
+    return _previos.get(_clave(tienda, consulta))
+
+def anotar(tienda, consulta, resultado):
+    global _ultimo_fsync
+    if _archivo is None or resultado is None or resultado.caida or resultado.pendiente:
+        return
+    linea = json.dumps({"carta": consulta, **resultado.como_json(), "fecha": time.time()}, ensure_ascii=False)
+    with _lock:
+        if _archivo is None:
+            return
+        _archivo.write(linea + "\n")
+        _archivo.flush()
+        ahora = time.monotonic()
+        if ahora - _ultimo_fsync >= FSYNC_CADA:
+            os.fsync(_archivo.fileno())
+            _ultimo_fsync = ahora
+
+def cerrar(borrar=False):
+    """Cierra la bitácora; `borrar=True` cuando la búsqueda terminó completa."""
+    global _archivo, _previos
+    with _lock:
+        if _archivo is not None:
+            _archivo.flush()
+            os.fsync(_archivo.fileno())
+            _archivo.close()
+            _archivo = None
+            if borrar:
+                os.remove(RUTA_BITACORA)
+        _previos = {}
+
+# ----------------------------
+# Reconstrucción de la ficha
+# ----------------------------
+def reconstruir_ficha(ruta_csv, ruta=None, cantidades=None):
+    """
+    Escribe el CSV de mejor precio por carta (mismas columnas que
+    buscador_cartas.py) en una pasada sobre la bitácora. Devuelve las filas escritas.
+    """
+    cantidades = cantidades or {}
+    ultimos = {}                                 # (carta, tienda) -> última línea (al reanudar se re-anotan las vencidas)
+    for carta, r in leer_lineas(ruta):
+        ultimos[(carta, r.tienda)] = r
+
+    mejores = {}                                 # carta -> Resultado más barato (orden de llegada)
+    for (carta, _), r in ultimos.items():
+        mejores.setdefault(carta, None)
+        if r.disponible and r.precio is not None:
+            actual = mejores[carta]
+            if actual is None or r.precio < actual.precio:
+                mejores[carta] = r
+
+    filas = 0
+    with open(ruta_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Nombre de la carta", "Tienda", "Precio", "URL", "Cantidad"])
+        writer.writeheader()
+        for carta, mejor in mejores.items():
+            if mejor is None:
+                continue
+            writer.writerow({
+                "Nombre de la carta": carta,
+                "Tienda": mejor.tienda,
+                "Precio": mejor.precio_texto,
+                "URL": mejor.url,
+                "Cantidad": cantidades.get(carta, 1),
+            })
+            filas += 1
+    return filas
@@ -1,12 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
-
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+from . import salud
+from . import woocommerce
+from .parseo import crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
 # --- Función de búsqueda para BloodMoonGames ---
 def buscar(nombre_producto):
@@ -15,31 +11,35 @@ def buscar(nombre_producto):
         "url": "https://bloodmoongames.cl/?post_type=product&s={}&product_cat="
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        # Página completa: se revisa el texto de "sin resultados" y la ficha del producto
+        soup = crear_sopa(response.content)
         texto_pagina = soup.get_text()
 
         if "No se encontraron productos que concuerden con la selección." in texto_pagina:
-            resultado = {"Tienda": tienda['nombre'], "Disponible": "No", "Producto": nombre_producto, "Precio": "-", "URL": url_busqueda}
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
         else:
             nombre = soup.select_one("h1.product_title.entry-title")
             precio = soup.select_one("p.price span.woocommerce-Price-amount")
             if nombre and precio:
-                resultado = {"Tienda": tienda['nombre'], "Disponible": "Sí", "Producto": nombre.get_text(strip=True), "Precio": precio.get_text(strip=True), "URL": url_busqueda}
+                resultado = Resultado(tienda['nombre'], True, nombre.get_text(strip=True), precio.get_text(strip=True), url_busqueda)
             else:
-                resultado = {"Tienda": tienda['nombre'], "Disponible": "No", "Producto": nombre_producto, "Precio": "-", "URL": url_busqueda}
+                resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
     except Exception as e:
-        resultado = {"Tienda": tienda['nombre'], "Disponible": "No", "Producto": nombre_producto, "Precio": "-", "URL": url_busqueda}
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "BloodMoonGames",
-    "func": buscar
+    # Store API de WooCommerce (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": woocommerce.crear_buscador("BloodMoonGames", "https://bloodmoongames.cl", respaldo=buscar),
+    "func_lote": woocommerce.crear_buscador_lote("BloodMoonGames", "https://bloodmoongames.cl", respaldo=buscar),
+    "lote": woocommerce.TAMANO_LOTE,
+    "plataforma": "woocommerce",
 }
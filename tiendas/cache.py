@@ -0,0 +1,168 @@
+"""
+Caché persistente (SQLite) de los resultados de búsqueda por tienda.
+
+- Clave: tienda + consulta normalizada (minúsculas, espacios colapsados).
+- TTL por tienda (`TTL_POR_TIENDA`), y uno más corto para "no encontrado".
+  Un "No" que salió de un error (excepción atrapada, timeout, 5xx) no se
+  guarda: el motor lo devuelve como "caída" (`tiendas.salud`).
+- Tamaño acotado: al pasar de `MAX_ENTRADAS` se eliminan las menos usadas (LRU).
+- `configurar(usar=False)` equivale a --no-cache; `configurar(refrescar=True)`
+  a --refresh (no lee, pero sí guarda lo nuevo).
+- También guarda los ids de producto que calzaron con cada consulta en las
+  tiendas WooCommerce, para refrescar muchas cartas en una sola consulta
+  (`include=`) en vez de volver a buscarlas una por una. Duran `TTL_IDS`:
+  mientras tanto una publicación nueva (p. ej. más barata) de la carta no se
+  ve si alguna de las conocidas sigue en stock.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .resultado import Resultado
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+RUTA_CACHE = os.path.join("Ficheros", "cache_busquedas.sqlite")
+TTL_DEFECTO = 60 * 60                            # 1 hora para resultados encontrados
+TTL_NO_ENCONTRADO = 15 * 60                      # 15 minutos para "no encontrado"
+MAX_ENTRADAS = 50000
+REVISAR_CADA = 500                               # escrituras entre revisiones de tamaño
+TTL_IDS = 3 * 60 * 60                            # ids conocidos: después se vuelve a buscar por nombre
+
+# Ajustes por tienda (segundos)
+TTL_POR_TIENDA = {
+    "Magic4Ever": 3 * 60 * 60,
+    "PDAChile": 3 * 60 * 60,
+}
+
+_usar = True
+_refrescar = False
+_conexion = None
+_escrituras = 0
+_lock = threading.Lock()
+
+def configurar(usar=True, refrescar=False, ruta=None):
+    global _usar, _refrescar, RUTA_CACHE, _conexion
+    _usar = usar
+    _refrescar = refrescar
+    if ruta and ruta != RUTA_CACHE:
+        RUTA_CACHE = ruta
+        _conexion = None
+
+def normalizar_consulta(consulta):
+    return " ".join(consulta.lower().split())
+
+def _obtener_conexion():
+    global _conexion
+    if _conexion is None:
+        os.makedirs(os.path.dirname(RUTA_CACHE) or ".", exist_ok=True)
+        _conexion = sqlite3.connect(RUTA_CACHE, check_same_thread=False, isolation_level=None)
+        _conexion.execute("PRAGMA journal_mode=WAL")
+        _conexion.execute("PRAGMA synchronous=NORMAL")
+        _conexion.execute(
+            """CREATE TABLE IF NOT EXISTS busquedas (
+                tienda TEXT NOT NULL,
+                consulta TEXT NOT NULL,
+                resultado TEXT NOT NULL,
+                expira REAL NOT NULL,
+                accedido REAL NOT NULL,
+                PRIMARY KEY (tienda, consulta)
+            )"""
+        )
+        _conexion.execute("CREATE INDEX IF NOT EXISTS idx_accedido ON busquedas (accedido)")
+        _conexion.execute(
+            """CREATE TABLE IF NOT EXISTS productos_conocidos (
+                tienda TEXT NOT NULL,
+                consulta TEXT NOT NULL,
+                ids TEXT NOT NULL,
+                guardado REAL NOT NULL,
+                PRIMARY KEY (tienda, consulta)
+            )"""
+        )
+        _desalojar(_conexion)
+    return _conexion
+
+def ttl(tienda, resultado):
+    """Segundos que vale un resultado de `tienda` (también al reanudar una bitácora)."""
+    if not resultado.disponible:
+        return TTL_NO_ENCONTRADO
+    return TTL_POR_TIENDA.get(tienda, TTL_DEFECTO)
+
+def leer(tienda, consulta):
+    """Devuelve el resultado cacheado y vigente, o None."""
+    if not _usar or _refrescar:
+        return None
+    ahora = time.time()
+    with _lock:
+        con = _obtener_conexion()
+        fila = con.execute(
+            "SELECT resultado, expira FROM busquedas WHERE tienda = ? AND consulta = ?",
+            (tienda, normalizar_consulta(consulta)),
+        ).fetchone()
+        if fila is None or fila[1] < ahora:
+            return None
+        con.execute(
+            "UPDATE busquedas SET accedido = ? WHERE tienda = ? AND consulta = ?",
+            (ahora, tienda, normalizar_consulta(consulta)),
+        )
+    return Resultado.desde_dict(json.loads(fila[0]))
+
+def guardar(tienda, consulta, resultado):
+    global _escrituras
+    if not _usar or not resultado:
+        return
+    ahora = time.time()
+    with _lock:
+        con = _obtener_conexion()
+        con.execute(
+            "INSERT OR REPLACE INTO busquedas (tienda, consulta, resultado, expira, accedido) VALUES (?, ?, ?, ?, ?)",
+            (tienda, normalizar_consulta(consulta), json.dumps(resultado.como_dict(), ensure_ascii=False),
+             ahora + ttl(tienda, resultado), ahora),
+        )
+        _escrituras += 1
+        if _escrituras % REVISAR_CADA == 0:
+            _desalojar(con)
+
+def _desalojar(con):
+    """Elimina las entradas menos usadas si el caché pasó de MAX_ENTRADAS."""
+    total = con.execute("SELECT COUNT(*) FROM busquedas").fetchone()[0]
+    if total <= MAX_ENTRADAS:
+        return
+    sobrantes = total - MAX_ENTRADAS + MAX_ENTRADAS // 10   # deja un 10% de margen
+    con.execute(
+        "DELETE FROM busquedas WHERE rowid IN (SELECT rowid FROM busquedas ORDER BY accedido LIMIT ?)",
+        (sobrantes,),
+    )
+
+# ----------------------------
+# Ids de producto conocidos
+# ----------------------------
+def leer_ids(tienda, consulta):
+    """Ids de producto que calzaron con la consulta la última vez (None si no hay o son viejos)."""
+    if not _usar or _refrescar:
+        return None
+    with _lock:
+        fila = _obtener_conexion().execute(
+            "SELECT ids, guardado FROM productos_conocidos WHERE tienda = ? AND consulta = ?",
+            (tienda, normalizar_consulta(consulta)),
+        ).fetchone()
+    if fila is None or fila[1] + TTL_IDS < time.time():
+        return None
+    return json.loads(fila[0])
+
+def guardar_ids(tienda, consulta, ids):
+    if not _usar or not ids:
+        return
+    with _lock:
+        _obtener_conexion().execute(
+            "INSERT OR REPLACE INTO productos_conocidos (tienda, consulta, ids, guardado) VALUES (?, ?, ?, ?)",
+            (tienda, normalizar_consulta(consulta), json.dumps(ids), time.time()),
+        )
+
+def limpiar_expirados():
+    with _lock:
+        _obtener_conexion().execute("DELETE FROM busquedas WHERE expira < ?", (time.time(),))
@@ -0,0 +1,347 @@
+"""
+Optimizador de canasta: dónde comprar un mazo completo al menor costo total.
+
+Elegir la tienda más barata carta por carta reparte un mazo de 100 cartas en
+una docena de tiendas y olvida el envío. Aquí se minimiza
+    precio de las cartas + envío de cada tienda usada
+con envío por tienda (`ENVIOS`), envío gratis desde cierto monto, compra
+mínima por tienda y un máximo de tiendas.
+
+Listas chicas (hasta `MAX_EXACTO` asignaciones carta -> tienda posibles) se
+resuelven probando todas. Para el resto, una heurística (sin dependencias,
+menos de un segundo para un Commander completo):
+1. Con un conjunto de tiendas fijo, cada carta va a la más barata del
+   conjunto; luego se intenta completar el monto de envío gratis de cada
+   tienda moviéndole cartas si eso cuesta menos que su envío, y se mueven
+   cartas sueltas entre tiendas mientras alguna mudanza baje el total (por
+   ejemplo, para vaciar una tienda y ahorrar su envío). Las tiendas que no
+   alcanzan la compra mínima se sacan.
+2. Con pocas tiendas (hasta `MAX_CONJUNTOS` conjuntos posibles) se prueban
+   todos los conjuntos. Si no, el conjunto se arma agregando de a una la
+   tienda que más baja el total (greedy) y se mejora con búsqueda local
+   (sacar o cambiar una tienda) hasta que ningún movimiento mejore. En cada
+   paso sólo se evalúan a fondo los `MAX_VECINOS` conjuntos que mejor quedan
+   con la asignación directa (cada carta a la más barata, sin mudanzas).
+Primero se maximizan las cartas cubiertas y después se minimiza el costo.
+benchmarks/verificar_canasta.py compara el resultado con la fuerza bruta en
+casos chicos.
+"""
+
+import itertools
+import math
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+ENVIO_DEFECTO = {"envio": 4000, "gratis_desde": None, "minimo": 0}
+
+# Ajustes por tienda (se mezclan sobre ENVIO_DEFECTO), en CLP.
+# Ej.: "BloodMoonGames": {"envio": 3500, "gratis_desde": 50000}
+ENVIOS = {}
+
+MAX_RONDAS = 50                                  # rondas de búsqueda local
+MAX_VECINOS = 5                                  # vecinos evaluados por paso (los mejores según la estimación)
+MAX_CONJUNTOS = 256                              # hasta aquí se prueban todos los conjuntos de tiendas
+MAX_EXACTO = 5000                                # hasta aquí se prueban todas las asignaciones (óptimo exacto)
+
+def envio_de(tienda, envios=None):
+    return {**ENVIO_DEFECTO, **(ENVIOS if envios is None else envios).get(tienda, {})}
+
+def costo_envio(config, subtotal):
+    """Envío que se paga con `subtotal` en la tienda (0 si no se usa o alcanza el envío gratis)."""
+    if subtotal <= 0 or (config["gratis_desde"] is not None and subtotal >= config["gratis_desde"]):
+        return 0
+    return config["envio"]
+
+# ----------------------------
+# Resultado
+# ----------------------------
+class Canasta:
+    """Plan de compra: carta -> (tienda, precio unitario), subtotales y envíos por tienda."""
+
+    def __init__(self, asignacion, cantidades, faltantes, envios):
+        self.asignacion = asignacion
+        self.faltantes = faltantes
+        self.subtotales = {}
+        for carta, (tienda, precio) in asignacion.items():
+            self.subtotales[tienda] = self.subtotales.get(tienda, 0) + precio * cantidades.get(carta, 1)
+        self.envios = {tienda: costo_envio(envio_de(tienda, envios), subtotal)
+                       for tienda, subtotal in self.subtotales.items()}
+        self.cartas = sum(self.subtotales.values())
+        self.total = self.cartas + sum(self.envios.values())
+
+    @property
+    def tiendas(self):
+        return sorted(self.subtotales, key=lambda t: -self.subtotales[t])
+
+    def clave(self):
+        return (len(self.faltantes), self.total)
+
+    def por_tienda(self):
+        """{tienda: [cartas]} en el orden de la asignación."""
+        grupos = {}
+        for carta, (tienda, _) in self.asignacion.items():
+            grupos.setdefault(tienda, []).append(carta)
+        return grupos
+
+# ----------------------------
+# Evaluación de un conjunto de tiendas
+# ----------------------------
+def _ofertas(precios):
+    """carta -> [(precio, tienda), ...] de menor a mayor."""
+    return {carta: sorted((p, t) for t, p in por_tienda.items()) for carta, por_tienda in precios.items()}
+
+def _mas_barata_en(elegidas, ofertas, cantidades, envios):
+    """Cada carta a la tienda más barata de `elegidas`, sin mover nada (estimación rápida)."""
+    asignacion, faltantes = {}, []
+    for carta, lista in ofertas.items():
+        for precio, tienda in lista:
+            if tienda in elegidas:
+                asignacion[carta] = (tienda, precio)
+                break
+        else:
+            faltantes.append(carta)
+    return Canasta(asignacion, cantidades, faltantes, envios)
+
+def _evaluar(elegidas, ofertas, cantidades, envios):
+    elegidas = set(elegidas)
+    while True:
+        canasta = _llenar_minimos(_mas_barata_en(elegidas, ofertas, cantidades, envios), ofertas, cantidades, envios)
+        while True:
+            mejorada = _mover_cartas(_completar_envio_gratis(canasta, elegidas, ofertas, cantidades, envios),
+                                     elegidas, ofertas, cantidades, envios)
+            if mejorada.total >= canasta.total:
+                break
+            canasta = mejorada
+        # Tiendas que no se pudieron llevar a su compra mínima: se sacan y se vuelve a asignar
+        bajo_minimo = {t for t, s in canasta.subtotales.items() if s < envio_de(t, envios)["minimo"]}
+        if not bajo_minimo:
+            return canasta
+        elegidas -= bajo_minimo
+
+def _completar(canasta, tienda, umbral, ofertas, cantidades, envios):
+    """
+    Le mueve a `tienda` cartas hasta llegar a `umbral`: las que menos encarecen
+    en orden, o una sola carta que baste. Devuelve la opción válida más barata;
+    None si ninguna alcanza sin dejar a otra tienda recién bajo su compra mínima.
+    """
+    falta = umbral - canasta.subtotales.get(tienda, 0)
+    movibles = []
+    for carta, (actual, precio_actual) in canasta.asignacion.items():
+        if actual == tienda:
+            continue
+        precio = next((p for p, t in ofertas[carta] if t == tienda), None)
+        if precio is not None:
+            q = cantidades.get(carta, 1)
+            movibles.append(((precio - precio_actual) * q, precio * q, carta, precio))
+    movibles.sort()
+
+    # Cada carta que sola alcanza, y las más convenientes seguidas hasta alcanzar
+    opciones = [[(carta, precio)] for _, aporte, carta, precio in movibles if aporte >= falta]
+    seguidas, acumulado = [], 0
+    for _, aporte, carta, precio in movibles:
+        if acumulado >= falta:
+            break
+        seguidas.append((carta, precio))
+        acumulado += aporte
+    if acumulado >= falta:
+        opciones.append(seguidas)
+
+    mejor = None
+    for movidas in opciones:
+        asignacion = dict(canasta.asignacion)
+        for carta, precio in movidas:
+            asignacion[carta] = (tienda, precio)
+        nueva = Canasta(asignacion, cantidades, canasta.faltantes, envios)
+        if any(s < envio_de(t, envios)["minimo"] <= canasta.subtotales.get(t, 0) for t, s in nueva.subtotales.items()):
+            continue
+        if mejor is None or nueva.total < mejor.total:
+            mejor = nueva
+    return mejor
+
+def _llenar_minimos(canasta, ofertas, cantidades, envios):
+    """Antes de sacar una tienda bajo su compra mínima, intenta llegar al mínimo moviéndole cartas."""
+    for tienda in list(canasta.subtotales):
+        minimo = envio_de(tienda, envios)["minimo"]
+        if tienda not in canasta.subtotales or canasta.subtotales[tienda] >= minimo:
+            continue
+        nueva = _completar(canasta, tienda, minimo, ofertas, cantidades, envios)
+        if nueva is not None:
+            canasta = nueva
+    return canasta
+
+def _completar_envio_gratis(canasta, elegidas, ofertas, cantidades, envios):
+    """
+    Mueve cartas a tiendas que quedaron cerca del envío gratis si eso baja el
+    total, contando las mudanzas de cartas sueltas que eso habilita (p. ej. que
+    la tienda que perdió cartas recupere su envío gratis con otras).
+    """
+    # `canasta` cambia en el ciclo: una tienda que se quedó sin cartas ya no está
+    for tienda in sorted(canasta.envios, key=lambda t: -canasta.envios[t]):
+        config = envio_de(tienda, envios)
+        if not canasta.envios.get(tienda) or config["gratis_desde"] is None:
+            continue
+        nueva = _completar(canasta, tienda, config["gratis_desde"], ofertas, cantidades, envios)
+        if nueva is None:
+            continue
+        if nueva.total >= canasta.total:
+            nueva = _mover_cartas(nueva, elegidas, ofertas, cantidades, envios)
+        if nueva.total < canasta.total:
+            canasta = nueva
+    return canasta
+
+def _mover_cartas(canasta, elegidas, ofertas, cantidades, envios):
+    """Mueve de a una carta a otra tienda elegida mientras la mejor mudanza baje el total."""
+    asignacion = dict(canasta.asignacion)
+    subtotales = dict(canasta.subtotales)
+    configs = {t: envio_de(t, envios) for t in elegidas}
+    alternativas = {carta: [(p, t) for p, t in ofertas[carta] if t in elegidas] for carta in asignacion}
+    max_envio = max((c["envio"] for c in configs.values()), default=0)
+
+    def permitido(tienda, antes, despues):
+        # No deja una tienda recién bajo su compra mínima (las que ya estaban se sacan después)
+        minimo = configs[tienda]["minimo"]
+        return despues == 0 or despues >= minimo or antes < minimo
+
+    while True:
+        mejor = None
+        for carta, (origen, precio_origen) in asignacion.items():
+            q = cantidades.get(carta, 1)
+            s_origen = subtotales[origen]
+            n_origen = s_origen - precio_origen * q
+            if not permitido(origen, s_origen, n_origen):
+                continue
+            ahorro_origen = costo_envio(configs[origen], s_origen) - costo_envio(configs[origen], n_origen)
+            for precio, destino in alternativas[carta]:
+                # De menor a mayor precio: desde aquí ni ahorrando un envío en el destino conviene
+                if (precio - precio_origen) * q - ahorro_origen - max_envio >= 0:
+                    break
+                if destino == origen:
+                    continue
+                s_destino = subtotales.get(destino, 0)
+                n_destino = s_destino + precio * q
+                if not permitido(destino, s_destino, n_destino):
+                    continue
+                delta = ((precio - precio_origen) * q - ahorro_origen
+                         + costo_envio(configs[destino], n_destino) - costo_envio(configs[destino], s_destino))
+                if delta < 0 and (mejor is None or delta < mejor[0]):
+                    mejor = (delta, carta, origen, destino, precio, q)
+        if mejor is None:
+            break
+        _, carta, origen, destino, precio, q = mejor
+        subtotales[origen] -= asignacion[carta][1] * q
+        subtotales[destino] = subtotales.get(destino, 0) + precio * q
+        asignacion[carta] = (destino, precio)
+    if asignacion == canasta.asignacion:
+        return canasta
+    return Canasta(asignacion, cantidades, canasta.faltantes, envios)
+
+# ----------------------------
+# Búsqueda
+# ----------------------------
+def optimizar(precios, cantidades=None, max_tiendas=None, envios=None):
+    """
+    `precios`: {carta: {tienda: precio unitario}} sólo con ofertas disponibles.
+    `cantidades`: {carta: copias} (1 si falta). Devuelve la `Canasta` más barata
+    encontrada con a lo más `max_tiendas` tiendas.
+    """
+    cantidades = cantidades or {}
+    ofertas = _ofertas(precios)
+    todas = sorted({t for por_tienda in precios.values() for t in por_tienda})
+    limite = len(todas) if not max_tiendas else min(max_tiendas, len(todas))
+    evaluadas = {}
+
+    def evaluar(conjunto):
+        conjunto = frozenset(conjunto)
+        if conjunto not in evaluadas:
+            evaluadas[conjunto] = _evaluar(conjunto, ofertas, cantidades, envios)
+        return evaluadas[conjunto]
+
+    def prometedores(vecinos):
+        # Evaluar es caro (mudanzas de cartas); se evalúan sólo los mejores según la asignación directa
+        vecinos = [frozenset(v) for v in vecinos]
+        if len(vecinos) <= MAX_VECINOS:
+            return vecinos
+        return sorted(vecinos, key=lambda v: _mas_barata_en(v, ofertas, cantidades, envios).clave())[:MAX_VECINOS]
+
+    # Lista chica: todas las asignaciones
+    exacta = _exacta(ofertas, cantidades, envios, limite)
+    if exacta is not None:
+        return exacta
+
+    # Pocas tiendas: todos los conjuntos
+    tamanos = range(limite + 1)
+    if sum(math.comb(len(todas), k) for k in tamanos) <= MAX_CONJUNTOS:
+        conjuntos = (c for k in tamanos for c in itertools.combinations(todas, k))
+        return min((evaluar(c) for c in conjuntos), key=Canasta.clave)
+
+    # 1) Greedy: agregar la tienda que más mejora
+    elegidas = frozenset()
+    mejor = evaluar(elegidas)
+    while len(elegidas) < limite:
+        vecinos = prometedores(elegidas | {t} for t in todas if t not in elegidas)
+        candidata = min((evaluar(v) for v in vecinos), key=Canasta.clave)
+        if candidata.clave() >= mejor.clave():
+            break
+        mejor = candidata
+        elegidas = frozenset(mejor.subtotales)
+
+    # 2) Búsqueda local: sacar, agregar o cambiar una tienda
+    for _ in range(MAX_RONDAS):
+        vecinos = [elegidas - {t} for t in elegidas]
+        fuera = [t for t in todas if t not in elegidas]
+        if len(elegidas) < limite:
+            vecinos += [elegidas | {u} for u in fuera]
+        vecinos += [(elegidas - {t}) | {u} for t in elegidas for u in fuera]
+        candidata = min((evaluar(v) for v in prometedores(vecinos)), key=Canasta.clave, default=mejor)
+        if candidata.clave() >= mejor.clave():
+            break
+        mejor = candidata
+        elegidas = frozenset(mejor.subtotales)
+    return mejor
+
+def _exacta(ofertas, cantidades, envios, limite):
+    """Óptimo probando todas las asignaciones; None si son más de `MAX_EXACTO`."""
+    minimos = {t: envio_de(t, envios)["minimo"] for lista in ofertas.values() for _, t in lista}
+    # None = no comprarla (la compra mínima o el máximo de tiendas pueden obligar)
+    opciones = [[None] + [(t, p) for p, t in lista] for lista in ofertas.values()]
+    if math.prod(len(o) for o in opciones) > MAX_EXACTO:
+        return None
+
+    cartas = list(ofertas)
+    mejor = None
+    for eleccion in itertools.product(*opciones):
+        if len({o[0] for o in eleccion if o}) > limite:
+            continue
+        asignacion = {carta: o for carta, o in zip(cartas, eleccion) if o}
+        faltantes = [carta for carta, o in zip(cartas, eleccion) if not o]
+        plan = Canasta(asignacion, cantidades, faltantes, envios)
+        if any(s < minimos[t] for t, s in plan.subtotales.items()):
+            continue
+        if mejor is None or plan.clave() < mejor.clave():
+            mejor = plan
+    return mejor
+
+def mas_barata_por_carta(precios, cantidades=None, envios=None, asignacion=None):
+    """
+    La compra ingenua (tienda más barata por carta, sin mirar envío) con su
+    costo total. `asignacion` {carta: (tienda, precio)} si ya está calculada
+    (p. ej. `MatrizPrecios.mas_baratas()`).
+    """
+    cantidades = cantidades or {}
+    if asignacion is None:
+        asignacion = {carta: min(((t, p) for t, p in por_tienda.items()), key=lambda x: x[1])
+                      for carta, por_tienda in precios.items() if por_tienda}
+    faltantes = [carta for carta, por_tienda in precios.items() if not por_tienda]
+    return Canasta(asignacion, cantidades, faltantes, envios)
+
+def precios_de(resultados_por_carta):
+    """{carta: [Resultado]} -> {carta: {tienda: precio}} con las ofertas disponibles."""
+    precios = {}
+    for carta, resultados in resultados_por_carta.items():
+        precios[carta] = {}
+        for r in resultados:
+            if r.disponible and r.precio is not None:
+                actual = precios[carta].get(r.tienda)
+                precios[carta][r.tienda] = r.precio if actual is None else min(actual, r.precio)
+    return precios
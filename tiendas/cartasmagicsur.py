@@ -1,22 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
 import json
 
+from . import salud
+from . import woocommerce
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
+
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("ul.products", "div.summary")
+
 def buscar_producto(nombre_busqueda):
     url_busqueda = f"https://www.cartasmagicsur.cl/?s={nombre_busqueda.replace(' ', '+')}&post_type=product"
-    resultado = {
-        "Tienda": "Cartas Magic Sur",
-        "Disponible": "No",
-        "Cantidad": "-",
-        "Producto": nombre_busqueda,
-        "Precio": "-",
-        "URL": url_busqueda
-    }
+    resultado = Resultado.no_disponible("Cartas Magic Sur", nombre_busqueda, url_busqueda)
 
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url_busqueda, headers=headers)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(r.content, CONTENEDORES)
 
         productos = soup.select("ul.products li.product, div.summary.entry-summary")
         for p in productos:
@@ -25,39 +25,24 @@ def buscar_producto(nombre_busqueda):
                 continue
             titulo = titulo_tag.text.strip()
 
-            if nombre_busqueda.lower() in titulo.lower():
+            if consulta(nombre_busqueda).contiene(titulo):
                 variaciones_form = p.select_one("form.variations_form")
                 if variaciones_form:
                     variations_json = variaciones_form.get("data-product_variations", "[]")
                     variations = json.loads(variations_json)
                     for v in variations:
                         if v.get("is_in_stock"):
-                            cantidad = BeautifulSoup(v.get("availability_html", ""), "html.parser").text.strip()
-                            precio = f"${v.get('display_price', 0):,.0f}"
                             url_prod = variaciones_form.get("action")
-                            resultado.update({
-                                "Disponible": "Sí",
-                                "Cantidad": cantidad,
-                                "Producto": titulo,
-                                "Precio": precio,
-                                "URL": url_prod
-                            })
-                            return resultado
+                            return Resultado("Cartas Magic Sur", True, titulo, int(v.get("display_price", 0)), url_prod)
 
                 precio_tag = p.select_one("span.woocommerce-Price-amount")
-                precio = precio_tag.text.strip() if precio_tag else "-"
+                precio = precio_tag.text.strip() if precio_tag else None
                 url_tag = p.select_one("a.woocommerce-LoopProduct-link, form.variations_form")
                 url_prod = url_tag.get("href") if url_tag and url_tag.has_attr("href") else url_busqueda
-                resultado.update({
-                    "Disponible": "Sí",
-                    "Producto": titulo,
-                    "Precio": precio,
-                    "URL": url_prod
-                })
-                return resultado
+                return Resultado("Cartas Magic Sur", True, titulo, precio, url_prod)
 
     except Exception as e:
-        print("Error:", e)
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
 
     return resultado
 
@@ -65,5 +50,9 @@ def buscar_producto(nombre_busqueda):
 metadata = {
     "nombre": "Cartas Magic Sur",
     "url": "https://www.cartasmagicsur.cl",
-    "func": buscar_producto  # <-- clave necesaria
+    # Store API de WooCommerce (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": woocommerce.crear_buscador("Cartas Magic Sur", "https://www.cartasmagicsur.cl", respaldo=buscar_producto),
+    "func_lote": woocommerce.crear_buscador_lote("Cartas Magic Sur", "https://www.cartasmagicsur.cl", respaldo=buscar_producto),
+    "lote": woocommerce.TAMANO_LOTE,
+    "plataforma": "woocommerce",
 }
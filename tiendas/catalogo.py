@@ -0,0 +1,136 @@
+"""
+Búsqueda offline sobre los catálogos que bajan los crawlers List_*.
+
+Carga el CSV más reciente de cada tienda en `Ficheros/` (esquema
+nombre_original/nombre/foil/precio/url de List_Bloodmoongames_single.py y
+Unificador.py) en un índice invertido en memoria (palabra -> filas). Si el
+snapshot es más nuevo que `FRESCURA_MAX_HORAS` y la carta no aparece en él,
+`buscar` responde "No" sin ir a la tienda. Si aparece, devuelve None y el motor
+va en vivo: los crawls HTML incluyen publicaciones agotadas y el CSV no trae
+stock, así que un calce no prueba que la carta esté disponible. Lo mismo si el
+snapshot está viejo o la tienda no tiene crawl.
+
+Sólo se registran tiendas cuyo crawl cubre todo el catálogo de singles, y sólo
+sus CSV finales: un snapshot parcial (p.ej. sólo foil, sólo algunos años o el
+archivo que se va guardando a mitad de crawl) daría falsos "No".
+
+El índice de cada tienda queda en memoria y la carpeta se vuelve a revisar
+(glob + mtime) a lo más cada `REVISAR_CADA` segundos, no en cada consulta: un
+crawl nuevo se ve en la búsqueda siguiente a ese plazo.
+"""
+
+import csv
+import glob
+import os
+import threading
+import time
+
+from .coincidencia import normalizar, palabras
+from .resultado import Resultado, precio_a_entero
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+CARPETA = "Ficheros"
+FRESCURA_MAX_HORAS = 24
+REVISAR_CADA = 60                                # segundos entre revisiones de Ficheros/ por tienda
+
+# tienda (metadata["nombre"]) -> patrones de los CSV que genera su crawler
+CATALOGOS = {
+    "BloodMoonGames": ["List_BloodMoon_final_*.csv"],    # no los respaldos de crawls cortados
+    "HunterCardTCG": ["List_HunterCard_*.csv"],
+    "GameOfMagicSingles": ["List_gameofmagicsingles_*.csv"],
+    "PiedraBruja": ["List_PiedraBruja_*.csv"],
+    "TiendaLaComarca": ["List_TiendaLaComarca_*.csv"],
+}
+
+_usar = True
+_indices = {}
+_revisado = {}                                   # tienda -> time.monotonic() de la última revisión
+_lock = threading.Lock()
+
+def configurar(usar=True):
+    global _usar
+    _usar = usar
+
+# ----------------------------
+# Utilidades
+# ----------------------------
+def snapshot_mas_reciente(tienda):
+    """Ruta del CSV más nuevo de la tienda, o None si no hay crawl."""
+    archivos = []
+    for patron in CATALOGOS.get(tienda, []):
+        archivos.extend(glob.glob(os.path.join(CARPETA, patron)))
+    if not archivos:
+        return None
+    return max(archivos, key=os.path.getmtime)
+
+# ----------------------------
+# Índice invertido
+# ----------------------------
+class IndiceCatalogo:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.fecha = os.path.getmtime(ruta)
+        self.filas = []                          # (nombre_norm, titulo, precio, url)
+        self.indice = {}                         # palabra -> set(ids)
+        with open(ruta, newline="", encoding="utf-8") as f:
+            for fila in csv.DictReader(f):
+                titulo = fila.get("nombre_original") or fila.get("nombre") or ""
+                if not titulo:
+                    continue
+                id_fila = len(self.filas)
+                self.filas.append((
+                    normalizar(fila.get("nombre") or titulo),
+                    titulo,
+                    precio_a_entero(fila.get("precio")),
+                    fila.get("url", ""),
+                ))
+                for palabra in set(palabras(titulo)):
+                    self.indice.setdefault(palabra, set()).add(id_fila)
+
+    def fresco(self):
+        return time.time() - self.fecha <= FRESCURA_MAX_HORAS * 3600
+
+    def buscar(self, consulta):
+        """Filas que contienen todas las palabras de la consulta; exactas primero, luego por precio."""
+        claves = palabras(consulta)
+        if not claves:
+            return []
+        conjuntos = [self.indice.get(p, set()) for p in claves]
+        ids = set.intersection(*sorted(conjuntos, key=len))
+        consulta_norm = normalizar(consulta)
+        filas = [self.filas[i] for i in ids]
+        return sorted(filas, key=lambda f: (f[0] != consulta_norm, f[2] is None, f[2] or 0))
+
+def _obtener_indice(tienda):
+    """Índice del CSV más nuevo de la tienda; revisa la carpeta cada `REVISAR_CADA` segundos."""
+    if time.monotonic() - _revisado.get(tienda, float("-inf")) < REVISAR_CADA:
+        return _indices.get(tienda)
+    with _lock:
+        if time.monotonic() - _revisado.get(tienda, float("-inf")) < REVISAR_CADA:
+            return _indices.get(tienda)
+        ruta = snapshot_mas_reciente(tienda)
+        indice = _indices.get(tienda)
+        if ruta is None:
+            indice = None
+        elif indice is None or indice.ruta != ruta or indice.fecha != os.path.getmtime(ruta):
+            indice = IndiceCatalogo(ruta)
+        _indices[tienda] = indice
+        _revisado[tienda] = time.monotonic()
+    return indice
+
+# ----------------------------
+# Búsqueda
+# ----------------------------
+def buscar(tienda, nombre_producto):
+    """"No" si la carta no está en el catálogo; None si hay que ir en vivo."""
+    if not _usar or tienda not in CATALOGOS:
+        return None
+    indice = _obtener_indice(tienda)
+    if indice is None or not indice.fresco():
+        return None
+
+    if indice.buscar(nombre_producto):
+        return None                              # está publicada: el stock y el precio se ven en vivo
+    return Resultado.no_disponible(tienda, nombre_producto)
@@ -0,0 +1,123 @@
+"""
+Comparación de nombres de carta, compartida por todos los adaptadores.
+
+- Normaliza una sola vez: minúsculas, sin acentos (como `limpiar_nombre` de
+  List_Bloodmoongames_single.py) y con espacios colapsados. Los títulos de
+  producto se normalizan con caché, así un mismo título no se vuelve a
+  tokenizar en cada consulta.
+- `Consulta` se prepara una vez por carta (palabras y patrón de frase
+  precompilados) y se compara contra muchos títulos.
+- Cartas divididas / de dos caras ("Fire // Ice", "Delver of Secrets //
+  Insectile Aberration"): tienen que calzar todas las caras, o el título
+  completo (sin edición ni variante) tiene que ser la cara frontal; así
+  "Fire // Ice" calza con "Fire" pero no con "Fire Diamond".
+- `nombre_base` quita edición y variante del título ("Sol Ring (CMM) - Foil"
+  -> "sol ring") para reconocer coincidencias exactas; `exactas` deja sólo
+  esas cuando las hay, para que "Forest" no elija "Forest Bear".
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+CACHE_TITULOS = 65536                            # títulos normalizados que se recuerdan
+CACHE_CONSULTAS = 4096
+
+_RE_PALABRA = re.compile(r"\w+")
+_RE_ESPACIOS = re.compile(r"\s+")
+_RE_ENTRE_PARENTESIS = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]")
+_RE_SUFIJO = re.compile(r"\s+[-–—|]\s+.*$")
+_RE_VARIANTE = re.compile(r"\b(foil|etched|borderless|showcase|extended art|full art|promo)\b", re.I)
+
+# ----------------------------
+# Normalización
+# ----------------------------
+def normalizar(texto):
+    """Minúsculas, sin acentos y con espacios colapsados."""
+    texto = unicodedata.normalize("NFKD", texto).encode("ASCII", "ignore").decode("utf-8")
+    return _RE_ESPACIOS.sub(" ", texto).strip().lower()
+
+def palabras(texto):
+    return _RE_PALABRA.findall(normalizar(texto))
+
+@lru_cache(maxsize=CACHE_TITULOS)
+def palabras_titulo(titulo):
+    """Palabras normalizadas de un título de producto (con caché)."""
+    return frozenset(palabras(titulo))
+
+@lru_cache(maxsize=CACHE_TITULOS)
+def titulo_normalizado(titulo):
+    return normalizar(titulo)
+
+def caras(nombre):
+    """'Fire // Ice' -> ['fire', 'ice']; un nombre normal queda como una sola cara."""
+    return [c.strip() for c in normalizar(nombre).split("//") if c.strip()]
+
+@lru_cache(maxsize=CACHE_TITULOS)
+def nombre_base(titulo):
+    """Nombre sin edición, número ni variante: 'Sol Ring (CMM) - Foil' -> 'sol ring'."""
+    s = _RE_ENTRE_PARENTESIS.sub("", titulo)
+    s = _RE_SUFIJO.sub("", s)
+    s = _RE_VARIANTE.sub("", s)
+    return normalizar(s)
+
+# ----------------------------
+# Consulta precompilada
+# ----------------------------
+class Consulta:
+    """Nombre buscado, preparado una vez para compararlo contra muchos títulos."""
+    __slots__ = ("texto", "normal", "frontal", "dividida", "palabras", "patrones")
+
+    def __init__(self, texto):
+        self.texto = texto
+        self.normal = normalizar(texto)
+        lados = caras(texto) or [self.normal]
+        self.frontal = lados[0]
+        self.dividida = len(lados) > 1
+        self.palabras = frozenset(_RE_PALABRA.findall(self.normal))
+        # Frase de cada cara en orden, con límites de palabra ("opt" no calza con "optimus")
+        self.patrones = []
+        for lado in lados:
+            frase = r"\W+".join(re.escape(p) for p in _RE_PALABRA.findall(lado))
+            if frase:
+                self.patrones.append(re.compile(rf"\b{frase}\b"))
+
+    def solo_frontal(self, titulo):
+        """Carta dividida publicada sólo con su cara frontal ("Delver of Secrets (ISD)")."""
+        return self.dividida and nombre_base(titulo) == self.frontal
+
+    def coincide(self, titulo):
+        """Todas las palabras buscadas (de todas las caras) están en el título."""
+        if not self.palabras:
+            return False
+        return self.palabras <= palabras_titulo(titulo) or self.solo_frontal(titulo)
+
+    def contiene(self, titulo):
+        """Cada cara del nombre aparece como frase dentro del título."""
+        if not self.patrones:
+            return False
+        normal = titulo_normalizado(titulo)
+        return all(p.search(normal) for p in self.patrones) or self.solo_frontal(titulo)
+
+    def exacta(self, titulo):
+        """El título, sin edición ni variante, es exactamente la carta buscada."""
+        base = nombre_base(titulo)
+        return base == self.normal or base == self.frontal or base.split(" // ")[0] == self.frontal
+
+    def exactas(self, titulos):
+        """Índices de los títulos exactos; si no hay ninguno, todos (ya calzaron por palabras)."""
+        indices = [i for i, titulo in enumerate(titulos) if self.exacta(titulo)]
+        return indices or list(range(len(titulos)))
+
+@lru_cache(maxsize=CACHE_CONSULTAS)
+def consulta(texto):
+    return Consulta(texto)
+
+def coincide(texto, titulo):
+    return consulta(texto).coincide(titulo)
+
+def contiene(texto, titulo):
+    return consulta(texto).contiene(titulo)
@@ -0,0 +1,243 @@
+"""
+Motor de crawl de catálogos compartido por los scripts List_*.
+
+Cada tienda aporta sólo dos funciones:
+- `url_pagina(pagina) -> url`
+- `parsear(respuesta) -> [dict]` (lista vacía = página sin productos)
+
+y `recorrer` se encarga del resto, generalizando la ventana de prefetch de
+List_Bloodmoongames_single.py (`WINDOW_SIZE` / `buffer_pages`):
+- Hasta `concurrencia` páginas en vuelo a la vez; el límite de tasa por
+  dominio de `tiendas.sesiones` sigue aplicando a cada consulta.
+- Las páginas se entregan en orden aunque lleguen desordenadas.
+- Reintentos con espera ante errores de red o 5xx; un 404 cuenta como página
+  vacía. Tras `paginas_vacias` vacías seguidas (en orden) se asume el final.
+  Una página que falló tras los reintentos no cuenta como vacía; tras
+  `FALLIDAS_SEGUIDAS` fallidas seguidas el crawl se detiene sin terminar.
+- Checkpoint opcional: cada página entregada se agrega a un JSONL; si el crawl
+  se corta, la próxima corrida entrega lo guardado sin descargarlo, vuelve a
+  pedir las páginas que fallaron y sigue desde la última guardada. Sólo se
+  borra cuando el crawl termina completo y sin páginas fallidas.
+- `recorrer` devuelve un `Recorrido`: se itera como (pagina, items) y al
+  terminar `completo` dice si el CSV se puede escribir.
+- `detener(items)` opcional: si devuelve True tras una página, el crawl se
+  da por terminado ahí (crawls incrementales, `tiendas.incremental`).
+"""
+
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from .sesiones import obtener_sesion
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+CONCURRENCIA = 5                                 # páginas en vuelo a la vez
+REINTENTOS = 5                                   # intentos por página
+ESPERA_REINTENTO = 5                             # segundos entre reintentos
+TIMEOUT = 15                                     # timeout de cada página
+PAGINAS_VACIAS = 1                               # vacías seguidas para dar por terminado
+FALLIDAS_SEGUIDAS = 5                            # fallidas seguidas para detener (la tienda no responde)
+MAX_PAGINAS = 20000                              # tope de seguridad
+
+def _descargar(url_pagina, parsear, pagina, headers, timeout, reintentos, espera, avisar):
+    """Items de la página; None si falló tras los reintentos o no se pudo parsear."""
+    url = url_pagina(pagina)
+    for intento in range(1, reintentos + 1):
+        try:
+            resp = obtener_sesion(url).get(url, headers=headers, timeout=timeout)
+            if resp.status_code == 404:
+                return []
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            avisar(f"⚠️ Página {pagina} (intento {intento}/{reintentos}): {e}")
+            if intento < reintentos:
+                time.sleep(espera)
+            continue
+        try:
+            return parsear(resp) or []
+        except Exception as e:
+            avisar(f"❌ Error parseando página {pagina}: {e}")
+            return None
+    avisar(f"❌ Página {pagina} falló {reintentos} veces. Se omite.")
+    return None
+
+# ----------------------------
+# Checkpoint
+# ----------------------------
+def _leer_checkpoint(ruta, origen):
+    """
+    Lo guardado de un crawl cortado con el mismo origen: ([(pagina, items)],
+    última página si el crawl llegó al final con páginas fallidas, o None).
+    """
+    if not ruta or not os.path.exists(ruta):
+        return [], None
+    paginas = []
+    fin = None
+    with open(ruta, "r", encoding="utf-8") as f:
+        for i, linea in enumerate(f):
+            try:
+                datos = json.loads(linea)
+            except ValueError:
+                continue                         # línea cortada por un corte (o el salto que se agrega al reanudar)
+            if i == 0:
+                if datos.get("origen") != origen:
+                    return [], None
+                continue
+            if "fin" in datos:
+                fin = datos["fin"]
+                continue
+            paginas.append((datos["pagina"], datos["items"]))
+    return paginas, fin
+
+class _Checkpoint:
+    def __init__(self, ruta, origen, previas):
+        self.ruta = ruta
+        self.archivo = None
+        if ruta:
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+            self.archivo = open(ruta, "a" if previas else "w", encoding="utf-8")
+            if not previas:
+                self.escribir({"origen": origen})
+            elif self.archivo.tell():
+                self.archivo.write("\n")         # por si la última línea quedó cortada
+
+    def escribir(self, datos):
+        if self.archivo:
+            self.archivo.write(json.dumps(datos, ensure_ascii=False) + "\n")
+            self.archivo.flush()
+
+    def cerrar(self, borrar=False):
+        if self.archivo:
+            self.archivo.close()
+            self.archivo = None
+            if borrar:
+                os.remove(self.ruta)
+
+# ----------------------------
+# Crawl
+# ----------------------------
+def _basta(detener, items):
+    return detener is not None and bool(items) and detener(items)
+
+class Recorrido:
+    """
+    Lo que devuelve `recorrer`: se itera como un generador de `(pagina, items)`
+    y, al terminar, dice si el catálogo quedó completo. Un CSV de catálogo sólo
+    debe escribirse con `completo` en True: si no, le faltan páginas.
+    - `completo`: se llegó al final del catálogo (o `detener`) sin páginas fallidas
+    - `fallidas`: páginas que fallaron tras los reintentos
+    """
+
+    def __init__(self):
+        self.completo = False
+        self.fallidas = []
+        self._paginas = None
+
+    def __iter__(self):
+        return self._paginas
+
+    def close(self):
+        """Deja de iterar: cancela las descargas pendientes."""
+        self._paginas.close()
+
+def recorrer(url_pagina, parsear, **opciones):
+    """
+    Entrega `(pagina, items)` en orden de página (ver `Recorrido`). `items` es
+    None si la página falló: se omite y no cuenta para detectar el final. Si
+    hubo páginas fallidas el checkpoint no se borra y la próxima corrida vuelve
+    a pedir sólo esas. Si se deja de iterar, las descargas pendientes se cancelan.
+    """
+    recorrido = Recorrido()
+    recorrido._paginas = _paginas(recorrido, url_pagina, parsear, **opciones)
+    return recorrido
+
+def _paginas(recorrido, url_pagina, parsear, inicio=1, concurrencia=CONCURRENCIA, headers=None, timeout=TIMEOUT,
+             reintentos=REINTENTOS, espera=ESPERA_REINTENTO, paginas_vacias=PAGINAS_VACIAS,
+             max_paginas=MAX_PAGINAS, checkpoint=None, detener=None, avisar=print):
+    origen = url_pagina(inicio)
+    previas, fin = _leer_checkpoint(checkpoint, origen)
+    guardado = _Checkpoint(checkpoint, origen, previas)
+    listas = dict(previas)                       # página -> items, esperando su turno
+    guardadas = set(listas)
+    ultima = max(listas, default=inicio - 1)
+    faltantes = [p for p in range(inicio, ultima + 1) if p not in listas]
+    if fin is None:
+        por_pedir = itertools.chain(faltantes, range(ultima + 1, max_paginas + 1))
+    else:
+        por_pedir = iter(faltantes)              # el final ya se conoce: sólo las que fallaron
+    vacias = 0
+    fallidas = recorrido.fallidas
+    seguidas = 0                                 # páginas fallidas seguidas
+    siguiente = inicio
+    completo = False
+
+    if previas:
+        avisar(f"↩️ Reanudando desde el checkpoint: {len(previas)} páginas ya descargadas"
+               f"{f', se vuelven a pedir {len(faltantes)} que fallaron' if faltantes else ''}.")
+    ejecutor = ThreadPoolExecutor(max_workers=concurrencia, thread_name_prefix="crawler")
+    futuros = {}                                 # futuro -> página
+
+    def pedir():
+        while len(futuros) < concurrencia:
+            pagina = next(por_pedir, None)
+            if pagina is None:
+                return
+            futuro = ejecutor.submit(_descargar, url_pagina, parsear, pagina,
+                                     headers, timeout, reintentos, espera, avisar)
+            futuros[futuro] = pagina
+
+    try:
+        pedir()
+        while True:
+            while siguiente in listas:
+                items = listas.pop(siguiente)
+                if items is None:
+                    fallidas.append(siguiente)
+                    seguidas += 1
+                else:
+                    seguidas = 0
+                    if siguiente not in guardadas:
+                        guardado.escribir({"pagina": siguiente, "items": items})
+                    vacias = 0 if items else vacias + 1
+                # Se marca antes de entregar: si quien itera corta en la última página, igual quedó completo
+                final = items is not None and (vacias >= paginas_vacias or _basta(detener, items))
+                completo = recorrido.completo = final and not fallidas
+                if final and fallidas:
+                    guardado.escribir({"fin": siguiente})
+                    avisar(f"⚠️ {len(fallidas)} páginas fallaron ({', '.join(map(str, fallidas))}); "
+                           f"{'la próxima corrida las vuelve a pedir' if checkpoint else 'el catálogo quedó incompleto'}.")
+                yield siguiente, items
+                siguiente += 1
+                if final:
+                    return
+                if seguidas >= FALLIDAS_SEGUIDAS:
+                    avisar(f"❌ {seguidas} páginas seguidas fallaron; se detiene el crawl"
+                           f"{' (el checkpoint queda para seguir después)' if checkpoint else ''}.")
+                    return
+
+            if not futuros:
+                break
+            hechos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                listas[futuros.pop(futuro)] = futuro.result()
+            pedir()
+        completo = recorrido.completo = not fallidas
+        if fin is None:
+            avisar(f"⚠️ Límite de páginas alcanzado ({max_paginas}).")
+    finally:
+        # Sin esperar a las páginas en vuelo (pueden estar en sus reintentos)
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+        guardado.cerrar(borrar=completo)
+
+def recorrer_todo(url_pagina, parsear, **opciones):
+    """Todos los items del catálogo en orden, en una lista."""
+    todos = []
+    for _, items in recorrer(url_pagina, parsear, **opciones):
+        todos.extend(items or [])
+    return todos
@@ -1,13 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("div.productCard__card")
 
 # --- Función de búsqueda para GameOfMagicSingles ---
 def buscar(nombre_producto):
@@ -16,16 +15,15 @@ def buscar(nombre_producto):
         "url": "https://gameofmagicsingles.cl/search?page=1&q={}"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
         productos = soup.select("div.productCard__card")
 
         encontrado = False
-        palabras_busqueda = re.findall(r'\w+', nombre_producto.lower())
+        buscada = consulta(nombre_producto)
 
         for producto in productos:
             titulo_tag = producto.select_one("p.productCard__title a")
@@ -33,9 +31,7 @@ def buscar(nombre_producto):
                 continue
 
             nombre = titulo_tag.get_text(strip=True)
-            palabras_titulo = re.findall(r'\w+', nombre.lower())
-
-            if all(palabra in palabras_titulo for palabra in palabras_busqueda):
+            if buscada.coincide(nombre):
                 # Revisar stock de variantes
                 variantes = producto.select("li.productChip")
                 precios_disponibles_foil = []
@@ -57,50 +53,36 @@ def buscar(nombre_producto):
 
                 # Si hay foil disponible, usar el más barato
                 if precios_disponibles_foil:
-                    precio_final = f"${min(precios_disponibles_foil):,} CLP"
+                    precio_final, foil = min(precios_disponibles_foil), True
                 elif precios_disponibles_normal:
-                    precio_final = f"${min(precios_disponibles_normal):,} CLP"
+                    precio_final, foil = min(precios_disponibles_normal), False
                 else:
                     # No hay stock en ninguna variante
                     continue
 
                 url_producto = "https://gameofmagicsingles.cl" + titulo_tag['href']
-                resultado = {
-                    "Tienda": tienda['nombre'],
-                    "Disponible": "Sí",
-                    "Producto": nombre,
-                    "Precio": precio_final,
-                    "URL": url_producto
-                }
+                resultado = Resultado(tienda['nombre'], True, nombre, precio_final, url_producto, foil)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": tienda['nombre'],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda['nombre'],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
-
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
+
     return resultado
 
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "GameOfMagicSingles",
-    "func": buscar
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("GameOfMagicSingles", "https://gameofmagicsingles.cl", respaldo=buscar, preferir_foil=True),
+    "func_lote": shopify.crear_buscador_lote("GameOfMagicSingles", "https://gameofmagicsingles.cl", respaldo=buscar, preferir_foil=True),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
 
 # --- Ejemplo de uso ---
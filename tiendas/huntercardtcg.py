@@ -1,13 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+from . import salud
+from . import woocommerce
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("li.thunk-woo-product-list")
 
 def buscar(nombre_producto):
     tienda = {
@@ -15,58 +14,40 @@ def buscar(nombre_producto):
         "url": "https://www.huntercardtcg.com/?s={}&post_type=product"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    buscada = consulta(nombre_producto)
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"}, allow_redirects=True)
+        response = obtener_sesion(url_busqueda).get(url_busqueda, allow_redirects=True)
         final_url = response.url  # URL final tras redirección
-        soup = BeautifulSoup(response.content, 'html.parser')
 
         # --- CASO 1: Página individual de producto (cuando hay solo un resultado) ---
         if "producto/" in final_url:
+            soup = crear_sopa(response.content)
             titulo_tag = soup.select_one("h1.product_title.entry-title")
             precio_tag = soup.select_one("p.price .woocommerce-Price-amount")
             stock_tag = soup.select_one("p.stock")
 
-            if titulo_tag and nombre_producto.lower() in titulo_tag.get_text(strip=True).lower():
+            if titulo_tag and buscada.contiene(titulo_tag.get_text(strip=True)):
                 titulo = titulo_tag.get_text(strip=True)
                 precio = precio_tag.get_text(strip=True) if precio_tag else "-"
                 stock_text = stock_tag.get_text(strip=True).lower() if stock_tag else ""
 
-                disponible = "Sí" if "disponible" in stock_text or "stock" in stock_text else "No"
+                disponible = "disponible" in stock_text or "stock" in stock_text
 
-                resultado = {
-                    "Tienda": tienda["nombre"],
-                    "Disponible": disponible,
-                    "Producto": titulo,
-                    "Precio": precio,
-                    "URL": final_url
-                }
+                resultado = Resultado(tienda["nombre"], disponible, titulo, precio, final_url)
             else:
                 # Producto encontrado no coincide con la búsqueda
-                resultado = {
-                    "Tienda": tienda["nombre"],
-                    "Disponible": "No",
-                    "Producto": nombre_producto,
-                    "Precio": "-",
-                    "URL": url_busqueda
-                }
+                resultado = Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
 
         # --- CASO 2: Página de resultados múltiples ---
         else:
+            soup = crear_sopa(response.content, CONTENEDORES)
             productos = soup.select("li.thunk-woo-product-list")
 
             if not productos:
-                resultado = {
-                    "Tienda": tienda["nombre"],
-                    "Disponible": "No",
-                    "Producto": nombre_producto,
-                    "Precio": "-",
-                    "URL": url_busqueda
-                }
+                resultado = Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
             else:
-                nombre_normalizado = nombre_producto.lower()
                 coincidencias = []
 
                 for p in productos:
@@ -74,21 +55,12 @@ def buscar(nombre_producto):
                     if not titulo_tag:
                         continue
 
-                    titulo = titulo_tag.get_text(strip=True)
-                    titulo_normalizado = titulo.lower()
-
                     # Aceptar coincidencias si el nombre buscado aparece en el título
-                    if nombre_normalizado in titulo_normalizado:
+                    if buscada.contiene(titulo_tag.get_text(strip=True)):
                         coincidencias.append(p)
 
                 if not coincidencias:
-                    resultado = {
-                        "Tienda": tienda["nombre"],
-                        "Disponible": "No",
-                        "Producto": nombre_producto,
-                        "Precio": "-",
-                        "URL": url_busqueda
-                    }
+                    resultado = Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
                 else:
                     # Priorizar Foil si existe
                     producto_encontrado = None
@@ -105,29 +77,21 @@ def buscar(nombre_producto):
                     precio = precio_tag.get_text(strip=True) if precio_tag else "-"
                     url_prod = producto_encontrado.select_one("a.woocommerce-LoopProduct-link")["href"]
 
-                    resultado = {
-                        "Tienda": tienda["nombre"],
-                        "Disponible": "Sí",
-                        "Producto": titulo,
-                        "Precio": precio,
-                        "URL": url_prod
-                    }
+                    resultado = Resultado(tienda["nombre"], True, titulo, precio, url_prod)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda["nombre"],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
-
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
+
     return resultado
 
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "HunterCardTCG",
-    "func": buscar
+    # Store API de WooCommerce (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": woocommerce.crear_buscador("HunterCardTCG", "https://www.huntercardtcg.com", respaldo=buscar, preferir_foil=True),
+    "func_lote": woocommerce.crear_buscador_lote("HunterCardTCG", "https://www.huntercardtcg.com", respaldo=buscar, preferir_foil=True),
+    "lote": woocommerce.TAMANO_LOTE,
+    "plataforma": "woocommerce",
 }
@@ -0,0 +1,118 @@
+"""
+Crawls incrementales: bajar sólo lo que cambió desde el snapshot anterior.
+
+Con --incremental los List_* recorren el catálogo ordenado por fecha de
+modificación (lo más nuevo primero), comparan cada página con el último CSV
+de la tienda (`catalogo.snapshot_mas_reciente`) y paran apenas llegan a
+productos que no cambiaron; el resto se copia del snapshot anterior.
+
+El snapshot es el catálogo publicado, con las publicaciones agotadas
+incluidas, igual que los crawls completos (`tiendas.catalogo` sólo lo usa para
+responder "No" a lo que no está publicado; el stock se ve en vivo). El CSV no
+trae stock, así que agotarse o volver a tener stock no cambia el snapshot y
+no cuenta como cambio.
+
+- Shopify: `products.json` trae `updated_at`, que se guarda en el CSV. Un
+  producto no cambió si su `updated_at` no es más nuevo que el máximo del
+  snapshot anterior.
+- WooCommerce: la Store API acepta `orderby=modified&order=desc` pero no trae
+  la fecha; "sin cambios" es mismo precio que en el snapshot, y se piden
+  `PAGINAS_SIN_CAMBIOS` páginas seguidas sin cambios antes de parar. Es una
+  heurística: un producto editado sin cambiar precio (p. ej. sólo el stock)
+  también sube al principio, y páginas llenas de esos pueden hacer parar antes
+  de llegar a un cambio de precio más antiguo. Ese cambio se ve en el próximo
+  crawl completo.
+
+Si las fechas no vienen en orden decreciente (la tienda ignoró el orden) no se
+para antes: el crawl sigue completo y sólo se informa lo que cambió
+(`ordenado` queda en False para avisarlo). Un crawl incremental no ve los
+productos que la tienda borró, así que conviene uno completo de vez en cuando.
+"""
+
+import csv
+from datetime import datetime, timezone
+
+from . import catalogo
+from .resultado import precio_a_entero
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+PAGINAS_SIN_CAMBIOS = 2                          # páginas seguidas sin cambios para parar (sin fechas)
+
+def fecha_utc(texto):
+    """'2024-05-01T10:00:00-04:00' -> '2024-05-01T14:00:00Z', comparable como texto (sin líos de horario de verano)."""
+    try:
+        fecha = datetime.fromisoformat(texto)
+    except (TypeError, ValueError):
+        return ""
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def cargar_snapshot(tienda):
+    """(ruta, filas) del último CSV de la tienda; (None, []) si no hay crawl anterior."""
+    ruta = catalogo.snapshot_mas_reciente(tienda)
+    if ruta is None:
+        return None, []
+    with open(ruta, newline="", encoding="utf-8") as f:
+        return ruta, list(csv.DictReader(f))
+
+class Cambios:
+    """
+    Compara cada página con el snapshot anterior. Se pasa como `detener` a
+    `crawler.recorrer`: devuelve True cuando ya no hace falta seguir bajando.
+    """
+
+    def __init__(self, filas_previas, clave="url", fecha=None, paginas_sin_cambios=None):
+        self.clave = clave
+        self.fecha = fecha
+        self.previas = {f[clave]: f for f in filas_previas if f.get(clave)}
+        self.corte = max((f.get(fecha) or "" for f in filas_previas), default="") if fecha else None
+        if paginas_sin_cambios is None:
+            paginas_sin_cambios = 1 if fecha else PAGINAS_SIN_CAMBIOS
+        self.paginas_sin_cambios = paginas_sin_cambios
+        self.vistas = {}                         # clave -> fila de este crawl, en orden
+        self.nuevas = 0
+        self.cambiadas = 0
+        self.ordenado = True
+        self._ultima_fecha = None
+        self._sin_cambios = 0
+
+    def _cambio(self, fila, previa):
+        if self.fecha:
+            return (fila.get(self.fecha) or "") > self.corte
+        return precio_a_entero(fila.get("precio")) != precio_a_entero(previa.get("precio"))
+
+    def __call__(self, filas):
+        hubo_cambios = False
+        for fila in filas:
+            clave = fila.get(self.clave)
+            if not clave:
+                continue
+            if self.fecha:
+                fecha = fila.get(self.fecha) or ""
+                if self._ultima_fecha is not None and fecha > self._ultima_fecha:
+                    self.ordenado = False        # la tienda no respeta el orden: no se para antes
+                self._ultima_fecha = fecha
+            previa = self.previas.get(clave)
+            if previa is None:
+                self.nuevas += 1
+                hubo_cambios = True
+            elif self._cambio(fila, previa):
+                self.cambiadas += 1
+                hubo_cambios = True
+            self.vistas[clave] = fila
+        self._sin_cambios = 0 if hubo_cambios else self._sin_cambios + 1
+        return self.ordenado and self._sin_cambios >= self.paginas_sin_cambios
+
+    def fusionar(self):
+        """Snapshot nuevo: lo bajado ahora y luego lo anterior que no se volvió a ver."""
+        filas = list(self.vistas.values())
+        filas.extend(f for clave, f in self.previas.items() if clave not in self.vistas)
+        return filas
+
+    def resumen(self):
+        copiadas = sum(1 for clave in self.previas if clave not in self.vistas)
+        return (f"{len(self.vistas)} productos revisados: {self.nuevas} nuevos, {self.cambiadas} con cambios; "
+                f"{copiadas} copiados del snapshot anterior")
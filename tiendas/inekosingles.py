@@ -1,28 +1,28 @@
-import requests
-from bs4 import BeautifulSoup
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("li.grid__item")
 
 # --- Función de búsqueda para Inekosingles ---
 def buscar(nombre_producto):
     base_url = "https://inekosingles.com"
     url_busqueda = f"{base_url}/search?q={nombre_producto.replace(' ', '+')}"
-    resultado = {}
+    buscada = consulta(nombre_producto)
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en Inekosingles...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
 
         productos = soup.select("li.grid__item")
         encontrado = False
         precio_menor = None
-        mejor_producto = {}
+        mejor_producto = None
         hay_disponible = False
 
         for prod in productos:
@@ -44,64 +44,39 @@ def buscar(nombre_producto):
 
             # Verificar disponibilidad (robusto, ignora mayúsculas y espacios)
             agotado_tag = prod.select_one(".badge, .price--sold-out")
-            disponible = "Sí"
-            if agotado_tag and "agotado" in agotado_tag.get_text(strip=True).lower():
-                disponible = "No"
+            disponible = not (agotado_tag and "agotado" in agotado_tag.get_text(strip=True).lower())
 
             # Solo productos que coincidan en nombre
-            if nombre_producto.lower() in nombre.lower():
+            if buscada.contiene(nombre):
                 encontrado = True
-                if disponible == "Sí":
+                if disponible:
                     hay_disponible = True
                     # Guardar el de precio más bajo
                     if precio_valor is not None:
                         if precio_menor is None or precio_valor < precio_menor:
                             precio_menor = precio_valor
-                            mejor_producto = {
-                                "Tienda": "Inekosingles",
-                                "Disponible": disponible,
-                                "Producto": nombre,
-                                "Precio": precio,
-                                "URL": url_producto
-                            }
+                            mejor_producto = Resultado("Inekosingles", True, nombre, precio_valor, url_producto)
 
         # Resultado final
-        if encontrado:
-            if hay_disponible:
-                resultado = mejor_producto
-            else:
-                resultado = {
-                    "Tienda": "Inekosingles",
-                    "Disponible": "No",
-                    "Producto": nombre_producto,
-                    "Precio": "-",
-                    "URL": url_busqueda
-                }
+        if encontrado and hay_disponible and mejor_producto:
+            resultado = mejor_producto
         else:
-            resultado = {
-                "Tienda": "Inekosingles",
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible("Inekosingles", nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": "Inekosingles",
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible("Inekosingles", nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "Inekosingles",
-    "func": buscar
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("Inekosingles", "https://inekosingles.com", respaldo=buscar),
+    "func_lote": shopify.crear_buscador_lote("Inekosingles", "https://inekosingles.com", respaldo=buscar),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
 
 # --- Ejemplo de uso ---
@@ -0,0 +1,157 @@
+"""
+Límite de tasa compartido por dominio (búsquedas y crawlers List_*).
+
+- Token bucket por dominio: `tasa` consultas/segundo con ráfagas de `rafaga`.
+- Concurrencia AIMD: el número de consultas simultáneas sube de a poco mientras
+  la tienda responde bien y se divide a la mitad con cada 429/503.
+- `Retry-After`: si la tienda lo envía, el dominio completo queda en pausa ese
+  tiempo; si no, se usa un backoff exponencial.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+LIMITE_DEFECTO = {"tasa": 4.0, "rafaga": 8, "concurrencia": 4, "concurrencia_max": 16}
+
+# Ajustes por dominio (se mezclan sobre LIMITE_DEFECTO)
+LIMITES = {
+    "inekosingles.com": {"tasa": 2.0, "rafaga": 4},
+    "www.oasisgames.cl": {"tasa": 2.0, "rafaga": 4},
+    "bloodmoongames.cl": {"tasa": 3.0},
+}
+
+ACTIVO = True                                    # False = sin límites (replay local en benchmarks)
+BACKOFF_BASE = 2.0                               # segundos del primer backoff sin Retry-After
+BACKOFF_MAX = 120.0
+ESTADOS_LIMITE = (429, 503)
+
+# ----------------------------
+# Token bucket
+# ----------------------------
+class TokenBucket:
+    def __init__(self, tasa, rafaga):
+        self.tasa = tasa
+        self.capacidad = rafaga
+        self.tokens = float(rafaga)
+        self.ultimo = time.monotonic()
+        self.pausa_hasta = 0.0
+        self._lock = threading.Lock()
+
+    def tomar(self):
+        """Bloquea hasta que haya un token disponible (y no haya pausa activa)."""
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self.tokens = min(self.capacidad, self.tokens + (ahora - self.ultimo) * self.tasa)
+                self.ultimo = ahora
+                if ahora < self.pausa_hasta:
+                    espera = self.pausa_hasta - ahora
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    espera = (1 - self.tokens) / self.tasa
+            time.sleep(espera)
+
+    def pausar(self, segundos):
+        with self._lock:
+            self.pausa_hasta = max(self.pausa_hasta, time.monotonic() + segundos)
+            self.tokens = 0.0
+
+# ----------------------------
+# Concurrencia AIMD
+# ----------------------------
+class ConcurrenciaAIMD:
+    def __init__(self, inicial, maximo, minimo=1):
+        self.limite = float(inicial)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.en_uso = 0
+        self._cond = threading.Condition()
+
+    def entrar(self):
+        with self._cond:
+            while self.en_uso >= int(self.limite):
+                self._cond.wait()
+            self.en_uso += 1
+
+    def salir(self, exito=None):
+        """exito=True suma (aditivo), exito=False divide (multiplicativo), None no ajusta."""
+        with self._cond:
+            self.en_uso -= 1
+            if exito is True:
+                self.limite = min(self.maximo, self.limite + 1.0 / self.limite)
+            elif exito is False:
+                self.limite = max(self.minimo, self.limite / 2)
+            self._cond.notify_all()
+
+# ----------------------------
+# Limitador por dominio
+# ----------------------------
+class Limitador:
+    def __init__(self, config):
+        self.bucket = TokenBucket(config["tasa"], config["rafaga"])
+        self.concurrencia = ConcurrenciaAIMD(config["concurrencia"], config["concurrencia_max"])
+        self.penalizaciones = 0
+
+    def entrar(self):
+        self.concurrencia.entrar()
+        self.bucket.tomar()
+
+    def salir(self, exito=None):
+        self.concurrencia.salir(exito)
+
+    def limitado(self, retry_after=None):
+        """La tienda respondió 429/503: pausa el dominio y devuelve cuánto esperar."""
+        self.penalizaciones += 1
+        if retry_after is None:
+            retry_after = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.penalizaciones - 1))
+        self.bucket.pausar(retry_after)
+        return retry_after
+
+    def recuperado(self):
+        self.penalizaciones = 0
+
+class SinLimite:
+    """Limitador que no limita (ACTIVO = False)."""
+    def entrar(self): pass
+    def salir(self, exito=None): pass
+    def limitado(self, retry_after=None): return retry_after or 0.0
+    def recuperado(self): pass
+
+_limitadores = {}
+_lock = threading.Lock()
+_sin_limite = SinLimite()
+
+def obtener_limitador(dominio):
+    if not ACTIVO:
+        return _sin_limite
+    dominio = dominio.lower()
+    limitador = _limitadores.get(dominio)
+    if limitador is None:
+        with _lock:
+            limitador = _limitadores.get(dominio)
+            if limitador is None:
+                limitador = Limitador({**LIMITE_DEFECTO, **LIMITES.get(dominio, {})})
+                _limitadores[dominio] = limitador
+    return limitador
+
+def segundos_retry_after(valor):
+    """Convierte un header Retry-After (segundos o fecha HTTP) a segundos; None si no sirve."""
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        fecha = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
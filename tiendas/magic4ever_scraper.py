@@ -1,12 +1,13 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+from . import salud
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
+
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("table.productListingData")
 
 def buscar(nombre_producto):
     tienda = {
@@ -14,16 +15,17 @@ def buscar(nombre_producto):
         "url": "https://www.magic4ever.cl/advanced_search_result.php?keywords={}&x=0&y=0"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    buscada = consulta(nombre_producto)
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
 
+        # Sin resultados la página no trae la tabla: es un "No", no un fallo de la tienda
         tabla = soup.find("table", {"class": "productListingData"})
         if not tabla:
-            raise ValueError("No se encontró la tabla de productos")
+            return Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
 
         filas = tabla.find_all("tr")
         productos = []
@@ -46,54 +48,25 @@ def buscar(nombre_producto):
 
             # Revisar disponibilidad
             select_tag = celdas[4].find("select")
-            disponible = "No"
-            if select_tag:
-                if any(int(opt.get("value", "0")) > 0 for opt in select_tag.find_all("option")):
-                    disponible = "Sí"
+            disponible = bool(select_tag) and any(
+                int(opt.get("value", "0")) > 0 for opt in select_tag.find_all("option")
+            )
 
             # Filtrar por nombre buscado (coincidencia parcial, case insensitive)
-            if re.search(re.escape(nombre_producto), titulo, re.IGNORECASE):
-                productos.append({
-                    "Producto": titulo,
-                    "Precio": precio_num,
-                    "URL": url_prod,
-                    "Disponible": disponible
-                })
+            if buscada.contiene(titulo):
+                productos.append(Resultado(tienda["nombre"], disponible, titulo, precio_num, url_prod))
 
         if not productos:
-            resultado = {
-                "Tienda": tienda["nombre"],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
         else:
             # Elegir el más barato entre los disponibles
-            productos_disponibles = [p for p in productos if p["Disponible"] == "Sí"]
-            if productos_disponibles:
-                producto_final = min(productos_disponibles, key=lambda x: x["Precio"])
-            else:
-                producto_final = min(productos, key=lambda x: x["Precio"])
-
-            resultado = {
-                "Tienda": tienda["nombre"],
-                "Disponible": producto_final["Disponible"],
-                "Producto": producto_final["Producto"],
-                "Precio": f"${producto_final['Precio']:,}".replace(",", "."),
-                "URL": producto_final["URL"]
-            }
+            productos_disponibles = [p for p in productos if p.disponible]
+            resultado = min(productos_disponibles or productos, key=lambda x: x.precio)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda["nombre"],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
-
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda["nombre"], nombre_producto, url_busqueda)
+
     return resultado
 
 
@@ -0,0 +1,187 @@
+"""
+Matriz de precios carta × tienda (NumPy) para el modo de varias cartas.
+
+En vez de recorrer listas de resultados por carta, el lote queda en dos
+arreglos del mismo tamaño:
+- `precios`: int64 en CLP (0 donde no hay oferta)
+- `disponible`: máscara bool (hay stock y precio)
+
+Mejor precio, segundo mejor, diferencia entre ambos y cobertura por tienda
+salen de operaciones vectorizadas, así valorizar miles de cartas contra todas
+las tiendas toma milisegundos después de la descarga. buscador_cartas.py arma
+la matriz una vez por batch y de ella salen las filas de la Ficha
+(`mejores_resultados`) y la entrada de la canasta (`ofertas`, `mas_baratas`).
+Se exporta a CSV (sólo librería estándar) o Parquet (si está instalado pyarrow).
+
+NumPy es opcional: si no está instalado `NUMPY` queda en False y
+buscador_cartas.py sigue con el cálculo carta por carta.
+"""
+
+import csv
+
+try:
+    import numpy as np
+    NUMPY = True
+except ImportError:
+    NUMPY = False
+
+SIN_PRECIO = -1                                  # en las exportaciones, celdas sin oferta
+
+class MatrizPrecios:
+    """Precios de un lote de cartas en todas las tiendas."""
+
+    def __init__(self, cartas, tiendas, precios, disponible, origen=None):
+        self.cartas = cartas
+        self.tiendas = tiendas
+        self.precios = precios
+        self.disponible = disponible
+        self.origen = origen                     # índice del Resultado de cada celda en la lista de su carta
+
+    @classmethod
+    def desde_resultados(cls, resultados_por_carta, tiendas=None):
+        """`{carta: [Resultado]}` -> matriz; con varias ofertas de una tienda se usa la más barata."""
+        if not NUMPY:
+            raise ImportError("La matriz de precios necesita numpy (pip install numpy)")
+        cartas = list(resultados_por_carta)
+        if tiendas is None:
+            tiendas = list(dict.fromkeys(r.tienda for rs in resultados_por_carta.values() for r in rs))
+        columna = {t: j for j, t in enumerate(tiendas)}
+
+        filas, columnas, valores, indices = [], [], [], []
+        for i, resultados in enumerate(resultados_por_carta.values()):
+            for k, r in enumerate(resultados):
+                if r.disponible and r.precio is not None and r.tienda in columna:
+                    filas.append(i)
+                    columnas.append(columna[r.tienda])
+                    valores.append(r.precio)
+                    indices.append(k)
+        filas = np.array(filas, dtype=np.intp)
+        columnas = np.array(columnas, dtype=np.intp)
+        valores = np.array(valores, dtype=np.int64)
+        indices = np.array(indices, dtype=np.intp)
+
+        # Se llena con el máximo y se baja con minimum.at: la oferta más barata gana
+        tope = np.iinfo(np.int64).max
+        precios = np.full((len(cartas), len(tiendas)), tope, dtype=np.int64)
+        np.minimum.at(precios, (filas, columnas), valores)
+        # Entre las que empatan con el mínimo de su celda, la primera en llegar
+        gana = valores == precios[filas, columnas]
+        origen = np.full(precios.shape, np.iinfo(np.intp).max, dtype=np.intp)
+        np.minimum.at(origen, (filas[gana], columnas[gana]), indices[gana])
+        disponible = precios != tope
+        precios[~disponible] = 0
+        origen[~disponible] = -1
+        return cls(cartas, tiendas, precios, disponible, origen)
+
+    @classmethod
+    def apilar(cls, partes):
+        """Une las matrices de varios batches (mismas tiendas) en una sola."""
+        if not partes:
+            raise ValueError("No hay matrices que apilar")
+        origenes = [p.origen for p in partes]
+        return cls(
+            [carta for p in partes for carta in p.cartas],
+            partes[0].tiendas,
+            np.concatenate([p.precios for p in partes]),
+            np.concatenate([p.disponible for p in partes]),
+            np.concatenate(origenes) if all(o is not None for o in origenes) else None,
+        )
+
+    # ----------------------------
+    # Estadísticas vectorizadas
+    # ----------------------------
+    def _enmascarados(self):
+        return np.where(self.disponible, self.precios, np.iinfo(np.int64).max)
+
+    def mejores(self):
+        """(índice de tienda, precio) más barato por carta; -1 / 0 si ninguna tiene stock."""
+        if not self.tiendas:
+            return np.full(len(self.cartas), -1, dtype=np.intp), np.zeros(len(self.cartas), dtype=np.int64)
+        valores = self._enmascarados()
+        indice = valores.argmin(axis=1)
+        hay = self.disponible.any(axis=1)
+        precio = np.where(hay, valores[np.arange(len(self.cartas)), indice], 0)
+        return np.where(hay, indice, -1), precio
+
+    def segundos(self):
+        """Segundo mejor precio por carta (0 si hay menos de dos tiendas con stock)."""
+        valores = self._enmascarados()
+        if len(self.tiendas) < 2:
+            return np.zeros(len(self.cartas), dtype=np.int64)
+        dos = np.partition(valores, 1, axis=1)[:, 1]
+        return np.where(self.disponible.sum(axis=1) >= 2, dos, 0)
+
+    def diferencia(self):
+        """Segundo mejor - mejor: cuánto se pierde si la más barata se agota."""
+        _, mejor = self.mejores()
+        segundo = self.segundos()
+        return np.where(segundo > 0, segundo - mejor, 0)
+
+    def mejores_resultados(self, resultados_por_carta):
+        """El Resultado más barato de cada carta (None sin stock), para las filas de la Ficha."""
+        indice, _ = self.mejores()
+        origen = self.origen[np.arange(len(self.cartas)), np.maximum(indice, 0)] if self.tiendas else indice
+        return [resultados_por_carta[carta][k] if j >= 0 else None
+                for carta, j, k in zip(self.cartas, indice.tolist(), origen.tolist())]
+
+    def ofertas(self):
+        """{carta: {tienda: precio}} con las ofertas con stock (entrada de `canasta.optimizar`)."""
+        ofertas = {carta: {} for carta in self.cartas}
+        filas, columnas = np.nonzero(self.disponible)
+        for i, j, precio in zip(filas.tolist(), columnas.tolist(), self.precios[filas, columnas].tolist()):
+            ofertas[self.cartas[i]][self.tiendas[j]] = precio
+        return ofertas
+
+    def mas_baratas(self):
+        """{carta: (tienda, precio)} más barato de las cartas con stock (la compra carta por carta)."""
+        indice, precio = self.mejores()
+        return {carta: (self.tiendas[j], p)
+                for carta, j, p in zip(self.cartas, indice.tolist(), precio.tolist()) if j >= 0}
+
+    def cobertura(self):
+        """{tienda: cartas con stock} de la matriz."""
+        return dict(zip(self.tiendas, self.disponible.sum(axis=0).tolist()))
+
+    def resumen(self):
+        """Lista de dicts por carta: mejor tienda y precio, segundo precio, diferencia y tiendas con stock."""
+        indice, mejor = self.mejores()
+        segundo = self.segundos()
+        diferencia = self.diferencia()
+        con_stock = self.disponible.sum(axis=1)
+        return [
+            {
+                "carta": carta,
+                "tienda": self.tiendas[j] if j >= 0 else None,
+                "mejor": int(m) if j >= 0 else None,
+                "segundo": int(s) if s > 0 else None,
+                "diferencia": int(d),
+                "tiendas_con_stock": int(n),
+            }
+            for carta, j, m, s, d, n in zip(self.cartas, indice.tolist(), mejor.tolist(),
+                                            segundo.tolist(), diferencia.tolist(), con_stock.tolist())
+        ]
+
+    # ----------------------------
+    # Exportación
+    # ----------------------------
+    def exportar_csv(self, ruta):
+        """Una fila por carta y una columna por tienda; `SIN_PRECIO` donde no hay stock."""
+        celdas = np.where(self.disponible, self.precios, SIN_PRECIO).tolist()
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Nombre de la carta", *self.tiendas])
+            for carta, fila in zip(self.cartas, celdas):
+                writer.writerow([carta, *fila])
+
+    def exportar_parquet(self, ruta):
+        """Formato largo (carta, tienda, precio) con sólo las ofertas con stock. Necesita pyarrow."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        filas, columnas = np.nonzero(self.disponible)
+        tabla = pa.table({
+            "carta": pa.array(np.array(self.cartas, dtype=object)[filas].tolist(), type=pa.string()),
+            "tienda": pa.array(np.array(self.tiendas, dtype=object)[columnas].tolist(), type=pa.string()),
+            "precio": pa.array(self.precios[filas, columnas]),
+        })
+        pq.write_table(tabla, ruta)
@@ -0,0 +1,117 @@
+"""
+Lectura de listas de mazo (buscar.txt, exportaciones de Moxfield/Archidekt).
+
+Convierte cada línea en una entrada canónica (nombre, cantidad, foil, edición),
+con las ideas de `I_Have_it.extraer_nombre_carta` (el nombre va antes del
+primer paréntesis) y `Match_Mazo/limpiar_nombre.limpiar_nombre_estricto`
+(fuera cantidad "1x", etiquetas [..] y ^..^, marcas *F* / *E*, líneas de
+Maybeboard):
+
+    "1 Sephiroth, Planet's Heir (FIN) 553 *F*"
+        -> Entrada("Sephiroth, Planet's Heir", cantidad=1, foil=True, edicion="FIN", numero="553")
+    "Pitiless Plunderer" -> Entrada("Pitiless Plunderer", cantidad=1)
+
+`consultas(entradas)` entrega cada carta distinta una sola vez (sin importar
+mayúsculas, acentos, edición ni foil), para no repetir la búsqueda en todas
+las tiendas por líneas duplicadas o escritas distinto.
+"""
+
+import re
+
+from .coincidencia import normalizar
+
+# "4x Bolt" o "4 Bolt" (hasta 99 sin x: "1996 World Champion" es un nombre)
+_RE_CANTIDAD = re.compile(r"^\s*(?:(\d+)[xX]|(\d{1,2}))\s+")
+_RE_EDICION = re.compile(r"\(([A-Za-z0-9]{2,6})\)\s*([A-Za-z0-9\-★]+)?")
+_RE_ETIQUETAS = re.compile(r"\[.*?\]|\^.*?\^")
+_RE_FOIL = re.compile(r"\*([FE])\*")
+_RE_ESPACIOS = re.compile(r"\s+")
+_RE_CONTEO = re.compile(r"\s*\(\d+\)\s*$")       # "Sideboard (15)"
+
+# Encabezados de sección que traen algunas exportaciones
+SECCIONES = {"deck", "mazo", "commander", "comandante", "sideboard", "companion", "maybeboard", "tokens"}
+
+class Entrada:
+    """Una carta del mazo."""
+    __slots__ = ("nombre", "cantidad", "foil", "edicion", "numero")
+
+    def __init__(self, nombre, cantidad=1, foil=False, edicion=None, numero=None):
+        self.nombre = nombre
+        self.cantidad = cantidad
+        self.foil = foil
+        self.edicion = edicion
+        self.numero = numero
+
+    @property
+    def clave(self):
+        """Identidad de la búsqueda: la misma carta con otra edición o foil se busca una vez."""
+        return normalizar(self.nombre)
+
+    def __repr__(self):
+        extra = "".join([", foil=True" if self.foil else "",
+                         f", edicion={self.edicion!r}" if self.edicion else "",
+                         f", numero={self.numero!r}" if self.numero else ""])
+        return f"Entrada({self.nombre!r}, cantidad={self.cantidad}{extra})"
+
+def leer_linea(linea):
+    """Entrada de una línea; None si es vacía, comentario, encabezado o Maybeboard."""
+    linea = linea.strip()
+    if not linea or linea.startswith(("//", "#")) or "[Maybeboard" in linea:
+        return None
+    if _RE_CONTEO.sub("", linea).rstrip(":").strip().lower() in SECCIONES:
+        return None
+
+    cantidad = 1
+    m = _RE_CANTIDAD.match(linea)
+    if m:
+        cantidad = int(m.group(1) or m.group(2))
+        linea = linea[m.end():]
+
+    foil = bool(_RE_FOIL.search(linea))
+    linea = _RE_ETIQUETAS.sub("", _RE_FOIL.sub("", linea))
+
+    edicion = numero = None
+    m = _RE_EDICION.search(linea)
+    if m:
+        edicion = m.group(1).upper()
+        numero = m.group(2)
+        linea = linea[:m.start()]                # el nombre va antes de la edición
+
+    nombre = _RE_ESPACIOS.sub(" ", linea).strip()
+    if not nombre or cantidad <= 0:
+        return None
+    return Entrada(nombre, cantidad, foil, edicion, numero)
+
+def leer_lineas(lineas):
+    """Entradas de un mazo; las líneas repetidas (misma carta, edición y foil) suman cantidad."""
+    entradas = {}
+    for linea in lineas:
+        entrada = leer_linea(linea)
+        if entrada is None:
+            continue
+        clave = (entrada.clave, entrada.foil, entrada.edicion)
+        if clave in entradas:
+            entradas[clave].cantidad += entrada.cantidad
+        else:
+            entradas[clave] = entrada
+    return list(entradas.values())
+
+def leer_archivo(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        return leer_lineas(f)
+
+def consultas(entradas):
+    """Nombres a buscar, cada carta distinta una vez, en el orden del mazo."""
+    vistos = {}
+    for entrada in entradas:
+        vistos.setdefault(entrada.clave, entrada.nombre)
+    return list(vistos.values())
+
+def cantidades(entradas):
+    """{nombre a buscar: copias totales} (suma ediciones y foil de la misma carta)."""
+    nombres = {}
+    totales = {}
+    for entrada in entradas:
+        nombre = nombres.setdefault(entrada.clave, entrada.nombre)
+        totales[nombre] = totales.get(nombre, 0) + entrada.cantidad
+    return totales
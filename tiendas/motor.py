@@ -0,0 +1,391 @@
+"""
+Motor de búsqueda asíncrono para los adaptadores de `tiendas`.
+
+- Un único event loop compartido que corre en un hilo de fondo.
+- Contrato por tienda: `buscar_async(tienda, nombre_producto)`. Si la metadata
+  trae `"func_async"` (una corutina) se usa directamente; si no, la función
+  bloqueante `"func"` se ejecuta en un pool de hilos compartido.
+- `buscar_varias` deja en vuelo todos los pares (carta, tienda) a la vez, con un
+  tope global `MAX_EN_VUELO`, así el tiempo total se acerca a la latencia de la
+  tienda más lenta en vez de sumarse carta por carta.
+- `buscar_en_orden` es el planificador global del modo multi-carta: envía todos
+  los pares de entrada, limita la concurrencia por tienda (`LIMITE_POR_TIENDA`
+  o `"concurrencia"` en la metadata) y entrega cada carta apenas termina, en el
+  orden original, sin que una tienda lenta frene a las rápidas.
+- Antes de consultar una tienda se revisa su catálogo crawleado si está fresco
+  (`tiendas.catalogo`) y luego el caché persistente (`tiendas.cache`, leído y
+  escrito en el pool de hilos para no frenar el loop). Con una
+  bitácora abierta (`tiendas.bitacora`) cada resultado queda anotado en disco y
+  al reanudar los pares (carta, tienda) ya anotados no se vuelven a buscar.
+- `buscar_en_tiendas(carta, plazo=3)` devuelve lo que llegó dentro del plazo;
+  las tiendas que no alcanzaron quedan como "pendiente" y su búsqueda sigue en
+  segundo plano hasta guardar en el caché, así la próxima consulta ya la tiene.
+  Cada consulta HTTP lleva además timeouts de conexión/lectura (`tiendas.sesiones`).
+- `buscar_en_vivo(carta)` entrega cada tienda apenas responde, con los segundos
+  transcurridos, para mostrar resultados sin esperar a la más lenta.
+  `buscar_a_medida(cartas)` hace lo mismo con todas las cartas de un lote a la
+  vez, entregando cada par (carta, tienda) apenas termina (modo no interactivo).
+- Tiendas con `"func_lote"` en la metadata: las consultas que llegan dentro de
+  `VENTANA_LOTE` se juntan (hasta `"lote"` cartas) y se mandan en una sola
+  llamada `func_lote(cartas) -> {carta: resultado}`.
+- Circuit breaker por tienda (`tiendas.salud`): una tienda que falla varias
+  veces seguidas se salta y sus resultados vuelven como "caída" (sin pagar
+  su timeout en cada carta) hasta que una consulta de prueba responda bien.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import bitacora
+from . import cache
+from . import catalogo
+from . import salud
+from . import tiendas as TIENDAS
+from .colores import Colores
+from .resultado import Resultado
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+MAX_EN_VUELO = 256                               # pares (carta, tienda) simultáneos
+LIMITE_POR_TIENDA = 4                            # consultas simultáneas a una misma tienda
+VENTANA_LOTE = 0.02                              # segundos que se esperan para juntar un lote
+TAMANO_LOTE = 50                                 # cartas por lote si la metadata no trae "lote"
+
+_loop = None
+_loop_lock = threading.Lock()
+_semaforo = None
+_semaforos_tienda = {}
+_en_vuelo = {}                                   # (tienda, consulta) -> Task todavía en curso
+_agrupadores = {}
+_ejecutor = ThreadPoolExecutor(max_workers=MAX_EN_VUELO, thread_name_prefix="tienda")
+
+def configurar(max_en_vuelo=None):
+    """
+    Cambia el tope global de pares en vuelo; llamar antes de la primera
+    búsqueda. El pool de hilos se rehace del mismo tamaño: si no, un tope
+    mayor que el pool quedaría limitado por sus hilos en silencio.
+    """
+    global MAX_EN_VUELO, _semaforo, _ejecutor
+    if max_en_vuelo is not None:
+        if max_en_vuelo <= 0:
+            raise ValueError("La concurrencia debe ser mayor que 0")
+        MAX_EN_VUELO = max_en_vuelo
+        _semaforo = None
+        anterior = _ejecutor
+        _ejecutor = ThreadPoolExecutor(max_workers=MAX_EN_VUELO, thread_name_prefix="tienda")
+        anterior.shutdown(wait=False)
+
+# ----------------------------
+# Event loop compartido
+# ----------------------------
+def obtener_loop():
+    """Devuelve el event loop compartido, creándolo (y su hilo) la primera vez."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            hilo = threading.Thread(target=_loop.run_forever, name="motor-tiendas", daemon=True)
+            hilo.start()
+    return _loop
+
+def ejecutar(corutina):
+    """Corre una corutina en el loop compartido y espera su resultado."""
+    return asyncio.run_coroutine_threadsafe(corutina, obtener_loop()).result()
+
+def _obtener_semaforo():
+    # Se crea dentro del loop compartido para quedar ligado a él
+    global _semaforo
+    if _semaforo is None:
+        _semaforo = asyncio.Semaphore(MAX_EN_VUELO)
+    return _semaforo
+
+def _obtener_semaforo_tienda(tienda):
+    semaforo = _semaforos_tienda.get(tienda["nombre"])
+    if semaforo is None:
+        semaforo = asyncio.Semaphore(tienda.get("concurrencia", LIMITE_POR_TIENDA))
+        _semaforos_tienda[tienda["nombre"]] = semaforo
+    return semaforo
+
+# ----------------------------
+# Lotes por tienda
+# ----------------------------
+class Agrupador:
+    """Junta las consultas que llegan casi a la vez a una tienda y las manda en lotes."""
+
+    def __init__(self, tienda):
+        self.tienda = tienda
+        self.tamano = tienda.get("lote", TAMANO_LOTE)
+        self.pendientes = []                     # (carta, futuro)
+        self.programado = False
+
+    async def pedir(self, carta):
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self.pendientes.append((carta, futuro))
+        if len(self.pendientes) >= self.tamano:
+            self.despachar()
+        elif not self.programado:
+            self.programado = True
+            loop.call_later(VENTANA_LOTE, self.despachar)
+        return await futuro
+
+    def despachar(self):
+        self.programado = False
+        while self.pendientes:
+            lote, self.pendientes = self.pendientes[:self.tamano], self.pendientes[self.tamano:]
+            asyncio.ensure_future(self.ejecutar(lote))
+
+    async def ejecutar(self, lote):
+        cartas = list(dict.fromkeys(carta for carta, _ in lote))
+        circuito = salud.circuito(self.tienda["nombre"])
+        loop = asyncio.get_running_loop()
+        async with _obtener_semaforo_tienda(self.tienda), _obtener_semaforo():
+            if not circuito.permitir(len(cartas)):
+                resultados = {carta: Resultado.tienda_caida(self.tienda["nombre"], carta) for carta in cartas}
+            else:
+                inicio = time.perf_counter()
+                try:
+                    resultados, fallos = await loop.run_in_executor(_ejecutor, _consultar, self.tienda["func_lote"], cartas)
+                except asyncio.CancelledError:
+                    circuito.soltar()
+                    raise
+                except Exception as e:
+                    circuito.registrar(False, time.perf_counter() - inicio)
+                    for _, futuro in lote:
+                        if not futuro.done():
+                            futuro.set_exception(e)
+                    return
+                exito = not fallos or any(r.disponible for r in resultados.values())
+                circuito.registrar(exito, time.perf_counter() - inicio)
+                if fallos:
+                    resultados = {carta: _sin_respuesta(r, carta) for carta, r in resultados.items()}
+        for carta, futuro in lote:
+            if not futuro.done():
+                futuro.set_result(resultados[carta])
+
+def _obtener_agrupador(tienda):
+    agrupador = _agrupadores.get(tienda["nombre"])
+    if agrupador is None:
+        agrupador = Agrupador(tienda)
+        _agrupadores[tienda["nombre"]] = agrupador
+    return agrupador
+
+# ----------------------------
+# Salud de la tienda
+# ----------------------------
+def _consultar(func, argumento):
+    """Corre un adaptador bloqueante y devuelve `(resultado, fallos HTTP que ocultó)`."""
+    with salud.en_tienda() as registro:
+        return func(argumento), registro.fallos
+
+def _sin_respuesta(resultado, carta):
+    """Un "No" obtenido mientras la tienda fallaba no es un "No": se marca como caída."""
+    if resultado.disponible:
+        return resultado
+    return Resultado.tienda_caida(resultado.tienda, carta)
+
+# ----------------------------
+# Contrato async por tienda
+# ----------------------------
+async def buscar_async(tienda, nombre_producto):
+    """Busca `nombre_producto` en una tienda sin bloquear el loop."""
+    previo = bitacora.leer(tienda["nombre"], nombre_producto)
+    if previo is not None:
+        return previo
+    resultado = await _buscar_en_fuentes(tienda, nombre_producto)
+    bitacora.anotar(tienda["nombre"], nombre_producto, resultado)
+    return resultado
+
+async def _buscar_en_fuentes(tienda, nombre_producto):
+    """Catálogo crawleado, caché y, si no, la tienda misma."""
+    # Catálogo (la primera consulta carga el CSV) y SQLite fuera del hilo del loop
+    loop = asyncio.get_running_loop()
+    local = await loop.run_in_executor(_ejecutor, catalogo.buscar, tienda["nombre"], nombre_producto)
+    if local is not None:
+        return local
+
+    en_cache = await loop.run_in_executor(_ejecutor, cache.leer, tienda["nombre"], nombre_producto)
+    if en_cache is not None:
+        return en_cache
+
+    func_async = tienda.get("func_async")
+    if tienda.get("func_lote"):
+        resultado = await _obtener_agrupador(tienda).pedir(nombre_producto)
+    else:
+        circuito = salud.circuito(tienda["nombre"])
+        async with _obtener_semaforo_tienda(tienda), _obtener_semaforo():
+            if not circuito.permitir():
+                return Resultado.tienda_caida(tienda["nombre"], nombre_producto)
+            inicio = time.perf_counter()
+            try:
+                if func_async:
+                    resultado, fallos = await func_async(nombre_producto), 0
+                else:
+                    resultado, fallos = await loop.run_in_executor(_ejecutor, _consultar, tienda["func"], nombre_producto)
+            except asyncio.CancelledError:
+                circuito.soltar()
+                raise
+            except Exception:
+                circuito.registrar(False, time.perf_counter() - inicio)
+                raise
+            circuito.registrar(not fallos or resultado.disponible, time.perf_counter() - inicio)
+            if fallos:
+                resultado = _sin_respuesta(resultado, nombre_producto)
+    if not resultado.caida:
+        await loop.run_in_executor(_ejecutor, cache.guardar, tienda["nombre"], nombre_producto, resultado)
+    return resultado
+
+def _tarea_busqueda(tienda, nombre_producto):
+    """
+    Task de `buscar_async` compartida: si la misma búsqueda sigue en curso (por
+    ejemplo porque quedó pendiente en una consulta anterior) se reutiliza.
+    """
+    clave = (tienda["nombre"], cache.normalizar_consulta(nombre_producto))
+    tarea = _en_vuelo.get(clave)
+    if tarea is None:
+        tarea = asyncio.ensure_future(buscar_async(tienda, nombre_producto))
+        _en_vuelo[clave] = tarea
+        tarea.add_done_callback(lambda t: _terminar_tarea(clave, t))
+    return tarea
+
+def _terminar_tarea(clave, tarea):
+    _en_vuelo.pop(clave, None)
+    if not tarea.cancelled():
+        tarea.exception()                        # marca el error como leído aunque nadie esperara
+
+async def buscar_carta_async(carta, lista_tiendas=None, plazo=None):
+    """
+    Lanza la carta en todas las tiendas a la vez y junta los resultados. Con
+    `plazo` (segundos) no espera más que eso: las tiendas que faltan vuelven
+    como `Resultado.fuera_de_plazo` y su búsqueda sigue llenando el caché.
+    """
+    lista_tiendas = TIENDAS if lista_tiendas is None else lista_tiendas
+    tareas = [_tarea_busqueda(tienda, carta) for tienda in lista_tiendas]
+    try:
+        await asyncio.wait(tareas, timeout=plazo)
+    except asyncio.CancelledError:
+        if plazo is None:
+            for tarea in tareas:
+                tarea.cancel()
+        raise
+
+    resultados = (_resultado_de(tienda, tarea, carta) for tienda, tarea in zip(lista_tiendas, tareas))
+    return [r for r in resultados if r is not None]
+
+def _resultado_de(tienda, tarea, carta):
+    """Resultado de una Task de búsqueda; None si falló (el error se informa)."""
+    if not tarea.done() or tarea.cancelled():
+        return Resultado.fuera_de_plazo(tienda["nombre"], carta)
+    if tarea.exception() is not None:
+        print(f"{Colores.ROJO}Error al buscar en {tienda['nombre']}: {tarea.exception()}{Colores.RESET}")
+        return None
+    return tarea.result()
+
+async def buscar_carta_en_vivo_async(carta, entregar, lista_tiendas=None, plazo=None):
+    """Como `buscar_carta_async`, pero llama `entregar(resultado)` apenas responde cada tienda."""
+    lista_tiendas = TIENDAS if lista_tiendas is None else lista_tiendas
+    tareas = {_tarea_busqueda(tienda, carta): tienda for tienda in lista_tiendas}
+    loop = asyncio.get_running_loop()
+    fin = None if plazo is None else loop.time() + plazo
+    pendientes = set(tareas)
+    try:
+        while pendientes:
+            restante = None if fin is None else max(0.0, fin - loop.time())
+            hechas, pendientes = await asyncio.wait(pendientes, timeout=restante, return_when=asyncio.FIRST_COMPLETED)
+            if not hechas:
+                break                            # se acabó el plazo
+            for tarea in hechas:
+                resultado = _resultado_de(tareas[tarea], tarea, carta)
+                if resultado is not None:
+                    entregar(resultado)
+    except asyncio.CancelledError:
+        if plazo is None:
+            for tarea in pendientes:
+                tarea.cancel()
+        raise
+    for tarea in pendientes:
+        entregar(Resultado.fuera_de_plazo(tareas[tarea]["nombre"], carta))
+
+async def buscar_lote_en_vivo_async(cartas, entregar, lista_tiendas=None, plazo=None):
+    """Todas las cartas en vuelo a la vez; `entregar(carta, resultado)` apenas responde cada par."""
+    await asyncio.gather(*(
+        buscar_carta_en_vivo_async(carta, lambda r, carta=carta: entregar(carta, r), lista_tiendas, plazo)
+        for carta in cartas
+    ))
+
+async def buscar_varias_async(cartas, lista_tiendas=None):
+    """Todas las cartas en vuelo a la vez; devuelve una lista de resultados por carta, en orden."""
+    return await asyncio.gather(*(buscar_carta_async(carta, lista_tiendas) for carta in cartas))
+
+# ----------------------------
+# API síncrona para los scripts
+# ----------------------------
+def buscar_en_tiendas(carta, lista_tiendas=None, plazo=None):
+    return ejecutar(buscar_carta_async(carta, lista_tiendas, plazo))
+
+def buscar_en_vivo(carta, lista_tiendas=None, plazo=None):
+    """
+    Generador: entrega `(segundos, resultado)` por tienda en el orden en que
+    responden; `segundos` se mide desde que empezó la búsqueda.
+    """
+    cola = queue.Queue()
+    inicio = time.perf_counter()
+    futuro = asyncio.run_coroutine_threadsafe(
+        buscar_carta_en_vivo_async(carta, lambda r: cola.put((time.perf_counter() - inicio, r)), lista_tiendas, plazo),
+        obtener_loop(),
+    )
+    futuro.add_done_callback(lambda _: cola.put(None))
+    try:
+        while True:
+            item = cola.get()
+            if item is None:
+                break
+            yield item
+        futuro.result()
+    finally:
+        futuro.cancel()
+
+def buscar_a_medida(cartas, lista_tiendas=None, plazo=None):
+    """
+    Generador: entrega `(carta, resultado)` por cada par (carta, tienda) en el
+    orden en que terminan, mezclando las cartas del lote. Si se deja de
+    iterar, las búsquedas pendientes se cancelan.
+    """
+    cola = queue.Queue()
+    futuro = asyncio.run_coroutine_threadsafe(
+        buscar_lote_en_vivo_async(cartas, lambda carta, r: cola.put((carta, r)), lista_tiendas, plazo),
+        obtener_loop(),
+    )
+    futuro.add_done_callback(lambda _: cola.put(None))
+    try:
+        while True:
+            item = cola.get()
+            if item is None:
+                break
+            yield item
+        futuro.result()
+    finally:
+        futuro.cancel()
+
+def buscar_varias(cartas, lista_tiendas=None):
+    return ejecutar(buscar_varias_async(cartas, lista_tiendas))
+
+def buscar_en_orden(cartas, lista_tiendas=None, plazo=None):
+    """
+    Planificador global: envía todos los pares (carta, tienda) de una vez y va
+    entregando `(carta, resultados)` en el orden de entrada a medida que cada
+    carta termina. Si se deja de iterar, las búsquedas pendientes se cancelan.
+    Con `plazo`, cada carta espera a lo más eso desde que se envió.
+    """
+    loop = obtener_loop()
+    futuros = [asyncio.run_coroutine_threadsafe(buscar_carta_async(carta, lista_tiendas, plazo), loop) for carta in cartas]
+    try:
+        for carta, futuro in zip(cartas, futuros):
+            yield carta, futuro.result()
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
@@ -1,23 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("div.product-card-list2__details")
+CONTENEDORES_PRODUCTO = contenedores("select.product-form__variants", "span.product-price__price")
 
 # --- Función de búsqueda para OasisGames ---
 def buscar(nombre_producto):
     base_url = "https://www.oasisgames.cl"
     url_busqueda = base_url + "/search?q={}".format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en OasisGames...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
         
         # Buscar los productos
         productos = soup.select("div.product-card-list2__details.product-description a div.grid-view-item__title")
@@ -25,64 +25,49 @@ def buscar(nombre_producto):
         encontrado = False
         for producto_tag in productos:
             nombre = producto_tag.get_text(strip=True)
-            if nombre_producto.lower() in nombre.lower():
+            if consulta(nombre_producto).contiene(nombre):
                 link_tag = producto_tag.find_parent("a")
                 url_producto = link_tag['href'] if link_tag else url_busqueda
                 if url_producto.startswith("/"):
                     url_producto = base_url + url_producto
                 
                 # Obtener la página del producto para verificar stock
-                prod_resp = requests.get(url_producto, headers={"User-Agent": "Mozilla/5.0"})
-                prod_soup = BeautifulSoup(prod_resp.content, 'html.parser')
+                prod_resp = obtener_sesion(url_producto).get(url_producto)
+                prod_soup = crear_sopa(prod_resp.content, CONTENEDORES_PRODUCTO)
                 
                 opciones = prod_soup.select("select.product-form__variants option")
-                disponible = "No"
-                precio = "-"
+                disponible = False
+                precio = None
                 
                 for opcion in opciones:
                     stock = int(opcion.get("data-stock", "0"))
                     if stock > 0:
-                        disponible = "Sí"
+                        disponible = True
                         # Intentar tomar precio
                         precio_tag = prod_soup.select_one("span.product-price__price")
                         if precio_tag:
                             precio = precio_tag.get_text(strip=True)
                         break
                 
-                resultado = {
-                    "Tienda": "OasisGames",
-                    "Disponible": disponible,
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                resultado = Resultado("OasisGames", disponible, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": "OasisGames",
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible("OasisGames", nombre_producto, url_busqueda)
 
     except Exception as e:
-        print(f"\nError: {e}")
-        resultado = {
-            "Tienda": "OasisGames",
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible("OasisGames", nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "OasisGames",
-    "func": buscar
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("OasisGames", "https://www.oasisgames.cl", respaldo=buscar),
+    "func_lote": shopify.crear_buscador_lote("OasisGames", "https://www.oasisgames.cl", respaldo=buscar),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
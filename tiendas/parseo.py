@@ -0,0 +1,57 @@
+"""
+Capa de parseo rápido para los adaptadores de `tiendas`.
+
+En vez de construir con 'html.parser' el árbol de toda la página de búsqueda,
+`crear_sopa` usa lxml (C) y, si el adaptador lo indica, sólo construye los
+contenedores de producto (`SoupStrainer`), descartando cabecera, menús, footer
+y scripts. El resultado sigue siendo un BeautifulSoup, así que los `select`
+de cada tienda no cambian. Si lxml no está instalado o falla, se vuelve al
+camino anterior: BeautifulSoup completo con 'html.parser'.
+"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = None
+
+RAPIDO = True                                    # False = siempre el camino clásico (html.parser)
+
+def contenedores(*selectores, **attrs):
+    """
+    SoupStrainer para selectores simples 'tag.clase' (cualquiera de ellos).
+    La clase se compara palabra por palabra: bs4 >= 4.13 filtra con el atributo
+    sin separar, y `class_="grid__item"` no calzaría con "grid__item scroll-trigger".
+    """
+    nombres = []
+    clases = set()
+    for selector in selectores:
+        tag, _, clase = selector.partition(".")
+        if tag not in nombres:
+            nombres.append(tag)
+        if clase:
+            clases.add(clase)
+
+    def tiene_clase(valor):
+        if not valor:
+            return False
+        palabras = valor.split() if isinstance(valor, str) else valor
+        return not clases.isdisjoint(palabras)
+
+    if clases:
+        attrs["class"] = tiene_clase
+    return SoupStrainer(nombres, attrs=attrs)
+
+def crear_sopa(contenido, solo=None):
+    """
+    Parsea `contenido` (bytes o str). `solo` es un SoupStrainer (ver
+    `contenedores()`) con los bloques de producto; None parsea la página completa.
+    """
+    if RAPIDO and PARSER:
+        try:
+            return BeautifulSoup(contenido, PARSER, parse_only=solo)
+        except Exception:
+            pass
+    return BeautifulSoup(contenido, "html.parser")
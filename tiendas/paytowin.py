@@ -1,23 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("div.productCard__card")
 
 # --- Función de búsqueda para PayToWin ---
 def buscar(nombre_producto):
     base_url = "https://www.paytowin.cl"
     url_busqueda = f"{base_url}/search?page=1&q={nombre_producto.replace(' ', '%20')}"
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en PayToWin...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
 
         productos = soup.select("div.productCard__card")
         encontrado = False
@@ -29,7 +28,7 @@ def buscar(nombre_producto):
             nombre = titulo_tag.get_text(strip=True)
 
             # Hacemos match con la palabra buscada
-            if nombre_producto.lower() in nombre.lower():
+            if consulta(nombre_producto).contiene(nombre):
                 url_producto = titulo_tag['href']
                 if url_producto.startswith("/"):
                     url_producto = base_url + url_producto
@@ -38,46 +37,30 @@ def buscar(nombre_producto):
                 precio = precio_tag.get_text(strip=True) if precio_tag else "-"
 
                 # Comprobamos disponibilidad
-                disponible = "Sí"
                 boton_tag = prod.select_one("div.productCard__button")
-                if boton_tag and "Out of Stock" in boton_tag.get_text():
-                    disponible = "No"
+                disponible = not (boton_tag and "Out of Stock" in boton_tag.get_text())
 
-                resultado = {
-                    "Tienda": "PayToWin",
-                    "Disponible": disponible,
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                resultado = Resultado("PayToWin", disponible, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": "PayToWin",
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible("PayToWin", nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": "PayToWin",
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible("PayToWin", nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "PayToWin",
-    "func": buscar
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("PayToWin", "https://www.paytowin.cl", respaldo=buscar),
+    "func_lote": shopify.crear_buscador_lote("PayToWin", "https://www.paytowin.cl", respaldo=buscar),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
 
 # --- Ejemplo de uso ---
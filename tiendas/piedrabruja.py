@@ -1,12 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("div.product-item")
 
 # --- Función de búsqueda para PiedraBruja ---
 def buscar(nombre_producto):
@@ -15,55 +15,41 @@ def buscar(nombre_producto):
         "url": "https://piedrabruja.cl/search?type=product&q={}"
     }
     url_busqueda = tienda["url"].format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    buscada = consulta(nombre_producto)
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en {tienda['nombre']}...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
 
         productos = soup.select("div.product-item__info a.product-item__title")
         encontrado = False
 
         for producto_tag in productos:
             nombre = producto_tag.get_text(strip=True)
-            if nombre_producto.lower() in nombre.lower():
+            if buscada.contiene(nombre):
                 url_producto = "https://piedrabruja.cl" + producto_tag['href']
                 precio_tag = producto_tag.find_next("span", class_="price")
                 precio = precio_tag.get_text(strip=True) if precio_tag else "-"
-                resultado = {
-                    "Tienda": tienda['nombre'],
-                    "Disponible": "Sí",
-                    "Producto": nombre,
-                    "Precio": precio,
-                    "URL": url_producto
-                }
+                resultado = Resultado(tienda['nombre'], True, nombre, precio, url_producto)
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": tienda['nombre'],
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": tienda['nombre'],
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible(tienda['nombre'], nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
 # --- Metadata de la tienda ---
 metadata = {
     "nombre": "PiedraBruja",
-    "func": buscar
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("PiedraBruja", "https://piedrabruja.cl", respaldo=buscar),
+    "func_lote": shopify.crear_buscador_lote("PiedraBruja", "https://piedrabruja.cl", respaldo=buscar),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
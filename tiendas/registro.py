@@ -0,0 +1,148 @@
+"""
+Registro de tiendas con carga diferida.
+
+Cada tienda se declara aquí con lo que se sabe sin importar su adaptador:
+nombre, módulo, plataforma, URL base y capacidades. El módulo (y con él
+BeautifulSoup y el backend Shopify/WooCommerce) se importa recién cuando
+alguien pide algo de su `metadata`, por ejemplo `tienda["func"]` al
+consultarla. Si la respuesta sale del catálogo o del caché, el adaptador
+nunca se carga.
+
+- `Tienda` se comporta como el dict `metadata` del adaptador, así el motor y
+  los scripts la usan igual que antes (`tienda["nombre"]`, `tienda.get("func_lote")`).
+- `"limite"` entrega el límite de tasa efectivo del dominio (`tiendas.limites`).
+- `configurar(incluir, excluir)` deja en `tiendas` sólo las tiendas elegidas
+  (por nombre, módulo o plataforma: `"shopify"`, `"TCGMatch"`, ...).
+
+Para agregar una tienda: crear su módulo con `metadata` y sumarla a `REGISTRO`.
+"""
+
+import importlib
+import threading
+from collections.abc import Mapping
+from urllib.parse import urlsplit
+
+from .limites import LIMITE_DEFECTO, LIMITES
+
+# ----------------------------
+# Entrada del registro
+# ----------------------------
+class Tienda(Mapping):
+    """Tienda registrada; importa su adaptador la primera vez que se necesita."""
+
+    def __init__(self, nombre, modulo, plataforma, url_base, capacidades=()):
+        self.modulo = modulo
+        self.datos = {
+            "nombre": nombre,
+            "plataforma": plataforma,
+            "url_base": url_base,
+            "capacidades": frozenset(capacidades),
+        }
+        self._metadata = None
+        self._lock = threading.Lock()
+
+    @property
+    def metadata(self):
+        if self._metadata is None:
+            with self._lock:
+                if self._metadata is None:
+                    self._metadata = importlib.import_module(f"{__package__}.{self.modulo}").metadata
+        return self._metadata
+
+    @property
+    def cargada(self):
+        return self._metadata is not None
+
+    @property
+    def limite(self):
+        return {**LIMITE_DEFECTO, **LIMITES.get(urlsplit(self.datos["url_base"]).netloc, {})}
+
+    def __getitem__(self, clave):
+        if clave in self.datos:
+            return self.datos[clave]
+        if clave == "limite":
+            return self.limite
+        return self.metadata[clave]
+
+    def __iter__(self):
+        yield from self.datos
+        yield "limite"
+        yield from (k for k in self.metadata if k not in self.datos)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    # Identidad, no contenido: comparar no debe importar el adaptador
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"Tienda({self.datos['nombre']!r}, {self.datos['plataforma']!r}, cargada={self.cargada})"
+
+# ----------------------------
+# Tiendas conocidas
+# ----------------------------
+API = ("api_json", "lote")                       # backend JSON compartido, con consultas por lote
+
+REGISTRO = [
+    Tienda("BloodMoonGames", "bloodmoongames", "woocommerce", "https://bloodmoongames.cl", API),
+    Tienda("OasisGames", "oasisgames", "shopify", "https://www.oasisgames.cl", API),
+    Tienda("HunterCardTCG", "huntercardtcg", "woocommerce", "https://www.huntercardtcg.com", API),
+    Tienda("GameOfMagicSingles", "gameofmagicsingles", "shopify", "https://gameofmagicsingles.cl", API + ("foil",)),
+    Tienda("PiedraBruja", "piedrabruja", "shopify", "https://piedrabruja.cl", API),
+    Tienda("TiendaLaComarca", "tiendalacomarca", "shopify", "https://www.tiendalacomarca.cl", API),
+    Tienda("PayToWin", "paytowin", "shopify", "https://www.paytowin.cl", API),
+    Tienda("Rivendel El Concilio", "rivendelelconcilio", "jumpseller", "https://www.rivendelelconcilio.cl"),
+    Tienda("Magic4Ever", "magic4ever_scraper", "oscommerce", "https://www.magic4ever.cl"),
+    Tienda("Cartas Magic Sur", "cartasmagicsur", "woocommerce", "https://www.cartasmagicsur.cl", API),
+    Tienda("AFKStore", "AFKStore", "shopify", "https://www.afkstore.cl", API),
+    Tienda("PDAChile", "PDAChile", "otra", "https://www.pdachile.cl"),
+    Tienda("CardNexus", "CardNexus", "woocommerce", "https://cardnexus.cl", API),
+    Tienda("Inekosingles", "inekosingles", "shopify", "https://inekosingles.com", API),
+    Tienda("TCGMatch", "TCGMatch", "otra", "https://tcgmatch.cl"),
+]
+
+tiendas = list(REGISTRO)                         # selección activa (el motor la usa por defecto)
+
+# ----------------------------
+# Selección
+# ----------------------------
+def _clave(texto):
+    return texto.lower().replace(" ", "").replace("_", "")
+
+def _lista(valor):
+    """Acepta "a,b", ["a", "b"] o None."""
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        valor = valor.split(",")
+    return [v.strip() for v in valor if v.strip()]
+
+def _calza(tienda, filtro):
+    f = _clave(filtro)
+    return f in (_clave(tienda["nombre"]), _clave(tienda.modulo), tienda["plataforma"]) or \
+        any(f == _clave(c) for c in tienda["capacidades"])
+
+def seleccionar(incluir=None, excluir=None):
+    """
+    Tiendas del registro que calzan con algún filtro de `incluir` (todas si no
+    hay) y con ninguno de `excluir`. Un filtro es un nombre de tienda, de
+    módulo, una plataforma o una capacidad. Filtros que no calzan con nada:
+    ValueError.
+    """
+    incluir, excluir = _lista(incluir), _lista(excluir)
+    for filtro in incluir + excluir:
+        if not any(_calza(t, filtro) for t in REGISTRO):
+            raise ValueError(f"Tienda o plataforma desconocida: {filtro}")
+    return [
+        t for t in REGISTRO
+        if (not incluir or any(_calza(t, f) for f in incluir)) and not any(_calza(t, f) for f in excluir)
+    ]
+
+def configurar(incluir=None, excluir=None):
+    """Deja en `tiendas` (la lista que usa el motor) sólo las tiendas elegidas."""
+    tiendas[:] = seleccionar(incluir, excluir)
+    return tiendas
+
+def plataformas():
+    return sorted({t["plataforma"] for t in REGISTRO})
@@ -0,0 +1,124 @@
+"""
+Resultado compacto de una búsqueda en una tienda.
+
+Cada adaptador arma un `Resultado` una sola vez: el precio queda como entero
+en CLP (None = sin precio) y la disponibilidad como bool, así mostrar,
+comparar y guardar no vuelven a parsear el texto del precio. El formato
+("$4.200", "Sí"/"No") se aplica sólo al mostrar o al escribir CSV/JSON.
+`pendiente` marca las tiendas que no respondieron dentro del plazo de búsqueda
+y `caida` las que se saltaron o fallaron (circuit breaker, `tiendas.salud`).
+"""
+
+import re
+
+def precio_a_entero(texto):
+    digitos = re.sub(r"[^\d]", "", str(texto or ""))
+    return int(digitos) if digitos else None
+
+def formatear_moneda(valor):
+    return f"${valor:,}".replace(",", ".")
+
+def es_foil(titulo):
+    return "foil" in titulo.lower()
+
+class Resultado:
+    """Resultado de una tienda para una carta."""
+    __slots__ = ("tienda", "disponible", "producto", "precio", "url", "foil", "pendiente", "caida")
+
+    def __init__(self, tienda, disponible, producto, precio=None, url="", foil=None, pendiente=False, caida=False):
+        self.tienda = tienda
+        self.disponible = disponible
+        self.producto = producto
+        # Los adaptadores pueden pasar el texto de la página; se parsea aquí y nunca más
+        self.precio = precio_a_entero(precio) if isinstance(precio, str) else precio
+        self.url = url
+        self.foil = es_foil(producto) if foil is None else foil
+        self.pendiente = pendiente
+        self.caida = caida
+
+    @classmethod
+    def no_disponible(cls, tienda, producto, url=""):
+        return cls(tienda, False, producto, None, url)
+
+    @classmethod
+    def fuera_de_plazo(cls, tienda, producto):
+        """La tienda no respondió a tiempo; su búsqueda sigue en segundo plano."""
+        return cls(tienda, False, producto, None, "", pendiente=True)
+
+    @classmethod
+    def tienda_caida(cls, tienda, producto):
+        """La tienda está fallando: no se consultó o la consulta no obtuvo respuesta."""
+        return cls(tienda, False, producto, None, "", caida=True)
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Inverso de `como_dict` (también lee el formato viejo con "Disponible": "Sí")."""
+        return cls(
+            datos["Tienda"],
+            datos.get("Disponible") in (True, "Sí"),
+            datos.get("Producto", ""),
+            datos.get("Precio"),
+            datos.get("URL", ""),
+            datos.get("Foil"),
+        )
+
+    @classmethod
+    def desde_json(cls, datos):
+        """Inverso de `como_json`."""
+        return cls(
+            datos["tienda"],
+            bool(datos.get("disponible")),
+            datos.get("producto", ""),
+            datos.get("precio"),
+            datos.get("url", ""),
+            datos.get("foil"),
+            pendiente=datos.get("estado") == "pendiente",
+            caida=datos.get("estado") == "caida",
+        )
+
+    @property
+    def precio_texto(self):
+        return formatear_moneda(self.precio) if self.precio is not None else "-"
+
+    @property
+    def disponible_texto(self):
+        if self.pendiente:
+            return "Pendiente"
+        if self.caida:
+            return "Caída"
+        return "Sí" if self.disponible else "No"
+
+    def como_dict(self):
+        """Formato de salida (caché, CSV, JSON) con las mismas claves de siempre."""
+        return {
+            "Tienda": self.tienda,
+            "Disponible": self.disponible_texto,
+            "Producto": self.producto,
+            "Precio": self.precio_texto,
+            "URL": self.url,
+            "Foil": self.foil,
+        }
+
+    @property
+    def estado(self):
+        if self.pendiente:
+            return "pendiente"
+        if self.caida:
+            return "caida"
+        return "disponible" if self.disponible else "no_disponible"
+
+    def como_json(self):
+        """Para APIs y NDJSON: precio como entero (CLP) y estado explícito."""
+        return {
+            "tienda": self.tienda,
+            "estado": self.estado,
+            "disponible": self.disponible,
+            "producto": self.producto,
+            "precio": self.precio,
+            "url": self.url,
+            "foil": self.foil,
+        }
+
+    def __repr__(self):
+        return (f"Resultado({self.tienda!r}, {self.disponible_texto}, {self.producto!r}, "
+                f"{self.precio_texto}, {self.url!r})")
@@ -1,23 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
+from . import salud
+from .coincidencia import consulta
+from .parseo import contenedores, crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+# --- Contenedores de producto (sólo se parsea esto) ---
+CONTENEDORES = contenedores("div.product-block")
+CONTENEDORES_PRODUCTO = contenedores("select.prod-options", "span.product-form_price")
 
 # --- Función de búsqueda para Rivendel El Concilio ---
 def buscar(nombre_producto):
     base_url = "https://www.rivendelelconcilio.cl"
     url_busqueda = base_url + "/search?q={}".format(nombre_producto.replace(' ', '+'))
-    resultado = {}
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en Rivendel El Concilio...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        soup = crear_sopa(response.content, CONTENEDORES)
         productos = soup.select("div.product-block")
 
         encontrado = False
@@ -27,15 +26,15 @@ def buscar(nombre_producto):
             nombre = nombre_tag.get_text(strip=True) if nombre_tag else ""
             
             # Verificar si coincide con lo que buscamos
-            if nombre_producto.lower() in nombre.lower():
+            if consulta(nombre_producto).contiene(nombre):
                 # URL del producto
                 url_producto = nombre_tag['href'] if nombre_tag else url_busqueda
                 if url_producto.startswith("/"):
                     url_producto = base_url + url_producto
 
                 # Entrar a la página del producto para analizar variantes
-                resp_prod = requests.get(url_producto, headers={"User-Agent": "Mozilla/5.0"})
-                soup_prod = BeautifulSoup(resp_prod.content, 'html.parser')
+                resp_prod = obtener_sesion(url_producto).get(url_producto)
+                soup_prod = crear_sopa(resp_prod.content, CONTENEDORES_PRODUCTO)
 
                 opciones = soup_prod.select("select.prod-options option")
                 stock_opciones = []
@@ -65,48 +64,21 @@ def buscar(nombre_producto):
                         break
 
                 if seleccion:
-                    resultado = {
-                        "Tienda": "Rivendel El Concilio",
-                        "Disponible": "Sí",
-                        "Producto": nombre,
-                        "Opcion": seleccion["nombre_op"],
-                        "Precio": f"${seleccion['precio']}",
-                        "URL": url_producto
-                    }
+                    resultado = Resultado("Rivendel El Concilio", True, nombre, seleccion["precio"], url_producto,
+                                          foil="foil" in seleccion["nombre_op"])
                 else:
-                    resultado = {
-                        "Tienda": "Rivendel El Concilio",
-                        "Disponible": "No",
-                        "Producto": nombre,
-                        "Opcion": "-",
-                        "Precio": "-",
-                        "URL": url_producto
-                    }
+                    resultado = Resultado.no_disponible("Rivendel El Concilio", nombre, url_producto)
 
                 encontrado = True
                 break
 
         if not encontrado:
-            resultado = {
-                "Tienda": "Rivendel El Concilio",
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Opcion": "-",
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible("Rivendel El Concilio", nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": "Rivendel El Concilio",
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Opcion": "-",
-            "Precio": "-",
-            "URL": url_busqueda
-        }
-
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible("Rivendel El Concilio", nombre_producto, url_busqueda)
+
     return resultado
 
 # --- Metadata de la tienda ---
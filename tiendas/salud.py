@@ -0,0 +1,150 @@
+"""
+Salud de cada tienda y circuit breaker por tienda.
+
+Los adaptadores atrapan cualquier excepción y devuelven "No", así que el
+motor no ve cuándo una tienda está caída. Para enterarse, cada llamada a un
+adaptador corre dentro de `en_tienda()` y la capa HTTP
+(`tiendas.sesiones`) anota ahí los timeouts, errores de conexión y 5xx; los
+adaptadores anotan también las excepciones que atrapan. Un "No" con fallos
+anotados vuelve como "caída" y no se guarda en el caché. Si el adaptador se
+recupera por otra vía (p. ej. JSON con 5xx y luego el HTML responde bien),
+`respaldar` olvida los fallos del camino que falló: la respuesta final no
+dependió de ellos.
+
+- Tras `UMBRAL_FALLOS` fallos seguidos el circuito se abre: la tienda se salta
+  y sus resultados vuelven como "caída" sin pagar su latencia de error.
+- Pasados `ESPERA_ABIERTO` segundos se deja pasar una sola consulta de prueba
+  (semiabierto); si responde bien el circuito se cierra, si no, se abre otra vez.
+- `resumen()` entrega consultas, fallos, saltadas y latencia por tienda.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+UMBRAL_FALLOS = 3                                # fallos seguidos para abrir el circuito
+ESPERA_ABIERTO = 30.0                            # segundos antes de la consulta de prueba
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+_circuitos = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+# ----------------------------
+# Circuito por tienda
+# ----------------------------
+class Circuito:
+    def __init__(self, tienda):
+        self.tienda = tienda
+        self.estado = CERRADO
+        self.fallos_seguidos = 0
+        self.abierto_hasta = 0.0
+        self.probando = False
+        self.consultas = 0
+        self.fallos = 0
+        self.saltadas = 0
+        self.segundos = 0.0
+        self._lock = threading.Lock()
+
+    def permitir(self, consultas=1):
+        """True si se puede consultar la tienda ahora; si no, suma `consultas` a las saltadas."""
+        with self._lock:
+            if self.estado == CERRADO:
+                return True
+            if self.estado == ABIERTO and time.monotonic() >= self.abierto_hasta:
+                self.estado = SEMIABIERTO
+            if self.estado == SEMIABIERTO and not self.probando:
+                self.probando = True
+                return True
+            self.saltadas += consultas
+            return False
+
+    def registrar(self, exito, segundos):
+        with self._lock:
+            self.consultas += 1
+            self.segundos += segundos
+            self.probando = False
+            if exito:
+                self.fallos_seguidos = 0
+                self.estado = CERRADO
+                return
+            self.fallos += 1
+            self.fallos_seguidos += 1
+            if self.estado == SEMIABIERTO or self.fallos_seguidos >= UMBRAL_FALLOS:
+                self.estado = ABIERTO
+                self.abierto_hasta = time.monotonic() + ESPERA_ABIERTO
+
+    def soltar(self):
+        """La consulta se canceló sin saber si la tienda anda: libera la prueba."""
+        with self._lock:
+            self.probando = False
+
+def circuito(tienda):
+    c = _circuitos.get(tienda)
+    if c is None:
+        with _lock:
+            c = _circuitos.setdefault(tienda, Circuito(tienda))
+    return c
+
+# ----------------------------
+# Fallos ocultos en los adaptadores
+# ----------------------------
+class Registro:
+    def __init__(self):
+        self.fallos = 0
+
+@contextmanager
+def en_tienda():
+    """Anota en este hilo los fallos HTTP que ocurran mientras corre el adaptador."""
+    anterior = getattr(_local, "registro", None)
+    _local.registro = registro = Registro()
+    try:
+        yield registro
+    finally:
+        _local.registro = anterior
+
+def reportar_fallo():
+    """Lo llama la capa HTTP ante timeout, error de conexión o 5xx, y el adaptador al atrapar una excepción."""
+    registro = getattr(_local, "registro", None)
+    if registro is not None:
+        registro.fallos += 1
+
+def anotados():
+    """Fallos anotados hasta ahora en este hilo (0 fuera de `en_tienda`)."""
+    registro = getattr(_local, "registro", None)
+    return registro.fallos if registro is not None else 0
+
+def respaldar(respaldo, argumento, desde):
+    """
+    Corre `respaldo(argumento)` tras un fallo del camino principal. Si el
+    respaldo no anota fallos nuevos, se olvidan los anotados desde `desde`.
+    """
+    antes = anotados()
+    resultado = respaldo(argumento)
+    registro = getattr(_local, "registro", None)
+    if registro is not None and registro.fallos == antes:
+        registro.fallos = min(registro.fallos, desde)
+    return resultado
+
+# ----------------------------
+# Resumen
+# ----------------------------
+def resumen():
+    """Lista de dicts por tienda: estado, consultas, fallos, saltadas y latencia media (s)."""
+    filas = []
+    for c in sorted(_circuitos.values(), key=lambda c: c.tienda):
+        filas.append({
+            "tienda": c.tienda,
+            "estado": c.estado,
+            "consultas": c.consultas,
+            "fallos": c.fallos,
+            "saltadas": c.saltadas,
+            "latencia": c.segundos / c.consultas if c.consultas else 0.0,
+        })
+    return filas
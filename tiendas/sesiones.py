@@ -0,0 +1,153 @@
+"""
+Registro de sesiones HTTP por host, compartido por todos los adaptadores.
+
+Cada host tiene su propia `requests.Session` con pool de conexiones keep-alive,
+así las búsquedas de varias cartas reutilizan el mismo TCP+TLS en vez de
+negociar uno nuevo por consulta. Todas las sesiones comparten la misma
+política de User-Agent y de compresión (gzip, y brotli si está instalado).
+
+Cada consulta pasa por el limitador del dominio (`tiendas.limites`): token
+bucket, concurrencia AIMD y reintento automático ante 429/503 respetando
+`Retry-After`, para no devolver falsos "No disponible" por estar limitados.
+Si el adaptador no pasa `timeout`, se aplican `TIMEOUT_CONEXION` y
+`TIMEOUT_LECTURA`, así una tienda colgada no congela la búsqueda. Los
+timeouts, errores de conexión y 5xx se anotan en `tiendas.salud` para el
+circuit breaker de la tienda.
+
+Para benchmarks y pruebas sin tocar las tiendas reales: `grabar_respuestas`
+registra cada respuesta y `redirigir_a` envía todas las consultas a un
+servidor local que reproduce lo grabado (ver benchmarks/servidor_replay.py).
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import salud
+from .limites import ESTADOS_LIMITE, obtener_limitador, segundos_retry_after
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+USER_AGENT = "Mozilla/5.0"
+POOL_CONEXIONES = 4                              # pools por sesión (uno por host:puerto)
+POOL_MAXIMO = 32                                 # conexiones keep-alive por host
+REUTILIZAR_CONEXIONES = True                     # False = sesión nueva por consulta (sólo benchmarks)
+REINTENTOS_LIMITE = 4                            # reintentos ante 429/503 antes de rendirse
+TIMEOUT_CONEXION = 3.05                          # segundos para abrir TCP+TLS
+TIMEOUT_LECTURA = 10                             # segundos máximos sin recibir datos
+
+try:
+    import brotli  # noqa: F401  (urllib3 sólo decodifica 'br' si está instalado)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+_sesiones = {}
+_lock = threading.Lock()
+_grabador = None                                 # callback(url_original, respuesta)
+_redireccion = None                              # base del servidor de reproducción
+
+def grabar_respuestas(callback):
+    """Llama `callback(url_original, respuesta)` por cada respuesta recibida (None desactiva)."""
+    global _grabador
+    _grabador = callback
+
+def redirigir_a(base_url):
+    """Envía todas las consultas a `base_url`/<host>/<ruta>?<query> (None desactiva)."""
+    global _redireccion
+    _redireccion = base_url.rstrip("/") if base_url else None
+
+def url_reproduccion(url):
+    partes = urlsplit(url)
+    consulta = f"?{partes.query}" if partes.query else ""
+    return f"{_redireccion}/{partes.netloc}{partes.path or '/'}{consulta}"
+
+# ----------------------------
+# Adaptador con límite de tasa
+# ----------------------------
+class AdaptadorLimitado(HTTPAdapter):
+    """HTTPAdapter que pasa cada consulta por el limitador de su dominio."""
+
+    def send(self, request, **kwargs):
+        url_original = request.url
+        limitador = obtener_limitador(urlsplit(url_original).netloc)
+        if _redireccion:
+            request.url = url_reproduccion(url_original)
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (TIMEOUT_CONEXION, TIMEOUT_LECTURA)
+        for intento in range(REINTENTOS_LIMITE + 1):
+            limitador.entrar()
+            try:
+                respuesta = super().send(request, **kwargs)
+            except Exception:
+                limitador.salir()
+                salud.reportar_fallo()
+                raise
+            ok = respuesta.status_code not in ESTADOS_LIMITE
+            if ok or intento == REINTENTOS_LIMITE:
+                limitador.salir(exito=ok)
+                if ok:
+                    limitador.recuperado()
+                if respuesta.status_code >= 500:
+                    salud.reportar_fallo()
+                if _grabador:
+                    _grabador(url_original, respuesta)
+                return respuesta
+            # 429/503: pausar el dominio completo y reintentar
+            limitador.salir(exito=False)
+            espera = limitador.limitado(segundos_retry_after(respuesta.headers.get("Retry-After")))
+            respuesta.close()
+            time.sleep(espera)
+
+# ----------------------------
+# Registro
+# ----------------------------
+def crear_sesion():
+    """Crea una sesión con pool de conexiones y los headers compartidos."""
+    sesion = requests.Session()
+    adaptador = AdaptadorLimitado(pool_connections=POOL_CONEXIONES, pool_maxsize=POOL_MAXIMO)
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    sesion.headers.update(HEADERS)
+    return sesion
+
+def obtener_sesion(url):
+    """Devuelve la sesión asociada al host de `url` (la crea la primera vez)."""
+    if not REUTILIZAR_CONEXIONES:
+        return crear_sesion()
+    host = urlsplit(url).netloc.lower()
+    sesion = _sesiones.get(host)
+    if sesion is None:
+        with _lock:
+            sesion = _sesiones.get(host)
+            if sesion is None:
+                sesion = crear_sesion()
+                _sesiones[host] = sesion
+    return sesion
+
+def conexiones_abiertas():
+    """Número de conexiones (handshakes) abiertas por host desde que arrancó el proceso."""
+    conteo = {}
+    for host, sesion in list(_sesiones.items()):
+        total = 0
+        for adaptador in set(sesion.adapters.values()):
+            for pool in list(adaptador.poolmanager.pools._container.values()):
+                total += pool.num_connections
+        conteo[host] = total
+    return conteo
+
+def cerrar_sesiones():
+    with _lock:
+        for sesion in _sesiones.values():
+            sesion.close()
+        _sesiones.clear()
@@ -0,0 +1,191 @@
+"""
+Backend compartido para las tiendas Shopify (Inekosingles, AFKStore,
+PiedraBruja, GameOfMagicSingles, PayToWin, OasisGames, TiendaLaComarca).
+
+En vez de bajar y parsear la página HTML de búsqueda, consulta la búsqueda
+predictiva (`/search/suggest.json`), que devuelve los productos con sus
+variantes, disponibilidad y precio en unos pocos KB de JSON. Si a un producto
+le faltan las variantes, se piden a `/products/<handle>.js`.
+
+Si el endpoint JSON no existe (404 o algo que no es el JSON esperado) se usa
+el adaptador HTML de la tienda (`respaldo`) y el host queda marcado para no
+volver a intentarlo en esta ejecución. Cualquier otro error (timeout, 5xx)
+sólo manda esa consulta al HTML; si el HTML responde bien, el fallo del JSON
+no cuenta para el circuit breaker (`salud.respaldar`).
+
+Lotes: varias cartas van en una sola búsqueda `(carta 1) OR (carta 2) ...` y
+los productos se reparten por nombre. Como la búsqueda predictiva devuelve a
+lo más 10 productos entre todas las cartas, el lote sólo se usa si la
+respuesta no llegó al tope (estaba todo). Si llegó, cada carta se vuelve a
+preguntar sola, aunque haya quedado en stock: una impresión más barata pudo
+quedar fuera del corte. Una carta que no calzó con nada también se pregunta
+sola. Así el corte de 10 no produce un "No" falso ni un precio que no es el
+mínimo.
+"""
+
+import threading
+from urllib.parse import quote_plus, urlsplit
+
+from . import coincidencia
+from . import salud
+from .coincidencia import coincide
+from .resultado import Resultado, es_foil
+from .sesiones import obtener_sesion
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+LIMITE_SUGERENCIAS = 10                          # productos por búsqueda predictiva (máx. de Shopify)
+TAMANO_LOTE = 4                                  # cartas por búsqueda OR
+
+_sin_api = set()                                 # hosts donde suggest.json no existe
+_lock = threading.Lock()
+
+class ApiNoDisponible(Exception):
+    """La tienda no expone el endpoint JSON (o devolvió otra cosa)."""
+
+# ----------------------------
+# Endpoints
+# ----------------------------
+def precio_shopify(valor):
+    """suggest.json trae "4200.00" (pesos); products/<handle>.js trae 420000 (centavos)."""
+    if isinstance(valor, int):
+        return valor // 100
+    try:
+        return int(round(float(valor)))
+    except (TypeError, ValueError):
+        return None
+
+def sugerencias(base_url, consulta, limite=LIMITE_SUGERENCIAS):
+    """Productos de la búsqueda predictiva, agotados al final."""
+    url = f"{base_url}/search/suggest.json"
+    params = {
+        "q": consulta,
+        "resources[type]": "product",
+        "resources[limit]": limite,
+        "resources[options][unavailable_products]": "last",
+    }
+    respuesta = obtener_sesion(url).get(url, params=params)
+    if respuesta.status_code == 404:
+        raise ApiNoDisponible(url)
+    respuesta.raise_for_status()
+    try:
+        productos = respuesta.json()["resources"]["results"]["products"]
+    except (ValueError, KeyError, TypeError):
+        raise ApiNoDisponible(url)
+    return productos
+
+def variantes(base_url, producto):
+    """Variantes del producto; si la sugerencia no las trae, se piden a /products/<handle>.js."""
+    if producto.get("variants"):
+        return producto["variants"]
+    url = f"{base_url}/products/{producto['handle']}.js"
+    respuesta = obtener_sesion(url).get(url)
+    respuesta.raise_for_status()
+    return respuesta.json().get("variants", [])
+
+def url_producto(base_url, producto, variante=None):
+    ruta = urlsplit(producto.get("url") or f"/products/{producto['handle']}").path
+    url = base_url + ruta
+    if variante and variante.get("id"):
+        url += f"?variant={variante['id']}"
+    return url
+
+def titulo_variante(producto, variante):
+    titulo = producto.get("title", "")
+    opcion = variante.get("title") or ""
+    if opcion and opcion != "Default Title":
+        titulo += f" ({opcion})"
+    return titulo
+
+# ----------------------------
+# Selección
+# ----------------------------
+def elegir(tienda, base_url, consulta, productos, preferir_foil=False):
+    """
+    Variante disponible más barata entre los productos cuyo título calza con
+    la consulta, sólo los exactos si los hay (foil primero si `preferir_foil`).
+    Sin stock: "No" con la URL del primer producto que calzó.
+    """
+    buscada = coincidencia.consulta(consulta)
+    propios = [p for p in productos if buscada.coincide(p.get("title", ""))]
+    propios = [propios[i] for i in buscada.exactas([p.get("title", "") for p in propios])]
+    candidatos = []
+    primero = propios[0] if propios else None
+    for producto in propios:
+        for variante in variantes(base_url, producto):
+            if not variante.get("available"):
+                continue
+            titulo = titulo_variante(producto, variante)
+            precio = precio_shopify(variante.get("price"))
+            candidatos.append((preferir_foil and not es_foil(titulo), precio is None, precio or 0,
+                               titulo, producto, variante))
+
+    if not candidatos:
+        url = url_producto(base_url, primero) if primero else f"{base_url}/search?q={quote_plus(consulta)}"
+        return Resultado.no_disponible(tienda, consulta, url)
+
+    _, _, _, titulo, producto, variante = min(candidatos, key=lambda c: c[:3])
+    return Resultado(tienda, True, titulo, precio_shopify(variante.get("price")),
+                     url_producto(base_url, producto, variante))
+
+# ----------------------------
+# Buscador por tienda
+# ----------------------------
+def crear_buscador(tienda, base_url, respaldo, preferir_foil=False):
+    """
+    Función `buscar(nombre_producto)` para la metadata de una tienda Shopify.
+    `respaldo` es el adaptador HTML de la tienda.
+    """
+    host = urlsplit(base_url).netloc
+
+    def buscar(nombre_producto):
+        if host in _sin_api:
+            return respaldo(nombre_producto)
+        desde = salud.anotados()
+        try:
+            productos = sugerencias(base_url, nombre_producto)
+            return elegir(tienda, base_url, nombre_producto, productos, preferir_foil)
+        except ApiNoDisponible:
+            with _lock:
+                _sin_api.add(host)
+            return salud.respaldar(respaldo, nombre_producto, desde)
+        except Exception:
+            return salud.respaldar(respaldo, nombre_producto, desde)
+
+    return buscar
+
+def crear_buscador_lote(tienda, base_url, respaldo, preferir_foil=False):
+    """Función `buscar_lote(cartas) -> {carta: resultado}` para la metadata."""
+    host = urlsplit(base_url).netloc
+    buscar = crear_buscador(tienda, base_url, respaldo, preferir_foil)
+
+    def cada_una(cartas):
+        return {carta: buscar(carta) for carta in cartas}
+
+    def buscar_lote(cartas):
+        if host in _sin_api or len(cartas) == 1:
+            return cada_una(cartas)
+        desde = salud.anotados()
+        try:
+            productos = sugerencias(base_url, " OR ".join(f"({carta})" for carta in cartas))
+        except Exception:
+            # Cada carta sola; si así responden, el fallo del lote no cuenta
+            return salud.respaldar(cada_una, cartas, desde)
+        if len(productos) >= LIMITE_SUGERENCIAS:
+            # Llegó al tope: pudo quedar fuera una impresión en stock o más barata de cualquier carta
+            return cada_una(cartas)
+
+        resultados = {}
+        for carta in cartas:
+            propios = [p for p in productos if coincide(carta, p.get("title", ""))]
+            if propios:
+                try:
+                    resultados[carta] = elegir(tienda, base_url, carta, propios, preferir_foil)
+                    continue
+                except Exception:
+                    pass
+            resultados[carta] = buscar(carta)
+        return resultados
+
+    return buscar_lote
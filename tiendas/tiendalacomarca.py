@@ -1,23 +1,21 @@
-import requests
-from bs4 import BeautifulSoup
-
-# --- Colores para la terminal ---
-class Colores:
-    VERDE = '\033[92m'
-    ROJO = '\033[91m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+from . import salud
+from . import shopify
+from .coincidencia import consulta
+from .parseo import crear_sopa
+from .resultado import Resultado
+from .sesiones import obtener_sesion
 
 # --- Función de búsqueda para TiendaLaComarca ---
 def buscar(nombre_producto):
     base_url = "https://www.tiendalacomarca.cl"
     url_busqueda = f"{base_url}/search?type=product&options%5Bprefix%5D=last&q={nombre_producto.replace(' ', '+')}"
-    resultado = {}
+    buscada = consulta(nombre_producto)
+    resultado = None
 
     try:
-        print(f"{Colores.AZUL}Buscando en TiendaLaComarca...{Colores.RESET}", end="")
-        response = requests.get(url_busqueda, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = obtener_sesion(url_busqueda).get(url_busqueda)
+        # Página completa: la URL está en el <a> que envuelve a cada producto
+        soup = crear_sopa(response.content)
 
         # Buscar todos los productos
         productos = soup.select("div.product-card-list2__details")
@@ -31,7 +29,7 @@ def buscar(nombre_producto):
             nombre = titulo_tag.get_text(strip=True)
 
             # Verificar coincidencia exacta parcial
-            if nombre_producto.lower() not in nombre.lower():
+            if not buscada.contiene(nombre):
                 continue
 
             # URL del producto
@@ -51,40 +49,26 @@ def buscar(nombre_producto):
             else:
                 precio_final = "-"
 
-            resultado = {
-                "Tienda": "TiendaLaComarca",
-                "Disponible": "Sí" if disponible else "No",
-                "Producto": nombre,
-                "Precio": precio_final,
-                "URL": url_producto
-            }
+            resultado = Resultado("TiendaLaComarca", disponible, nombre, precio_final, url_producto)
             encontrado = True
             break
 
         if not encontrado:
-            resultado = {
-                "Tienda": "TiendaLaComarca",
-                "Disponible": "No",
-                "Producto": nombre_producto,
-                "Precio": "-",
-                "URL": url_busqueda
-            }
+            resultado = Resultado.no_disponible("TiendaLaComarca", nombre_producto, url_busqueda)
 
     except Exception as e:
-        resultado = {
-            "Tienda": "TiendaLaComarca",
-            "Disponible": "No",
-            "Producto": nombre_producto,
-            "Precio": "-",
-            "URL": url_busqueda
-        }
+        salud.reportar_fallo()                   # un "No" por error no se guarda en el caché
+        resultado = Resultado.no_disponible("TiendaLaComarca", nombre_producto, url_busqueda)
 
-    print(f"{Colores.VERDE} listo{Colores.RESET}")
     return resultado
 
-metadata = { 
-    "nombre": "TiendaLaComarca", 
-    "func": buscar 
+metadata = {
+    "nombre": "TiendaLaComarca",
+    # JSON de Shopify (también por lotes); el scraping HTML de arriba queda como respaldo
+    "func": shopify.crear_buscador("TiendaLaComarca", "https://www.tiendalacomarca.cl", respaldo=buscar),
+    "func_lote": shopify.crear_buscador_lote("TiendaLaComarca", "https://www.tiendalacomarca.cl", respaldo=buscar),
+    "lote": shopify.TAMANO_LOTE,
+    "plataforma": "shopify",
 }
 
 # --- Ejemplo de uso ---
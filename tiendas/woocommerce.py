@@ -0,0 +1,197 @@
+"""
+Backend compartido para las tiendas WooCommerce (HunterCardTCG,
+BloodMoonGames, CardNexus, Cartas Magic Sur).
+
+Consulta la Store API (`/wp-json/wc/store/v1/products?search=`), que devuelve
+JSON con nombre, permalink, stock y precios, en vez de parsear el HTML de cada
+tema (`li.thunk-woo-product-list`, `data-product_variations`, ...). Así un
+cambio de tema ya no produce falsos "No" silenciosos.
+
+Si la API está desactivada (404, 401/403 de plugins de seguridad, o una
+respuesta que no es JSON) se usa el adaptador HTML de la tienda (`respaldo`)
+y el host queda marcado para no volver a intentarlo en esta ejecución. Otros
+errores (timeout, 5xx) mandan sólo esa consulta al HTML; si el HTML responde
+bien, el fallo de la API no cuenta para el circuit breaker (`salud.respaldar`).
+
+Crawls incrementales: `url_catalogo` pide el catálogo por la Store API con lo
+modificado más reciente primero (`orderby=modified`, ver `tiendas.incremental`).
+
+Lotes: cada búsqueda guarda en el caché los ids de producto que calzaron; en
+la siguiente pasada las cartas con ids conocidos se refrescan todas juntas
+con `include=` (hasta 100 por consulta) y sólo las nuevas se buscan por nombre.
+Si todos los ids conocidos de una carta están agotados también se busca por
+nombre, para ver las publicaciones nuevas de la carta. Si alguno sigue en
+stock, una publicación nueva más barata recién se ve cuando los ids vencen
+(`cache.TTL_IDS`, 3 horas) y la carta se vuelve a buscar por nombre.
+"""
+
+import html
+import threading
+from urllib.parse import quote_plus, urlencode, urlsplit
+
+from . import cache
+from . import coincidencia
+from . import salud
+from .coincidencia import coincide
+from .resultado import Resultado, es_foil
+from .sesiones import obtener_sesion
+
+# ----------------------------
+# CONFIGURACIÓN
+# ----------------------------
+RUTA_API = "/wp-json/wc/store/v1/products"       # /wp-json/wc/store/products es el alias viejo
+POR_PAGINA = 20
+TAMANO_LOTE = 100                                # máximo per_page de la Store API
+ESTADOS_SIN_API = (401, 403, 404)
+
+_sin_api = set()                                 # hosts con la Store API desactivada
+_lock = threading.Lock()
+
+class ApiNoDisponible(Exception):
+    """La tienda no expone la Store API (o devolvió otra cosa)."""
+
+# ----------------------------
+# Store API
+# ----------------------------
+def consultar(base_url, params):
+    """GET a la Store API; devuelve la lista de productos."""
+    url = base_url + RUTA_API
+    respuesta = obtener_sesion(url).get(url, params=params)
+    if respuesta.status_code in ESTADOS_SIN_API:
+        raise ApiNoDisponible(url)
+    respuesta.raise_for_status()
+    try:
+        productos = respuesta.json()
+    except ValueError:
+        raise ApiNoDisponible(url)
+    if not isinstance(productos, list):
+        raise ApiNoDisponible(url)
+    return productos
+
+def url_catalogo(base_url, pagina, categoria=None, por_pagina=TAMANO_LOTE):
+    """URL de una página del catálogo completo, lo modificado más reciente primero."""
+    params = {"orderby": "modified", "order": "desc", "per_page": por_pagina, "page": pagina}
+    if categoria:
+        params["category"] = categoria           # id o slug de la categoría
+    return f"{base_url}{RUTA_API}?{urlencode(params)}"
+
+def buscar_productos(base_url, consulta):
+    return consultar(base_url, {"search": consulta, "per_page": POR_PAGINA})
+
+def precio_woo(producto):
+    """`prices.price` viene en unidades menores ("4200" con currency_minor_unit 0)."""
+    precios = producto.get("prices") or {}
+    try:
+        return int(precios["price"]) // 10 ** int(precios.get("currency_minor_unit", 0))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def titulo_producto(producto):
+    return html.unescape(producto.get("name", ""))
+
+# ----------------------------
+# Selección
+# ----------------------------
+def elegir(tienda, base_url, consulta, productos, preferir_foil=False):
+    """
+    Producto en stock más barato entre los que calzan con la consulta, sólo
+    los exactos si los hay (foil primero si `preferir_foil`). Sin stock: "No"
+    con el permalink del primero que calzó.
+    """
+    buscada = coincidencia.consulta(consulta)
+    propios = [p for p in productos if buscada.coincide(titulo_producto(p))]
+    propios = [propios[i] for i in buscada.exactas([titulo_producto(p) for p in propios])]
+    candidatos = []
+    primero = propios[0] if propios else None
+    for producto in propios:
+        titulo = titulo_producto(producto)
+        if producto.get("is_in_stock"):
+            precio = precio_woo(producto)
+            candidatos.append((preferir_foil and not es_foil(titulo), precio is None, precio or 0,
+                               titulo, precio, producto))
+
+    if not candidatos:
+        url = primero.get("permalink") if primero else f"{base_url}/?s={quote_plus(consulta)}&post_type=product"
+        return Resultado.no_disponible(tienda, consulta, url)
+
+    _, _, _, titulo, precio, producto = min(candidatos, key=lambda c: c[:3])
+    return Resultado(tienda, True, titulo, precio, producto.get("permalink", base_url))
+
+# ----------------------------
+# Buscador por tienda
+# ----------------------------
+def crear_buscador(tienda, base_url, respaldo, preferir_foil=False):
+    """
+    Función `buscar(nombre_producto)` para la metadata de una tienda WooCommerce.
+    `respaldo` es el adaptador HTML de la tienda.
+    """
+    host = urlsplit(base_url).netloc
+
+    def buscar(nombre_producto):
+        if host in _sin_api:
+            return respaldo(nombre_producto)
+        desde = salud.anotados()
+        try:
+            productos = buscar_productos(base_url, nombre_producto)
+            ids = [p["id"] for p in productos if "id" in p and coincide(nombre_producto, titulo_producto(p))]
+            cache.guardar_ids(tienda, nombre_producto, ids)
+            return elegir(tienda, base_url, nombre_producto, productos, preferir_foil)
+        except ApiNoDisponible:
+            with _lock:
+                _sin_api.add(host)
+            return salud.respaldar(respaldo, nombre_producto, desde)
+        except Exception:
+            return salud.respaldar(respaldo, nombre_producto, desde)
+
+    return buscar
+
+def crear_buscador_lote(tienda, base_url, respaldo, preferir_foil=False):
+    """
+    Función `buscar_lote(cartas) -> {carta: resultado}` para la metadata.
+    Las cartas con ids conocidos se refrescan con `include=`; el resto (o si
+    sus productos desaparecieron o están agotados) se busca carta por carta.
+    """
+    host = urlsplit(base_url).netloc
+    buscar = crear_buscador(tienda, base_url, respaldo, preferir_foil)
+
+    def cada_una(cartas):
+        return {carta: buscar(carta) for carta in cartas}
+
+    def buscar_lote(cartas):
+        conocidos = {}
+        refresco_fallido = None                  # fallos anotados antes del include= que falló
+        if host not in _sin_api:
+            for carta in cartas:
+                ids = cache.leer_ids(tienda, carta)
+                if ids:
+                    conocidos[carta] = ids
+
+        resultados = {}
+        if conocidos:
+            todos = sorted({i for ids in conocidos.values() for i in ids})
+            por_id = {}
+            desde = salud.anotados()
+            try:
+                for i in range(0, len(todos), TAMANO_LOTE):
+                    grupo = todos[i:i + TAMANO_LOTE]
+                    for producto in consultar(base_url, {"include": ",".join(map(str, grupo)), "per_page": TAMANO_LOTE}):
+                        por_id[producto.get("id")] = producto
+            except Exception:
+                por_id = {}
+                refresco_fallido = desde
+            for carta, ids in conocidos.items():
+                propios = [por_id[i] for i in ids if i in por_id]
+                if propios:
+                    resultado = elegir(tienda, base_url, carta, propios, preferir_foil)
+                    if resultado.disponible:
+                        resultados[carta] = resultado
+
+        faltan = [carta for carta in cartas if carta not in resultados]
+        if refresco_fallido is None:
+            resultados.update(cada_una(faltan))
+        else:
+            # Si la búsqueda por nombre responde, el fallo del include= no cuenta
+            resultados.update(salud.respaldar(cada_una, faltan, refresco_fallido))
+        return resultados
+
+    return buscar_lote